@@ -0,0 +1,352 @@
+"""asyncio interface over SSHManager and FileManager"""
+import asyncio
+import functools
+import posixpath
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from core.file_manager import FileManager, RemoteFileInfo
+from core.ssh_manager import SSHManager
+
+
+class AsyncSSHManager:
+    """Runs the blocking SSHManager calls on a managed thread pool
+    
+    Every coroutine hands its call to the executor, so hundreds of calls
+    can be awaited together with ``asyncio.gather``. The SFTP channel
+    pool limits how many of them talk to the server at once; the others
+    wait for a free channel in their worker thread, not on the event loop.
+    """
+    
+    def __init__(self, ssh_manager: Optional[SSHManager] = None,
+                 max_workers: Optional[int] = None):
+        """Initialize async SSH manager
+        
+        Args:
+            ssh_manager: SSH manager to wrap (a new one when omitted)
+            max_workers: Threads running blocking calls (defaults to
+                enough to keep every pooled channel busy)
+        """
+        self.ssh_manager = ssh_manager or SSHManager()
+        if max_workers is None:
+            max_workers = self.ssh_manager.pool_size * SSHManager.MAX_CONNECTIONS_PER_HOST
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="sftp-async")
+        
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        
+    async def run(self, function: Callable, *args, **kwargs) -> Any:
+        """Run a blocking function on the executor
+        
+        Args:
+            function: Function to call
+            *args: Arguments to pass to function
+            **kwargs: Keyword arguments to pass to function
+            
+        Returns:
+            Result of the function
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(function, *args, **kwargs)
+        )
+        
+    async def connect(self, host: str, port: int, username: str, password: str,
+                      timeout: int = 30, connections: int = 1):
+        """Establish the SSH connection
+        
+        Args:
+            host: SSH server hostname
+            port: SSH server port
+            username: SSH username
+            password: SSH password
+            timeout: Connection timeout in seconds
+            connections: Connections to stripe transfers across
+        """
+        await self.run(self.ssh_manager.connect, host, port, username, password, timeout)
+        if connections > 1:
+            await self.run(self.ssh_manager.open_transfer_connections, connections)
+            
+    async def disconnect(self):
+        """Close SSH and SFTP connections"""
+        await self.run(self.ssh_manager.disconnect)
+        
+    async def close(self):
+        """Disconnect and stop the executor"""
+        await self.disconnect()
+        self.executor.shutdown(wait=False)
+        
+    async def safe_operation(self, operation: Callable, *args, **kwargs) -> Any:
+        """Run an SFTP operation as SSHManager.safe_operation() does
+        
+        Args:
+            operation: Called as ``operation(sftp, *args, **kwargs)``
+            *args: Arguments to pass to operation
+            **kwargs: Keyword arguments for operation and safe_operation()
+            
+        Returns:
+            Result of the operation
+        """
+        return await self.run(self.ssh_manager.safe_operation, operation, *args, **kwargs)
+        
+    async def execute_command(self, command: str,
+                              timeout: Optional[float] = None) -> tuple[str, str, int]:
+        """Execute SSH command and return stdout, stderr, exit_code"""
+        return await self.run(self.ssh_manager.execute_command, command, timeout)
+        
+    async def stream_command(self, command: str, buffer_lines: int = 1000) -> AsyncIterator[str]:
+        """Execute SSH command and yield its stdout lines as they arrive
+        
+        A worker thread reads the command and hands lines over through a
+        bounded queue, so a slow consumer slows the reader down instead of
+        buffering the whole output. Leaving the loop early stops the
+        command.
+        
+        Args:
+            command: Command to execute
+            buffer_lines: Lines read ahead of the consumer
+            
+        Yields:
+            Lines of standard output
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(buffer_lines)
+        cancelled = threading.Event()
+        finished = object()
+        
+        def _pump():
+            try:
+                for line in self.ssh_manager.stream_command(command, cancelled):
+                    if cancelled.is_set():
+                        break
+                    asyncio.run_coroutine_threadsafe(queue.put(line), loop).result()
+            except BaseException as e:
+                asyncio.run_coroutine_threadsafe(queue.put(e), loop).result()
+            asyncio.run_coroutine_threadsafe(queue.put(finished), loop).result()
+            
+        pump = loop.run_in_executor(self.executor, _pump)
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+            while not pump.done():
+                # Free the slot the worker may be waiting for
+                while not queue.empty():
+                    queue.get_nowait()
+                await asyncio.sleep(0.01)
+
+
+class AsyncFileManager:
+    """Coroutine versions of the FileManager operations
+    
+    Paths are absolute or relative to the file manager's current
+    directory, which the coroutines never change, so concurrent calls do
+    not interfere. Transfers go through the same engines as the GUI:
+    compression, chunked and resumable transfers, and verification.
+    Cancelling the awaiting task stops a transfer at its next progress
+    report.
+    """
+    
+    def __init__(self, manager: AsyncSSHManager, file_manager: Optional[FileManager] = None):
+        """Initialize async file manager
+        
+        Args:
+            manager: Async SSH manager whose executor runs the calls
+            file_manager: File manager to use (a new one when omitted)
+        """
+        self.manager = manager
+        self.file_manager = file_manager or FileManager(manager.ssh_manager)
+        
+    def _path(self, path: str) -> str:
+        """Resolve a path against the current directory"""
+        return self.file_manager.normalize_path(path)
+        
+    async def listdir(self, path: str = ".") -> List[RemoteFileInfo]:
+        """List a remote directory
+        
+        Args:
+            path: Remote directory path
+            
+        Returns:
+            Sorted list of RemoteFileInfo objects
+        """
+        path = self._path(path)
+        attributes = await self.manager.safe_operation(lambda sftp: sftp.listdir_attr(path))
+        files = [FileManager._to_file_info(file_attr) for file_attr in attributes]
+        return FileManager.sort_files(files)
+        
+    async def stat(self, path: str) -> RemoteFileInfo:
+        """Get the attributes of a remote path
+        
+        Raises:
+            FileNotFoundError: If the path does not exist
+        """
+        path = self._path(path)
+        file_attr = await self.manager.safe_operation(lambda sftp: sftp.stat(path))
+        file_attr.filename = posixpath.basename(path)
+        return FileManager._to_file_info(file_attr)
+        
+    async def exists(self, path: str) -> bool:
+        """Check whether a remote path exists"""
+        try:
+            await self.stat(path)
+        except FileNotFoundError:
+            return False
+        return True
+        
+    async def mkdir(self, path: str):
+        """Create a remote directory"""
+        path = self._path(path)
+        await self.manager.safe_operation(lambda sftp: sftp.mkdir(path), idempotent=False)
+        self.file_manager._remote_changed(path)
+        
+    async def remove(self, path: str):
+        """Remove a remote file or empty directory"""
+        path = self._path(path)
+        
+        def _remove_operation(sftp):
+            if stat.S_ISDIR(sftp.stat(path).st_mode):
+                sftp.rmdir(path)
+                return True
+            sftp.remove(path)
+            return False
+            
+        is_directory = await self.manager.safe_operation(_remove_operation, idempotent=False)
+        self.file_manager._remote_changed(path, recursive=is_directory)
+        
+    async def rename(self, old_path: str, new_path: str):
+        """Rename a remote file or directory"""
+        old_path, new_path = self._path(old_path), self._path(new_path)
+        await self.manager.safe_operation(
+            lambda sftp: sftp.rename(old_path, new_path), idempotent=False
+        )
+        self.file_manager._remote_changed(old_path, recursive=True)
+        self.file_manager._remote_changed(new_path, recursive=True)
+        
+    async def _transfer(self, function: Callable, *args,
+                        progress_callback: Optional[Callable[..., bool]] = None, **kwargs):
+        """Run a transfer that stops at its next progress report when cancelled"""
+        cancelled = threading.Event()
+        
+        def _progress(*values):
+            if cancelled.is_set():
+                return False
+            if progress_callback:
+                return progress_callback(*values)
+            return True
+            
+        try:
+            return await self.manager.run(function, *args, progress_callback=_progress, **kwargs)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+            
+    async def upload(self, local_path: str, remote_path: str,
+                     progress_callback: Optional[Callable[[int, int], bool]] = None,
+                     resume: bool = False):
+        """Upload a file
+        
+        Args:
+            local_path: Local file path
+            remote_path: Remote file path
+            progress_callback: Called from a worker thread with
+                (transferred, total); returning False cancels (optional)
+            resume: Continue a previously interrupted upload
+        """
+        await self._transfer(
+            self.file_manager.upload_file, local_path, self._path(remote_path),
+            progress_callback=progress_callback, resume=resume
+        )
+        
+    async def download(self, remote_path: str, local_path: str,
+                       progress_callback: Optional[Callable[[int, int], bool]] = None,
+                       resume: bool = False):
+        """Download a file
+        
+        Args:
+            remote_path: Remote file path
+            local_path: Local file path
+            progress_callback: Called from a worker thread with
+                (transferred, total); returning False cancels (optional)
+            resume: Continue a previously interrupted download
+        """
+        await self._transfer(
+            self.file_manager.download_file, self._path(remote_path), local_path,
+            progress_callback=progress_callback, resume=resume
+        )
+        
+    async def download_folder(self, remote_path: str, local_path: str,
+                              progress_callback: Optional[Callable[[int, int, int, int], bool]] = None,
+                              use_tar: bool = True):
+        """Download a folder recursively
+        
+        Args:
+            remote_path: Remote folder path
+            local_path: Local path the folder is created as
+            progress_callback: Called from a worker thread with (bytes,
+                total bytes, entries, total entries); returning False
+                cancels (optional)
+            use_tar: Stream the folder through tar when the server has it
+        """
+        await self._transfer(
+            self.file_manager.download_folder, self._path(remote_path), local_path,
+            progress_callback=progress_callback, use_tar=use_tar
+        )
+
+    async def upload_folder(self, local_path: str, remote_path: str,
+                            progress_callback: Optional[Callable[[int, int, int, int], bool]] = None,
+                            use_tar: bool = True, only_changed: bool = False) -> bool:
+        """Upload a folder recursively
+        
+        Args:
+            local_path: Local folder path
+            remote_path: Remote path the folder is created as
+            progress_callback: Called from a worker thread with (bytes,
+                total bytes, entries, total entries); returning False
+                cancels (optional)
+            use_tar: Stream the folder through tar when the server has it
+            only_changed: Skip files that are unchanged on the server
+            
+        Returns:
+            True if the whole folder was uploaded
+        """
+        return await self._transfer(
+            self.file_manager.upload_folder, local_path, self._path(remote_path),
+            progress_callback=progress_callback, use_tar=use_tar, only_changed=only_changed
+        )
+
+
+def install_qt_event_loop(app=None) -> asyncio.AbstractEventLoop:
+    """Run asyncio on the Qt event loop so GUI code can await the facade
+    
+    Requires the optional qasync package.
+    
+    Args:
+        app: QApplication to integrate with (defaults to the running one)
+        
+    Returns:
+        Event loop, already set as the current one
+        
+    Raises:
+        ImportError: If qasync is not installed
+    """
+    try:
+        import qasync
+    except ImportError as e:
+        raise ImportError("qasync is required to run asyncio on the Qt event loop") from e
+    from PySide6.QtWidgets import QApplication
+    
+    loop = qasync.QEventLoop(app or QApplication.instance())
+    asyncio.set_event_loop(loop)
+    return loop
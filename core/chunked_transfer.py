@@ -0,0 +1,207 @@
+"""Parallel byte-range transfers of single large files"""
+import os
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from core.errors import TransferCancelled
+from core.transfer_verifier import StreamingDigest
+
+
+class ChunkedTransfer:
+    """Moves one file as byte ranges over several SFTP channels at once
+    
+    The destination is preallocated to the final size and every range is
+    written in place with positioned reads/writes, so no reassembly step
+    is needed. Each range is retried on its own through
+    ``SSHManager.safe_operation`` and lands on the least busy connection.
+    Ranges reported as completed by an earlier attempt are skipped, which
+    lets an interrupted transfer resume without re-sending them.
+    """
+    
+    DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+    BLOCK_SIZE = 1024 * 1024
+    
+    def __init__(self, ssh_manager, channels: int = 4, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Initialize chunked transfer
+        
+        Args:
+            ssh_manager: SSH manager instance
+            channels: Number of ranges transferred concurrently
+            chunk_size: Size of each byte range
+        """
+        self.ssh_manager = ssh_manager
+        self.channels = max(1, channels)
+        self.chunk_size = max(self.BLOCK_SIZE, chunk_size)
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._transferred = 0
+        
+    def _split(self, size: int) -> List[Tuple[int, int]]:
+        """Split a file size into (offset, length) ranges"""
+        return [
+            (offset, min(self.chunk_size, size - offset))
+            for offset in range(0, size, self.chunk_size)
+        ]
+        
+    def _add_progress(self, count: int):
+        """Add to the shared transferred byte counter"""
+        with self._lock:
+            self._transferred += count
+            
+    def _run(self, ranges: List[Tuple[int, int]], copy_range: Callable, total: int,
+             progress_callback: Optional[Callable[[int, int], bool]],
+             completed: Iterable[int] = (), range_done: Optional[Callable[[int], None]] = None):
+        """Run range copies on worker threads and report progress
+        
+        Progress is reported from the calling thread, so callbacks may
+        safely touch GUI objects.
+        """
+        completed = set(completed)
+        self._transferred = sum(length for offset, length in ranges if offset in completed)
+        self._cancelled.clear()
+        pending = [(offset, length) for offset, length in reversed(ranges) if offset not in completed]
+        errors: List[BaseException] = []
+        
+        def _worker():
+            while not self._cancelled.is_set():
+                with self._lock:
+                    if not pending:
+                        return
+                    offset, length = pending.pop()
+                try:
+                    self.ssh_manager.safe_operation(copy_range, offset, length, transfer=True)
+                except BaseException as e:
+                    errors.append(e)
+                    self._cancelled.set()
+                    return
+                if range_done and not self._cancelled.is_set():
+                    range_done(offset)
+                    
+        workers = [
+            threading.Thread(target=_worker, daemon=True)
+            for _ in range(min(self.channels, len(pending)))
+        ]
+        for worker in workers:
+            worker.start()
+            
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(0.1)
+                if progress_callback and not self._cancelled.is_set():
+                    if progress_callback(self._transferred, total) is False:
+                        self.cancel()
+                        
+        if errors:
+            raise errors[0]
+        if self._cancelled.is_set():
+            raise TransferCancelled("Transfer cancelled")
+        if progress_callback:
+            progress_callback(total, total)
+            
+    def cancel(self):
+        """Cancel the running transfer"""
+        self._cancelled.set()
+        
+    def upload(self, local_path: str, remote_path: str,
+               progress_callback: Optional[Callable[[int, int], bool]] = None,
+               completed: Iterable[int] = (), range_done: Optional[Callable[[int], None]] = None,
+               digest: Optional[StreamingDigest] = None):
+        """Upload a local file to the server in parallel byte ranges
+        
+        Args:
+            local_path: Local file path
+            remote_path: Remote file path
+            progress_callback: Called with (transferred, total); returning
+                False cancels the transfer
+            completed: Start offsets of ranges already present remotely
+            range_done: Called from a worker thread with each finished range offset
+            digest: Fed with the data sent (optional)
+                
+        Raises:
+            TransferCancelled: If the progress callback cancelled the transfer
+        """
+        size = os.path.getsize(local_path)
+        
+        def _preallocate(sftp):
+            with sftp.open(remote_path, 'w') as remote_file:
+                remote_file.truncate(size)
+                
+        if not completed:
+            self.ssh_manager.safe_operation(_preallocate, transfer=True)
+            
+        def _copy_range(sftp, offset, length):
+            copied = 0
+            try:
+                with open(local_path, 'rb') as local_file, \
+                        sftp.open(remote_path, 'r+') as remote_file:
+                    remote_file.set_pipelined(True)
+                    local_file.seek(offset)
+                    remote_file.seek(offset)
+                    while copied < length:
+                        if self._cancelled.is_set():
+                            return
+                        data = local_file.read(min(self.BLOCK_SIZE, length - copied))
+                        if not data:
+                            break
+                        remote_file.write(data)
+                        if digest:
+                            digest.update(offset + copied, data)
+                        copied += len(data)
+                        self._add_progress(len(data))
+            except BaseException:
+                # The range is retried from its start, so forget its progress
+                self._add_progress(-copied)
+                raise
+                
+        self._run(self._split(size), _copy_range, size, progress_callback, completed, range_done)
+        
+    def download(self, remote_path: str, local_path: str,
+                 progress_callback: Optional[Callable[[int, int], bool]] = None,
+                 size: Optional[int] = None, completed: Iterable[int] = (),
+                 range_done: Optional[Callable[[int], None]] = None,
+                 digest: Optional[StreamingDigest] = None):
+        """Download a remote file in parallel byte ranges
+        
+        Args:
+            remote_path: Remote file path
+            local_path: Local file path
+            progress_callback: Called with (transferred, total); returning
+                False cancels the transfer
+            size: Remote file size if already known (optional)
+            completed: Start offsets of ranges already present locally
+            range_done: Called from a worker thread with each finished range offset
+            digest: Fed with the data received (optional)
+            
+        Raises:
+            TransferCancelled: If the progress callback cancelled the transfer
+        """
+        if size is None:
+            size = self.ssh_manager.safe_operation(lambda sftp: sftp.stat(remote_path).st_size)
+            
+        if not completed:
+            with open(local_path, 'wb') as local_file:
+                local_file.truncate(size)
+                
+        def _copy_range(sftp, offset, length):
+            copied = 0
+            blocks = [
+                (block, min(self.BLOCK_SIZE, offset + length - block))
+                for block in range(offset, offset + length, self.BLOCK_SIZE)
+            ]
+            try:
+                with sftp.open(remote_path, 'r') as remote_file, \
+                        open(local_path, 'r+b') as local_file:
+                    local_file.seek(offset)
+                    for data in remote_file.readv(blocks):
+                        if self._cancelled.is_set():
+                            return
+                        local_file.write(data)
+                        if digest:
+                            digest.update(offset + copied, data)
+                        copied += len(data)
+                        self._add_progress(len(data))
+            except BaseException:
+                self._add_progress(-copied)
+                raise
+                
+        self._run(self._split(size), _copy_range, size, progress_callback, completed, range_done)
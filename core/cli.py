@@ -0,0 +1,291 @@
+"""Command line interface for batch transfers without the GUI
+
+Usage examples::
+
+    SFTP_PASSWORD=secret python -m core.cli deploy@example.com upload ./site /var/www/site
+    python -m core.cli deploy@example.com:2222 download /var/log/app ./logs
+    python -m core.cli deploy@example.com sync ./docs /srv/docs --prefer local --delete
+
+The password is read from the environment variable named by
+``--password-env`` (SFTP_PASSWORD by default), or asked for on a
+terminal. The exit status is 0 on success, 1 if something failed and
+130 if interrupted.
+"""
+import argparse
+import getpass
+import logging
+import os
+import posixpath
+import stat
+import sys
+import time
+from typing import Callable, List, Optional
+
+from core.errors import TransferCancelled
+from core.file_manager import FileManager
+from core.ssh_manager import SSHManager
+from core.sync_engine import SyncAction, SyncEngine
+
+
+def parse_target(target: str):
+    """Split ``user@host[:port]`` into its parts
+    
+    Returns:
+        Tuple of (username, host, port)
+        
+    Raises:
+        ValueError: If the user or host is missing
+    """
+    username, _, address = target.rpartition("@")
+    host, _, port = address.partition(":")
+    if not username or not host:
+        raise ValueError(f"Expected user@host[:port], got {target!r}")
+    return username, host, int(port) if port else 22
+
+
+class ProgressPrinter:
+    """Prints transfer progress to stderr at most a few times per second"""
+    
+    INTERVAL = 0.5  # seconds between lines
+    
+    def __init__(self, label: str, quiet: bool = False):
+        """Initialize progress printer
+        
+        Args:
+            label: Text identifying the transfer
+            quiet: Print nothing
+        """
+        self.label = label
+        self.quiet = quiet
+        self._last = 0.0
+        
+    def __call__(self, transferred: int, total: int, entries: int = 0,
+                 total_entries: int = 0) -> bool:
+        """Report progress; used as a progress callback"""
+        now = time.monotonic()
+        if self.quiet or now - self._last < self.INTERVAL:
+            return True
+        self._last = now
+        percent = f"{transferred * 100 / total:.0f}%" if total else "…"
+        counts = f" {entries}/{total_entries} files" if total_entries else ""
+        print(f"\r{self.label}: {percent}{counts} "
+              f"({transferred / (1024 * 1024):.1f} MB)", end="", file=sys.stderr, flush=True)
+        return True
+        
+    def done(self):
+        """End the progress line"""
+        if not self.quiet and self._last:
+            print(file=sys.stderr)
+
+
+def _remote_is_directory(file_manager: FileManager, remote_path: str) -> Optional[bool]:
+    """Check whether a remote path is a directory, or None if it is missing"""
+    try:
+        remote_stat = file_manager.ssh_manager.safe_operation(lambda sftp: sftp.stat(remote_path))
+    except FileNotFoundError:
+        return None
+    return stat.S_ISDIR(remote_stat.st_mode or 0)
+
+
+def command_ls(file_manager: FileManager, args) -> int:
+    """List a remote directory"""
+    for file_info in file_manager.list_directory(args.remote):
+        kind = "d" if file_info.is_directory else "-"
+        modified = time.strftime("%Y-%m-%d %H:%M", time.localtime(file_info.modified_time))
+        print(f"{kind} {file_info.size:>12} {modified} {file_info.filename}")
+    return 0
+
+
+def command_upload(file_manager: FileManager, args) -> int:
+    """Upload a file or folder"""
+    local_path = os.path.abspath(args.local)
+    progress = ProgressPrinter(f"Uploading {args.local}", args.quiet)
+    try:
+        if os.path.isdir(local_path):
+            ok = file_manager.upload_folder(
+                local_path, file_manager.normalize_path(args.remote), use_tar=not args.no_tar,
+                only_changed=args.only_changed, compare_hash=args.compare_hash,
+                progress_callback=progress
+            )
+            if ok and args.only_changed:
+                print(file_manager.last_upload_summary)
+            return 0 if ok else 1
+        remote_path = file_manager.normalize_path(args.remote)
+        if _remote_is_directory(file_manager, remote_path):
+            remote_path = posixpath.join(remote_path, os.path.basename(local_path))
+        file_manager.upload_file(local_path, remote_path, progress, resume=args.resume)
+        return 0
+    finally:
+        progress.done()
+
+
+def command_download(file_manager: FileManager, args) -> int:
+    """Download a file or folder"""
+    remote_path = file_manager.normalize_path(args.remote)
+    local_path = os.path.abspath(args.local)
+    is_directory = _remote_is_directory(file_manager, remote_path)
+    if is_directory is None:
+        print(f"No such remote file: {remote_path}", file=sys.stderr)
+        return 1
+    progress = ProgressPrinter(f"Downloading {remote_path}", args.quiet)
+    try:
+        if is_directory:
+            file_manager.download_folder(remote_path, local_path, progress, use_tar=not args.no_tar)
+            return 0
+        if os.path.isdir(local_path):
+            local_path = os.path.join(local_path, posixpath.basename(remote_path))
+        file_manager.download_file(remote_path, local_path, progress, resume=args.resume)
+        return 0
+    finally:
+        progress.done()
+
+
+def command_sync(file_manager: FileManager, args) -> int:
+    """Synchronize a local and a remote folder in both directions"""
+    engine = SyncEngine(file_manager)
+    remote_folder = file_manager.normalize_path(args.remote)
+    plan = engine.plan(args.local, remote_folder)
+    print(plan)
+    
+    for entry in plan.conflicts:
+        if args.prefer == "local":
+            entry.action = SyncAction.UPLOAD if entry.local else SyncAction.DELETE_REMOTE
+        elif args.prefer == "remote":
+            entry.action = SyncAction.DOWNLOAD if entry.remote else SyncAction.DELETE_LOCAL
+        else:
+            print(f"Conflict, skipped: {entry.path} ({entry.reason})", file=sys.stderr)
+            
+    # Deleting is opt-in: a folder that was emptied or swapped by mistake
+    # must not wipe the other side just because the snapshot says so
+    deletions = [
+        entry for entry in plan.entries
+        if entry.action in (SyncAction.DELETE_LOCAL, SyncAction.DELETE_REMOTE)
+    ]
+    if deletions and not args.delete:
+        for entry in deletions:
+            print(f"{entry.action}, skipped: {entry.path}", file=sys.stderr)
+            entry.action = SyncAction.SKIP
+        print(f"Skipped {len(deletions)} deletions; pass --delete to apply them", file=sys.stderr)
+    if args.dry_run:
+        for entry in plan.entries:
+            print(f"{entry.action:>13}  {entry.path}")
+        return 0
+        
+    progress = ProgressPrinter("Synchronizing", args.quiet)
+    try:
+        failed = engine.execute(plan, progress)
+    finally:
+        progress.done()
+    for entry in failed:
+        print(f"Failed: {entry.path}: {entry.error}", file=sys.stderr)
+    return 1 if failed or plan.conflicts or (deletions and not args.delete) else 0
+
+
+COMMANDS = {
+    "ls": command_ls,
+    "upload": command_upload,
+    "download": command_download,
+    "sync": command_sync,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(
+        prog="python -m core.cli",
+        description="Transfer files over SFTP without the GUI."
+    )
+    parser.add_argument("target", help="user@host[:port]")
+    parser.add_argument("--password-env", default="SFTP_PASSWORD",
+                        help="environment variable holding the password (default: %(default)s)")
+    parser.add_argument("--connections", type=int, default=1,
+                        help="SSH connections to stripe transfers across")
+    parser.add_argument("--timeout", type=int, default=30, help="connection timeout in seconds")
+    parser.add_argument("--no-verify", action="store_true", help="skip checksum verification")
+    parser.add_argument("-q", "--quiet", action="store_true", help="print no progress")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log retries and reconnects")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    ls_parser = commands.add_parser("ls", help="list a remote directory")
+    ls_parser.add_argument("remote", nargs="?", default=".")
+    
+    upload_parser = commands.add_parser("upload", help="upload a file or folder")
+    upload_parser.add_argument("local")
+    upload_parser.add_argument("remote")
+    upload_parser.add_argument("--resume", action="store_true",
+                               help="continue an interrupted file upload")
+    upload_parser.add_argument("--only-changed", action="store_true",
+                               help="skip files unchanged on the server")
+    upload_parser.add_argument("--compare-hash", action="store_true",
+                               help="with --only-changed, compare contents by checksum")
+    upload_parser.add_argument("--no-tar", action="store_true", help="upload folders file by file")
+    
+    download_parser = commands.add_parser("download", help="download a file or folder")
+    download_parser.add_argument("remote")
+    download_parser.add_argument("local")
+    download_parser.add_argument("--resume", action="store_true",
+                                 help="continue an interrupted file download")
+    download_parser.add_argument("--no-tar", action="store_true",
+                                 help="download folders file by file")
+                                 
+    sync_parser = commands.add_parser("sync", help="synchronize a folder in both directions")
+    sync_parser.add_argument("local")
+    sync_parser.add_argument("remote")
+    sync_parser.add_argument("--prefer", choices=["local", "remote"],
+                             help="resolve conflicts in favour of one side")
+    sync_parser.add_argument("--delete", action="store_true",
+                             help="delete files removed on the other side since the last sync")
+    sync_parser.add_argument("--dry-run", action="store_true",
+                             help="print the plan without changing anything")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None,
+         password_prompt: Callable[[str], str] = getpass.getpass) -> int:
+    """Run the command line interface
+    
+    Args:
+        argv: Arguments without the program name (defaults to sys.argv)
+        password_prompt: Asks for the password when the environment has none
+        
+    Returns:
+        Exit status
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname)s: %(message)s"
+    )
+    try:
+        username, host, port = parse_target(args.target)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    password = os.environ.get(args.password_env)
+    if password is None:
+        password = password_prompt(f"Password for {username}@{host}: ")
+        
+    ssh_manager = SSHManager()
+    try:
+        ssh_manager.connect(host, port, username, password, args.timeout)
+        if args.connections > 1:
+            ssh_manager.open_transfer_connections(args.connections)
+        file_manager = FileManager(ssh_manager, parallel_channels=max(4, args.connections))
+        file_manager.prefetch_enabled = False
+        file_manager.verify_transfers = not args.no_verify
+        return COMMANDS[args.command](file_manager, args)
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return 130
+    except TransferCancelled as e:
+        print(e, file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        ssh_manager.disconnect()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
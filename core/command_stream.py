@@ -0,0 +1,212 @@
+"""Incremental reading of the output of a remote command"""
+import codecs
+import socket
+import threading
+import time
+from typing import BinaryIO, Iterator, Optional, Tuple, Union
+
+
+class CommandStream:
+    """Output of a command running on an SSH exec channel
+    
+    Standard output and standard error are read as they arrive, in
+    whichever order the server sends them, so neither stream can fill the
+    channel window while the other is being waited for. Output is either
+    iterated as raw chunks, decoded chunks or lines, or copied into files
+    without being decoded. The exit status is known once the output has
+    been read.
+    
+    The stream stops early when its timeout expires (raising
+    TimeoutError) or when it is cancelled; cancelling closes the channel,
+    which stops the remote command.
+    """
+    
+    STDOUT = "stdout"
+    STDERR = "stderr"
+    CHUNK_SIZE = 64 * 1024
+    POLL_INTERVAL = 0.1  # seconds between cancel and timeout checks
+    
+    def __init__(self, channel, timeout: Optional[float] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 encoding: str = 'utf-8', errors: str = 'replace'):
+        """Initialize command stream
+        
+        Args:
+            channel: Channel the command was started on
+            timeout: Seconds the whole command may take (optional)
+            cancel_event: Stops the command when set (optional)
+            encoding: Encoding of the output
+            errors: How undecodable bytes are handled
+        """
+        self.channel = channel
+        self.encoding = encoding
+        self.errors = errors
+        self.cancel_event = cancel_event or threading.Event()
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.cancelled = False
+        self._exit_status: Optional[int] = None
+        self._consumed = False
+        channel.settimeout(self.POLL_INTERVAL)
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """Iterate over output lines; see lines()"""
+        return self.lines()
+        
+    def _check_stop(self) -> bool:
+        """Close the channel if cancelled; raise if the timeout expired
+        
+        Returns:
+            True if the stream was cancelled
+        """
+        if self.cancel_event.is_set():
+            self.cancelled = True
+            self.channel.close()
+            return True
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.channel.close()
+            raise TimeoutError("Remote command timed out")
+        return False
+        
+    def raw_chunks(self) -> Iterator[Tuple[str, bytes]]:
+        """Yield output bytes as they arrive
+        
+        Yields:
+            Tuples of (STDOUT or STDERR, bytes)
+            
+        Raises:
+            TimeoutError: If the timeout expired
+        """
+        if self._consumed:
+            raise RuntimeError("Command output was already read")
+        self._consumed = True
+        channel = self.channel
+        stdout_open = True
+        try:
+            while True:
+                if self._check_stop():
+                    return
+                while channel.recv_stderr_ready():
+                    yield self.STDERR, channel.recv_stderr(self.CHUNK_SIZE)
+                if stdout_open:
+                    try:
+                        data = channel.recv(self.CHUNK_SIZE)
+                    except socket.timeout:
+                        continue
+                    if data:
+                        yield self.STDOUT, data
+                        continue
+                    stdout_open = False
+                # End of output; standard error may still hold data
+                if channel.exit_status_ready() and not channel.recv_stderr_ready():
+                    break
+                channel.status_event.wait(self.POLL_INTERVAL)
+            self._exit_status = channel.recv_exit_status()
+        finally:
+            if self._exit_status is None:
+                channel.close()
+                
+    def chunks(self) -> Iterator[Tuple[str, str]]:
+        """Yield decoded output as it arrives
+        
+        Each stream has its own incremental decoder, so a character split
+        across two chunks is decoded whole.
+        
+        Yields:
+            Tuples of (STDOUT or STDERR, text)
+        """
+        decoders = {
+            name: codecs.getincrementaldecoder(self.encoding)(self.errors)
+            for name in (self.STDOUT, self.STDERR)
+        }
+        for name, data in self.raw_chunks():
+            text = decoders[name].decode(data)
+            if text:
+                yield name, text
+        for name, decoder in decoders.items():
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield name, text
+                
+    def lines(self) -> Iterator[Tuple[str, str]]:
+        """Yield output lines as they are completed
+        
+        Lines are yielded without their line break. A last line without a
+        line break is yielded when the output ends.
+        
+        Yields:
+            Tuples of (STDOUT or STDERR, line)
+        """
+        pending = {self.STDOUT: "", self.STDERR: ""}
+        for name, text in self.chunks():
+            lines = (pending[name] + text).split("\n")
+            pending[name] = lines.pop()
+            for line in lines:
+                yield name, line.rstrip("\r")
+        for name, rest in pending.items():
+            if rest:
+                yield name, rest.rstrip("\r")
+                
+    def copy_to(self, stdout_sink: Union[str, BinaryIO],
+                stderr_sink: Union[str, BinaryIO, None] = None) -> Optional[int]:
+        """Write the output into files without decoding it
+        
+        Args:
+            stdout_sink: Path or binary file receiving standard output
+            stderr_sink: Path or binary file receiving standard error
+                (optional, discarded when omitted)
+                
+        Returns:
+            Exit status, or None if the stream was cancelled
+            
+        Raises:
+            TimeoutError: If the timeout expired
+        """
+        opened = []
+        
+        def _open(sink):
+            if isinstance(sink, str):
+                sink = open(sink, 'wb')
+                opened.append(sink)
+            return sink
+            
+        try:
+            sinks = {self.STDOUT: _open(stdout_sink), self.STDERR: _open(stderr_sink)}
+            for name, data in self.raw_chunks():
+                sink = sinks[name]
+                if sink is not None:
+                    sink.write(data)
+        finally:
+            for sink in opened:
+                sink.close()
+        return self._exit_status
+        
+    def read_all(self) -> Tuple[str, str]:
+        """Read the complete output
+        
+        Returns:
+            Tuple of (stdout, stderr)
+        """
+        parts = {self.STDOUT: [], self.STDERR: []}
+        for name, text in self.chunks():
+            parts[name].append(text)
+        return "".join(parts[self.STDOUT]), "".join(parts[self.STDERR])
+        
+    @property
+    def exit_status(self) -> Optional[int]:
+        """Exit status of the command, or None until the output was read
+        or if the stream was cancelled"""
+        return self._exit_status
+        
+    def cancel(self):
+        """Stop the command; safe to call from any thread"""
+        self.cancel_event.set()
+        
+    def close(self):
+        """Close the channel"""
+        self.channel.close()
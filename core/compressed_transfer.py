@@ -0,0 +1,310 @@
+"""File transfers compressed on the wire through an SSH exec channel"""
+import os
+import posixpath
+import shlex
+import zlib
+from typing import Callable, List, Optional
+
+from core.errors import TransferCancelled
+from core.transfer_verifier import StreamingDigest
+
+# Try to import optional dependencies
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+
+class _GzipCodec:
+    """Streaming gzip (de)compression matching the remote ``gzip`` command"""
+    
+    name = "gzip"
+    compress_command = "gzip -1 -c"
+    decompress_command = "gzip -d -c"
+    
+    def compressor(self):
+        """Create a compressor with compress() and flush()"""
+        return zlib.compressobj(1, zlib.DEFLATED, 31)
+        
+    def decompressor(self):
+        """Create a decompressor with decompress()"""
+        return zlib.decompressobj(47)
+
+
+class _ZstdCodec:
+    """Streaming zstd (de)compression matching the remote ``zstd`` command"""
+    
+    name = "zstd"
+    compress_command = "zstd -3 -q -c"
+    decompress_command = "zstd -d -q -c"
+    
+    def compressor(self):
+        """Create a compressor with compress() and flush()"""
+        return zstandard.ZstdCompressor(level=3).compressobj()
+        
+    def decompressor(self):
+        """Create a decompressor with decompress()"""
+        return zstandard.ZstdDecompressor().decompressobj()
+
+
+class CompressedTransfer:
+    """Pipes file contents through gzip or zstd on both ends of an exec channel
+    
+    Text such as logs or SQL dumps often shrinks ten-fold, so on a slow link
+    the transfer finishes several times sooner than over SFTP. Files are only
+    compressed when ``worth_compressing`` expects a gain: already compressed
+    formats are recognized by extension, and samples from the start, middle
+    and end of the file are test-compressed. Compressed transfers are not
+    resumable; an interrupted one starts over. Data is written to a hidden
+    partial file next to the destination and renamed over it on success,
+    so an interrupted transfer never leaves a truncated destination. An
+    upload keeps the mode, owner and ACL of the file it replaces and
+    writes through a symlinked destination.
+    """
+    
+    BLOCK_SIZE = 256 * 1024
+    MIN_SIZE = 256 * 1024  # smaller files are not worth an exec channel
+    SAMPLE_SIZE = 64 * 1024
+    MAX_RATIO = 0.7  # compressed/original size of the samples
+    SKIP_EXTENSIONS = frozenset((
+        '.gz', '.tgz', '.bz2', '.xz', '.txz', '.zst', '.lz4', '.lzma', '.br', '.z',
+        '.zip', '.7z', '.rar', '.jar', '.war', '.whl', '.apk', '.deb', '.rpm',
+        '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.avif',
+        '.mp3', '.mp4', '.m4a', '.mkv', '.mov', '.avi', '.webm', '.ogg', '.flac',
+        '.pdf', '.docx', '.xlsx', '.pptx', '.odt', '.ods',
+    ))
+    
+    # Decompresses stdin next to the destination and renames the result
+    # over it. A symlinked destination is resolved first so the link stays,
+    # and the owner, ACL and mode of an existing file are copied over (GNU
+    # options first, then BSD stat); a mode that cannot be copied fails the
+    # upload rather than leaving the file with different permissions.
+    UPLOAD_SCRIPT = """\
+dest={remote_path}
+if [ -L "$dest" ]; then dest=$(readlink -f -- "$dest") || exit 1; fi
+partial="$(dirname -- "$dest")/.$(basename -- "$dest").partial-{pid}"
+if ! {decompress} > "$partial"; then rm -f "$partial"; exit 1; fi
+if [ -e "$dest" ]; then
+    chown --reference="$dest" "$partial" 2>/dev/null || chown "$(stat -f %u:%g "$dest" 2>/dev/null)" "$partial" 2>/dev/null
+    getfacl -p -- "$dest" 2>/dev/null | setfacl --set-file=- "$partial" 2>/dev/null
+    chmod --reference="$dest" "$partial" 2>/dev/null || chmod "$(stat -f %Lp "$dest" 2>/dev/null)" "$partial" \\
+        || {{ rm -f "$partial"; exit 1; }}
+fi
+mv -f "$partial" "$dest" || {{ rm -f "$partial"; exit 1; }}
+"""
+    
+    def __init__(self, ssh_manager, codec_name: str = "gzip"):
+        """Initialize compressed transfer
+        
+        Args:
+            ssh_manager: SSH manager instance
+            codec_name: "zstd" or "gzip", as returned by available_codecs()
+        """
+        self.ssh_manager = ssh_manager
+        self.codec = _ZstdCodec() if codec_name == "zstd" else _GzipCodec()
+        
+    @staticmethod
+    def available_codecs(ssh_manager) -> List[str]:
+        """Find the codecs both this client and the server support, best first
+        
+        Args:
+            ssh_manager: SSH manager instance
+            
+        Returns:
+            List of codec names, empty if the server has neither command
+        """
+        try:
+            stdout, _, _ = ssh_manager.execute_command("command -v zstd; command -v gzip")
+        except Exception:
+            return []
+        commands = {posixpath.basename(line.strip()) for line in stdout.splitlines()}
+        codecs = []
+        if ZSTANDARD_AVAILABLE and "zstd" in commands:
+            codecs.append("zstd")
+        if "gzip" in commands:
+            codecs.append("gzip")
+        return codecs
+        
+    @classmethod
+    def _compresses_well(cls, samples: List[bytes]) -> bool:
+        """Test-compress samples with a fast level"""
+        data = b"".join(samples)
+        if not data:
+            return False
+        return len(zlib.compress(data, 1)) <= len(data) * cls.MAX_RATIO
+        
+    @classmethod
+    def _sample_offsets(cls, size: int) -> List[int]:
+        """Offsets of the start, middle and end samples of a file"""
+        if size <= cls.SAMPLE_SIZE * 3:
+            return [0]
+        return [0, (size - cls.SAMPLE_SIZE) // 2, size - cls.SAMPLE_SIZE]
+        
+    @classmethod
+    def _skipped_name(cls, path: str, size: int) -> bool:
+        """Check the cheap criteria that rule compression out"""
+        extension = os.path.splitext(path)[1].lower()
+        return size < cls.MIN_SIZE or extension in cls.SKIP_EXTENSIONS
+        
+    @classmethod
+    def worth_compressing(cls, local_path: str) -> bool:
+        """Decide whether uploading a local file compressed is likely faster
+        
+        Args:
+            local_path: Local file path
+            
+        Returns:
+            True if the file is large enough and its samples compress well
+        """
+        try:
+            size = os.path.getsize(local_path)
+            if cls._skipped_name(local_path, size):
+                return False
+            samples = []
+            with open(local_path, 'rb') as local_file:
+                for offset in cls._sample_offsets(size):
+                    local_file.seek(offset)
+                    samples.append(local_file.read(cls.SAMPLE_SIZE))
+        except OSError:
+            return False
+        return cls._compresses_well(samples)
+        
+    def remote_worth_compressing(self, remote_path: str, size: int) -> bool:
+        """Decide whether downloading a remote file compressed is likely faster
+        
+        Args:
+            remote_path: Absolute remote file path
+            size: Remote file size
+            
+        Returns:
+            True if the file is large enough and its samples compress well
+        """
+        if self._skipped_name(remote_path, size):
+            return False
+            
+        def _read_samples(sftp):
+            samples = []
+            with sftp.open(remote_path, 'r') as remote_file:
+                for offset in self._sample_offsets(size):
+                    remote_file.seek(offset)
+                    samples.append(remote_file.read(self.SAMPLE_SIZE))
+            return samples
+            
+        try:
+            return self._compresses_well(self.ssh_manager.safe_operation(_read_samples))
+        except IOError:
+            return False
+            
+    def _open_channel(self, command: str):
+        """Start a command on a new exec channel with a large window"""
+        transport = self.ssh_manager.ssh_client.get_transport()
+        channel = transport.open_session(window_size=self.ssh_manager.TRANSFER_WINDOW_SIZE)
+        channel.exec_command(command)
+        return channel
+        
+    @staticmethod
+    def _partial_name(name: str) -> str:
+        """Hidden name a transfer writes to before renaming it to name"""
+        return f".{name}.partial-{os.getpid()}"
+        
+    @staticmethod
+    def _check_exit(channel):
+        """Raise the remote error if the command failed"""
+        exit_code = channel.recv_exit_status()
+        if exit_code != 0:
+            error = channel.makefile_stderr('rb').read().decode('utf-8', errors='replace')
+            raise IOError(f"Remote command failed with exit code {exit_code}: {error.strip()}")
+            
+    def upload(self, local_path: str, remote_path: str,
+               progress_callback: Optional[Callable[[int, int], bool]] = None,
+               digest: Optional[StreamingDigest] = None):
+        """Upload a file, decompressing it on the server
+        
+        Args:
+            local_path: Local file path
+            remote_path: Absolute remote file path
+            progress_callback: Called with (transferred, total) in uncompressed
+                bytes; returning False cancels the transfer
+            digest: Fed with the uncompressed data sent (optional)
+            
+        Raises:
+            TransferCancelled: If the progress callback cancelled the transfer
+            IOError: If the remote command failed
+        """
+        size = os.path.getsize(local_path)
+        command = self.UPLOAD_SCRIPT.format(
+            remote_path=shlex.quote(remote_path),
+            pid=os.getpid(),
+            decompress=self.codec.decompress_command
+        )
+        channel = self._open_channel(command)
+        compressor = self.codec.compressor()
+        transferred = 0
+        try:
+            try:
+                with open(local_path, 'rb') as local_file:
+                    while True:
+                        data = local_file.read(self.BLOCK_SIZE)
+                        if not data:
+                            break
+                        channel.sendall(compressor.compress(data))
+                        if digest:
+                            digest.update(transferred, data)
+                        transferred += len(data)
+                        if progress_callback and progress_callback(transferred, size) is False:
+                            raise TransferCancelled("Transfer cancelled")
+                channel.sendall(compressor.flush())
+                channel.shutdown_write()
+            except OSError:
+                if not channel.exit_status_ready():
+                    raise
+                # The remote command exited early; its status explains why
+            self._check_exit(channel)
+        finally:
+            channel.close()
+            
+    def download(self, remote_path: str, local_path: str,
+                 progress_callback: Optional[Callable[[int, int], bool]] = None,
+                 size: int = 0, digest: Optional[StreamingDigest] = None):
+        """Download a file compressed by the server
+        
+        Args:
+            remote_path: Absolute remote file path
+            local_path: Local file path
+            progress_callback: Called with (transferred, total) in uncompressed
+                bytes; returning False cancels the transfer
+            size: Remote file size, used as the progress total
+            digest: Fed with the uncompressed data received (optional)
+            
+        Raises:
+            TransferCancelled: If the progress callback cancelled the transfer
+            IOError: If the remote command failed
+        """
+        command = f"{self.codec.compress_command} < {shlex.quote(remote_path)}"
+        channel = self._open_channel(command)
+        decompressor = self.codec.decompressor()
+        directory, name = os.path.split(local_path)
+        partial_path = os.path.join(directory, self._partial_name(name))
+        transferred = 0
+        try:
+            with open(partial_path, 'wb') as local_file:
+                while True:
+                    data = channel.recv(self.BLOCK_SIZE)
+                    if not data:
+                        break
+                    data = decompressor.decompress(data)
+                    local_file.write(data)
+                    if digest:
+                        digest.update(transferred, data)
+                    transferred += len(data)
+                    if progress_callback and progress_callback(transferred, size) is False:
+                        raise TransferCancelled("Transfer cancelled")
+            self._check_exit(channel)
+            os.replace(partial_path, local_path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        finally:
+            channel.close()
@@ -0,0 +1,361 @@
+"""Uploads that send only the changed blocks of a file"""
+import hashlib
+import math
+import mmap
+import os
+import shlex
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.errors import TransferCancelled
+
+# Runs on the server with python3. "sig" prints the size and mtime of a file
+# followed by the adler32 and sha1 of each block. "patch" rebuilds the file
+# from block copies and literal data read from stdin, checks the sha1 of the
+# result and then replaces the file.
+_HELPER = r'''
+import hashlib, os, struct, sys, zlib
+mode, path, block_size = sys.argv[1], sys.argv[2], int(sys.argv[3])
+inp, out = sys.stdin.buffer, sys.stdout.buffer
+def read_exact(n):
+    data = b""
+    while len(data) < n:
+        chunk = inp.read(n - len(data))
+        if not chunk:
+            raise SystemExit("delta stream truncated")
+        data += chunk
+    return data
+st = os.stat(path)
+if mode == "sig":
+    out.write(struct.pack(">QQ", st.st_size, int(st.st_mtime)))
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            out.write(struct.pack(">I", zlib.adler32(block) & 0xffffffff) + hashlib.sha1(block).digest())
+    sys.exit(0)
+tmp = os.path.join(os.path.dirname(path), ".%s.delta-%d" % (os.path.basename(path), os.getpid()))
+try:
+    digest = hashlib.sha1()
+    with open(path, "rb") as src, open(tmp, "wb") as dst:
+        while True:
+            op = read_exact(1)
+            if op == b"C":
+                start, count = struct.unpack(">QI", read_exact(12))
+                src.seek(start * block_size)
+                remaining = count * block_size
+                while remaining > 0:
+                    data = src.read(min(remaining, 1 << 20))
+                    if not data:
+                        break
+                    dst.write(data)
+                    digest.update(data)
+                    remaining -= len(data)
+            elif op == b"L":
+                data = read_exact(struct.unpack(">I", read_exact(4))[0])
+                dst.write(data)
+                digest.update(data)
+            elif op == b"E":
+                if read_exact(20) != digest.digest():
+                    raise SystemExit("result checksum mismatch")
+                break
+            else:
+                raise SystemExit("bad delta operation")
+    os.chmod(tmp, st.st_mode & 0o7777)
+    os.replace(tmp, path)
+except BaseException:
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    raise
+'''
+
+
+@dataclass
+class BlockSignature:
+    """Checksums of the fixed-size blocks of one version of a file"""
+    block_size: int
+    size: int
+    mtime: int
+    weak: List[int] = field(default_factory=list)  # adler32 per block
+    strong: List[bytes] = field(default_factory=list)  # sha1 per block
+
+
+class DeltaUpload:
+    """Updates a remote file by sending only the blocks that changed
+    
+    The old version is described by a ``BlockSignature``, either kept from
+    the download the file was edited from or computed on the server by a
+    small python3 helper. The local file is scanned rsync style: blocks at
+    their old place are recognized by a strong hash directly, and after a
+    change a rolling checksum finds where old blocks continue. The helper
+    then rebuilds the file from the copy and literal instructions next to
+    the original and only replaces it when the checksum of the result
+    matches the local file.
+    """
+    
+    MIN_BLOCK_SIZE = 2 * 1024
+    MAX_BLOCK_SIZE = 128 * 1024
+    MAX_LITERAL_RATIO = 0.5  # above this share of new data a full upload is used
+    ROLLING_BUDGET = 4 * 1024 * 1024  # bytes scanned byte by byte before giving up
+    LITERAL_CHUNK = 1024 * 1024
+    
+    def __init__(self, ssh_manager):
+        """Initialize delta upload
+        
+        Args:
+            ssh_manager: SSH manager instance
+        """
+        self.ssh_manager = ssh_manager
+        
+    @staticmethod
+    def helper_available(ssh_manager) -> bool:
+        """Check whether the server can run the python3 helper
+        
+        Args:
+            ssh_manager: SSH manager instance
+            
+        Returns:
+            True if python3 exists on the server
+        """
+        try:
+            stdout, _, exit_code = ssh_manager.execute_command("command -v python3")
+        except Exception:
+            return False
+        return exit_code == 0 and bool(stdout.strip())
+        
+    @classmethod
+    def block_size_for(cls, size: int) -> int:
+        """Pick a block size of about the square root of the file size"""
+        block_size = int(math.sqrt(size)) // 1024 * 1024
+        return max(cls.MIN_BLOCK_SIZE, min(cls.MAX_BLOCK_SIZE, block_size))
+        
+    @classmethod
+    def signature(cls, local_path: str, mtime: int) -> BlockSignature:
+        """Compute the block signature of a local copy of a remote file
+        
+        Args:
+            local_path: Local file with the same content as the remote file
+            mtime: Modification time of the remote file
+            
+        Returns:
+            Block signature
+        """
+        size = os.path.getsize(local_path)
+        signature = BlockSignature(cls.block_size_for(size), size, int(mtime))
+        with open(local_path, 'rb') as local_file:
+            while True:
+                block = local_file.read(signature.block_size)
+                if not block:
+                    break
+                signature.weak.append(zlib.adler32(block))
+                signature.strong.append(hashlib.sha1(block).digest())
+        return signature
+        
+    def _helper_command(self, mode: str, remote_path: str, block_size: int) -> str:
+        """Build the command line running the helper"""
+        return (f"python3 -c {shlex.quote(_HELPER)} {mode} "
+                f"{shlex.quote(remote_path)} {block_size}")
+                
+    def _open_channel(self, command: str):
+        """Start a command on a new exec channel with a large window"""
+        transport = self.ssh_manager.ssh_client.get_transport()
+        channel = transport.open_session(window_size=self.ssh_manager.TRANSFER_WINDOW_SIZE)
+        channel.exec_command(command)
+        return channel
+        
+    @staticmethod
+    def _check_exit(channel):
+        """Raise the remote error if the helper failed"""
+        exit_code = channel.recv_exit_status()
+        if exit_code != 0:
+            error = channel.makefile_stderr('rb').read().decode('utf-8', errors='replace')
+            raise IOError(f"Delta helper failed with exit code {exit_code}: {error.strip()}")
+            
+    def remote_signature(self, remote_path: str, block_size: int) -> BlockSignature:
+        """Compute the block signature of a remote file on the server
+        
+        Args:
+            remote_path: Absolute remote file path
+            block_size: Block size in bytes
+            
+        Returns:
+            Block signature
+        """
+        channel = self._open_channel(self._helper_command("sig", remote_path, block_size))
+        try:
+            data = channel.makefile('rb').read()
+            self._check_exit(channel)
+        finally:
+            channel.close()
+        size, mtime = struct.unpack_from(">QQ", data)
+        signature = BlockSignature(block_size, size, mtime)
+        for offset in range(16, len(data), 24):
+            signature.weak.append(struct.unpack_from(">I", data, offset)[0])
+            signature.strong.append(data[offset + 4:offset + 24])
+        return signature
+        
+    def _delta(self, data, signature: BlockSignature) -> Optional[List[Tuple[str, int, int]]]:
+        """Match the local data against the old blocks
+        
+        Returns:
+            List of ("C", first block, block count) and ("L", offset, length)
+            operations, or None if too much of the file is new
+        """
+        block_size = signature.block_size
+        size = len(data)
+        block_count = len(signature.strong)
+        last_length = signature.size - (block_count - 1) * block_size if block_count else 0
+        strong_index: Dict[bytes, int] = {}
+        weak_index: Dict[int, List[int]] = {}
+        for index, (weak, strong) in enumerate(zip(signature.weak, signature.strong)):
+            strong_index.setdefault(strong, index)
+            weak_index.setdefault(weak, []).append(index)
+            
+        operations: List[Tuple[str, int, int]] = []
+        literal_bytes = 0
+        literal_limit = size * self.MAX_LITERAL_RATIO
+        budget = self.ROLLING_BUDGET
+        
+        def _copy(index: int):
+            if operations and operations[-1][0] == "C" and operations[-1][1] + operations[-1][2] == index:
+                operations[-1] = ("C", operations[-1][1], operations[-1][2] + 1)
+            else:
+                operations.append(("C", index, 1))
+                
+        def _literal(offset: int, length: int):
+            nonlocal literal_bytes
+            literal_bytes += length
+            if operations and operations[-1][0] == "L" and operations[-1][1] + operations[-1][2] == offset:
+                operations[-1] = ("L", operations[-1][1], operations[-1][2] + length)
+            else:
+                operations.append(("L", offset, length))
+                
+        def _block_at(position: int) -> Tuple[Optional[int], int]:
+            """Old block starting at a position, and its length"""
+            if block_count and size - position == last_length:
+                strong = hashlib.sha1(data[position:size]).digest()
+                if strong == signature.strong[-1]:
+                    return block_count - 1, last_length
+            if position + block_size > size:
+                return None, 0
+            index = strong_index.get(hashlib.sha1(data[position:position + block_size]).digest())
+            if index is not None and (index < block_count - 1 or last_length == block_size):
+                return index, block_size
+            return None, 0
+            
+        position = 0
+        while position < size:
+            index, length = _block_at(position)
+            if index is not None:
+                _copy(index)
+                position += length
+                continue
+                
+            # Roll a weak checksum forward until an old block lines up again
+            start = position
+            found = None
+            if position + block_size <= size:
+                checksum = zlib.adler32(data[position:position + block_size])
+                a, b = checksum & 0xffff, checksum >> 16
+                while True:
+                    candidates = weak_index.get((b << 16) | a)
+                    if candidates is not None and position > start:
+                        strong = hashlib.sha1(data[position:position + block_size]).digest()
+                        for candidate in candidates:
+                            if signature.strong[candidate] == strong and (
+                                    candidate < block_count - 1 or last_length == block_size):
+                                found = candidate
+                                break
+                        if found is not None:
+                            break
+                    if position + block_size >= size:
+                        break
+                    budget -= 1
+                    if budget < 0 or literal_bytes + position - start > literal_limit:
+                        return None
+                    out_byte, in_byte = data[position], data[position + block_size]
+                    a = (a - out_byte + in_byte) % 65521
+                    b = (b - block_size * out_byte + a - 1) % 65521
+                    position += 1
+                    
+            if found is None:
+                # Nothing further matches a full block; the rest is new
+                _literal(start, size - start)
+                break
+            _literal(start, position - start)
+            _copy(found)
+            position += block_size
+            
+        if literal_bytes > literal_limit:
+            return None
+        return operations
+        
+    def upload(self, local_path: str, remote_path: str,
+               signature: Optional[BlockSignature] = None,
+               progress_callback: Optional[Callable[[int, int], bool]] = None) -> bool:
+        """Update a remote file from a local file by sending changed blocks
+        
+        Args:
+            local_path: Local file path
+            remote_path: Absolute remote file path
+            signature: Signature of the current remote content (optional;
+                computed on the server when missing or outdated)
+            progress_callback: Called with (sent literal bytes, total literal
+                bytes); returning False cancels the upload
+                
+        Returns:
+            True if the file was updated, False if a delta would not save
+            enough and the file should be uploaded in full
+            
+        Raises:
+            TransferCancelled: If the progress callback cancelled the upload
+            IOError: If the helper failed; the remote file is unchanged
+        """
+        remote_stat = self.ssh_manager.safe_operation(lambda sftp: sftp.stat(remote_path))
+        if signature is None or (signature.size, signature.mtime) != (
+                remote_stat.st_size, int(remote_stat.st_mtime)):
+            block_size = self.block_size_for(os.path.getsize(local_path))
+            signature = self.remote_signature(remote_path, block_size)
+            
+        with open(local_path, 'rb') as local_file:
+            if os.fstat(local_file.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(local_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                operations = self._delta(data, signature)
+                if operations is None:
+                    return False
+                self._send(data, remote_path, signature.block_size, operations, progress_callback)
+        return True
+        
+    def _send(self, data, remote_path: str, block_size: int,
+              operations: List[Tuple[str, int, int]],
+              progress_callback: Optional[Callable[[int, int], bool]]):
+        """Stream the operations to the patch helper"""
+        total = sum(length for kind, _, length in operations if kind == "L")
+        sent = 0
+        channel = self._open_channel(self._helper_command("patch", remote_path, block_size))
+        try:
+            try:
+                for kind, first, count in operations:
+                    if kind == "C":
+                        channel.sendall(b"C" + struct.pack(">QI", first, count))
+                        continue
+                    for offset in range(first, first + count, self.LITERAL_CHUNK):
+                        chunk = data[offset:min(offset + self.LITERAL_CHUNK, first + count)]
+                        channel.sendall(b"L" + struct.pack(">I", len(chunk)) + chunk)
+                        sent += len(chunk)
+                        if progress_callback and progress_callback(sent, total) is False:
+                            raise TransferCancelled("Upload cancelled")
+                # The rebuilt file must equal the local file as a whole
+                channel.sendall(b"E" + hashlib.sha1(data).digest())
+                channel.shutdown_write()
+            except OSError:
+                if not channel.exit_status_ready():
+                    raise
+                # The helper exited early; its status explains why
+            self._check_exit(channel)
+        finally:
+            channel.close()
@@ -0,0 +1,13 @@
+"""Exceptions shared by the core modules"""
+
+
+class TransferCancelled(Exception):
+    """Raised when a transfer is cancelled through its progress callback"""
+
+
+class TransferVerificationError(IOError):
+    """Raised when a transferred file does not match its source"""
+
+
+class NotConnectedError(ConnectionError):
+    """Raised when there is no connection to use or restore"""
@@ -0,0 +1,48 @@
+"""Callback hooks used by the core in place of Qt signals"""
+import logging
+import threading
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class Event:
+    """List of callbacks notified when something happens
+    
+    Offers the connect()/emit() interface of a Qt signal without needing
+    Qt, so the core runs headless. Callbacks run in the emitting thread;
+    GUI code wraps them with ``ui.qt_bridge.in_gui_thread``. An exception
+    raised by a callback is logged and does not reach the emitter.
+    """
+    
+    def __init__(self):
+        """Initialize event without callbacks"""
+        self._callbacks: List[Callable] = []
+        self._lock = threading.Lock()
+        
+    def connect(self, callback: Callable):
+        """Call a function whenever the event is emitted
+        
+        Args:
+            callback: Called with the emitted arguments
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+            
+    def disconnect(self, callback: Callable = None):
+        """Stop calling a function, or every function if none is given"""
+        with self._lock:
+            if callback is None:
+                self._callbacks.clear()
+            elif callback in self._callbacks:
+                self._callbacks.remove(callback)
+                
+    def emit(self, *args):
+        """Call every connected function with the given arguments"""
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception("Event callback %r failed", callback)
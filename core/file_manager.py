@@ -3,13 +3,23 @@ import os
 import stat
 import posixpath
 import tempfile
-from typing import List, Optional, Callable
+from typing import Dict, Iterator, List, Optional, Callable, Tuple
 from dataclasses import dataclass
-from PySide6.QtCore import QObject, Signal
-from PySide6.QtWidgets import QProgressDialog, QApplication
-from PySide6.QtCore import Qt
 
 from core.ssh_manager import SSHManager
+from core.chunked_transfer import ChunkedTransfer
+from core.compressed_transfer import CompressedTransfer
+from core.delta_transfer import BlockSignature, DeltaUpload
+from core.errors import TransferCancelled
+from core.events import Event
+from core.folder_transfer import ChangedFileScanner, FolderUploadSummary, ParallelFolderDownload
+from core.listing_cache import ListingCache
+from core.listing_prefetcher import ListingPrefetcher
+from core.resumable_transfer import ResumableTransfer
+from core.sftp_pipeline import SFTPPipeline
+from core.tar_transfer import TarStreamDownload, TarStreamUpload
+from core.transfer_state import TransferStateStore
+from core.transfer_verifier import DigestingFile, StreamingDigest, TransferVerifier
 
 
 @dataclass
@@ -35,30 +45,171 @@ class RemoteFileInfo:
         return f"{size:.1f} TB"
 
 
-class FileManager(QObject):
-    """Manages file operations on remote server"""
+class FileManager:
+    """Manages file operations on remote server
     
-    file_uploaded = Signal(str)  # filename
-    file_downloaded = Signal(str)  # filename
-    directory_changed = Signal(str)  # new_path
-    operation_progress = Signal(int, int)  # transferred, total
+    Has no Qt dependency, so batch jobs can use it without a display.
+    Its events (file_uploaded, file_downloaded, directory_changed) are
+    emitted from the thread that ran the operation.
+    """
     
-    def __init__(self, ssh_manager: SSHManager):
+    CHUNKED_THRESHOLD = 64 * 1024 * 1024  # files this large move in parallel ranges
+    LIST_BATCH_SIZE = 500
+    LISTING_CACHE_TTL = 30.0  # seconds
+    LISTING_CACHE_FILES = 200000  # cached entries over all directories
+    REALPATH_CACHE_SIZE = 4096
+    PREFETCH_WORKERS = 1
+    PREFETCH_DEPTH = 1
+    DELTA_MIN_SIZE = 1024 * 1024  # smaller edited files are uploaded in full
+    
+    def __init__(self, ssh_manager: SSHManager, parallel_channels: int = 4):
         """Initialize file manager
         
         Args:
             ssh_manager: SSH manager instance
+            parallel_channels: Channels used for a single large transfer
         """
-        super().__init__()
+        self.file_uploaded = Event()  # filename
+        self.file_downloaded = Event()  # filename
+        self.directory_changed = Event()  # new_path
+        self.operation_progress = Event()  # transferred, total
         self.ssh_manager = ssh_manager
+        self.parallel_channels = parallel_channels
         self.current_path = "."
         self.path_history = []
+        self._state_store: Optional[TransferStateStore] = None
+        self.listing_cache = ListingCache(self.LISTING_CACHE_TTL, self.LISTING_CACHE_FILES)
+        self.prefetcher = ListingPrefetcher(self, self.PREFETCH_WORKERS, self.PREFETCH_DEPTH)
+        self.prefetch_enabled = True
+        self._realpaths: Dict[str, str] = {}  # normalized path -> server realpath
+        self._remote_tar: Optional[bool] = None
+        self.compression_enabled = True
+        self._remote_codecs: Optional[List[str]] = None
+        self._remote_python: Optional[bool] = None
+        self._edit_signatures: Dict[str, BlockSignature] = {}  # temp path -> remote blocks
+        self.verifier = TransferVerifier(ssh_manager)
+        self.verify_transfers = True
+        self.last_upload_summary: Optional[FolderUploadSummary] = None
+        
+    @property
+    def state_store(self) -> TransferStateStore:
+        """Persistent progress store for resumable transfers"""
+        if self._state_store is None:
+            self._state_store = TransferStateStore()
+        return self._state_store
+        
+    @staticmethod
+    def _to_file_info(file_attr) -> RemoteFileInfo:
+        """Convert SFTP attributes to a RemoteFileInfo"""
+        return RemoteFileInfo(
+            filename=file_attr.filename,
+            size=file_attr.st_size or 0,
+            is_directory=stat.S_ISDIR(file_attr.st_mode or 0),
+            permissions=file_attr.st_mode or 0,
+            modified_time=file_attr.st_mtime or 0
+        )
+        
+    @staticmethod
+    def sort_files(files: List[RemoteFileInfo]) -> List[RemoteFileInfo]:
+        """Sort files with directories first, then by name
+        
+        Args:
+            files: List of RemoteFileInfo objects
+            
+        Returns:
+            Sorted list
+        """
+        return sorted(files, key=lambda f: (not f.is_directory, f.filename.lower()))
+        
+    def set_current_path(self, path: str):
+        """Set the current directory without listing it
+        
+        Args:
+            path: Absolute remote directory path
+        """
+        self.current_path = path
+        self.directory_changed.emit(path)
+        
+    def normalize_path(self, path: str) -> str:
+        """Resolve a path against the current directory without contacting the server
+        
+        Args:
+            path: Remote path (relative to the current directory or absolute)
+            
+        Returns:
+            Normalized path, absolute once the current directory is known
+        """
+        path = posixpath.normpath(posixpath.join(self.current_path, path))
+        if path.startswith('//'):
+            path = '/' + path.lstrip('/')
+        return path
+        
+    def _realpath(self, sftp, path: str) -> str:
+        """Resolve symlinks in a normalized directory path, caching the answer
+        
+        Args:
+            sftp: SFTP client
+            path: Normalized remote path
+            
+        Returns:
+            Canonical absolute path
+        """
+        resolved = self._realpaths.get(path)
+        if resolved is None:
+            resolved = sftp.normalize(path)
+            if len(self._realpaths) >= self.REALPATH_CACHE_SIZE:
+                self._realpaths.clear()
+            self._realpaths[path] = resolved
+        return resolved
+        
+    def _forget_realpaths(self, path: str):
+        """Drop cached realpaths at or below a renamed or removed directory"""
+        prefix = path.rstrip('/') + '/'
+        for cached_path, resolved in list(self._realpaths.items()):
+            for candidate in (cached_path, resolved):
+                if candidate == path or candidate.startswith(prefix):
+                    self._realpaths.pop(cached_path, None)
+                    
+    def _cache_key(self, path: str) -> Optional[str]:
+        """Absolute path used as listing cache key, if it can be known without the server"""
+        path = self.normalize_path(path)
+        if not path.startswith('/'):
+            return None
+        return self._realpaths.get(path, path)
         
-    def list_directory(self, path: str = None) -> List[RemoteFileInfo]:
+    def _remote_changed(self, remote_path: str, recursive: bool = False):
+        """Invalidate cached listings affected by a change to a remote path
+        
+        Args:
+            remote_path: Path of the created, replaced or removed item
+            recursive: The item is a directory whose contents changed too
+        """
+        self.listing_cache.invalidate(posixpath.dirname(remote_path))
+        self.verifier.forget(remote_path)
+        if recursive:
+            self.listing_cache.invalidate(remote_path, recursive=True)
+            
+    def _directory_loaded(self, path: str, files: List[RemoteFileInfo]):
+        """Start prefetching likely next directories after a listing"""
+        if self.prefetch_enabled:
+            self.prefetcher.directory_loaded(path, files)
+            
+    def prefetch_hint(self, path: str):
+        """Prefetch a directory the user is pointing at
+        
+        Args:
+            path: Remote directory path (relative to the current directory or absolute)
+        """
+        key = self._cache_key(path)
+        if self.prefetch_enabled and key is not None:
+            self.prefetcher.hint(key)
+            
+    def list_directory(self, path: str = None, force: bool = False) -> List[RemoteFileInfo]:
         """List files in remote directory
         
         Args:
             path: Remote directory path (optional)
+            force: Ignore the listing cache
             
         Returns:
             List of RemoteFileInfo objects
@@ -69,28 +220,83 @@ class FileManager(QObject):
         if path is None:
             path = self.current_path
             
-        sftp = self.ssh_manager.get_sftp()
-        
-        def _list_operation():
-            sftp.chdir(path)
-            self.current_path = sftp.getcwd()
-            files = []
+        key = self._cache_key(path)
+        files = None if force or key is None else self.listing_cache.get(key)
+        if files is not None:
+            self.set_current_path(key)
+            self._directory_loaded(key, files)
+            return self.sort_files(files)
             
-            for file_attr in sftp.listdir_attr():
-                files.append(RemoteFileInfo(
-                    filename=file_attr.filename,
-                    size=file_attr.st_size or 0,
-                    is_directory=stat.S_ISDIR(file_attr.st_mode),
-                    permissions=file_attr.st_mode,
-                    modified_time=file_attr.st_mtime or 0
-                ))
-                
-            return sorted(files, key=lambda f: (not f.is_directory, f.filename.lower()))
+        generation = self.listing_cache.generation()
+        
+        path = self.normalize_path(path)
+        
+        def _list_operation(sftp):
+            resolved = self._realpath(sftp, path)
+            return resolved, [self._to_file_info(a) for a in sftp.listdir_attr(resolved)]
             
-        files = self.ssh_manager.safe_operation(_list_operation)
+        self.current_path, files = self.ssh_manager.safe_operation(_list_operation)
+        self.listing_cache.put(self.current_path, files, generation)
         self.directory_changed.emit(self.current_path)
-        return files
+        self._directory_loaded(self.current_path, files)
+        return self.sort_files(files)
         
+    def iter_directory(self, path: str = None, batch_size: int = LIST_BATCH_SIZE,
+                       force: bool = False) -> Iterator[Tuple[str, List[RemoteFileInfo]]]:
+        """List a remote directory in batches as entries arrive
+        
+        Entries are read with pipelined READDIR requests and yielded
+        unsorted. The first item carries the resolved path and no entries.
+        Closing the iterator early abandons the listing. A cached listing
+        is replayed without contacting the server unless forced.
+        
+        Args:
+            path: Remote directory path (optional)
+            batch_size: Number of entries per batch
+            force: Ignore the listing cache
+            
+        Yields:
+            Tuples of (resolved absolute path, list of RemoteFileInfo)
+        """
+        if path is None:
+            path = self.current_path
+            
+        key = self._cache_key(path)
+        files = None if force or key is None else self.listing_cache.get(key)
+        if files is not None:
+            yield key, []
+            for start in range(0, len(files), batch_size):
+                yield key, files[start:start + batch_size]
+            self._directory_loaded(key, files)
+            return
+            
+        generation = self.listing_cache.generation()
+        path = self.normalize_path(path)
+        with self.ssh_manager.sftp_channel() as sftp:
+            resolved = self._realpath(sftp, path)
+            yield resolved, []
+            
+            files = []
+            batch = []
+            try:
+                for file_attr in sftp.listdir_iter(resolved):
+                    batch.append(self._to_file_info(file_attr))
+                    if len(batch) >= batch_size:
+                        files.extend(batch)
+                        yield resolved, batch
+                        batch = []
+            except GeneratorExit:
+                # Read-ahead requests are still in flight, so the channel
+                # cannot be reused; closing it makes the pool discard it
+                sftp.close()
+                raise
+                
+            files.extend(batch)
+            self.listing_cache.put(resolved, files, generation)
+            self._directory_loaded(resolved, files)
+            if batch:
+                yield resolved, batch
+                
     def change_directory(self, path: str):
         """Change current directory
         
@@ -98,17 +304,7 @@ class FileManager(QObject):
             path: Remote directory path (can be relative or absolute)
         """
         self.path_history.append(self.current_path)
-        
-        # If path is relative (just a directory name), join with current path
-        if not path.startswith('/') and not path.startswith('\\'):
-            # Relative path - join with current directory
-            import posixpath
-            new_path = posixpath.join(self.current_path, path)
-        else:
-            # Absolute path
-            new_path = path
-        
-        self.list_directory(new_path)
+        self.list_directory(self.normalize_path(path))
         
     def go_back(self) -> bool:
         """Go back to previous directory
@@ -129,68 +325,204 @@ class FileManager(QObject):
             self.change_directory(parent_path)
             
     def upload_file(self, local_path: str, remote_filename: str = None, 
-                   progress_callback: Callable[[int, int], bool] = None):
+                   progress_callback: Callable[[int, int], bool] = None,
+                   resume: bool = False, resumable: bool = False):
         """Upload file to remote server
         
         Args:
             local_path: Local file path
             remote_filename: Remote filename (optional)
             progress_callback: Progress callback function (optional)
+            resume: Continue a previously interrupted upload of this file
+            resumable: Record progress so an interrupted upload can be resumed
+                (compressed uploads still start over)
         """
         if remote_filename is None:
             remote_filename = os.path.basename(local_path)
             
         remote_path = posixpath.join(self.current_path, remote_filename)
-        sftp = self.ssh_manager.get_sftp()
-        
-        def _upload_operation():
-            if progress_callback:
-                sftp.put(local_path, remote_path, callback=progress_callback)
-            else:
-                sftp.put(local_path, remote_path)
-                
-        self.ssh_manager.safe_operation(_upload_operation)
+        digest = self._new_digest()
+        compressed = self._compressed_transfer("upload", remote_path, local_path, resume)
+        
+        if compressed and compressed.worth_compressing(local_path):
+            compressed.upload(local_path, remote_path, progress_callback, digest=digest)
+        elif resume or resumable:
+            self._resumable_transfer().upload(local_path, remote_path, progress_callback, digest=digest)
+        elif self._use_chunked(os.path.getsize(local_path)):
+            transfer = ChunkedTransfer(self.ssh_manager, self.parallel_channels)
+            transfer.upload(local_path, remote_path, progress_callback, digest=digest)
+        else:
+            def _upload_operation(sftp):
+                with open(local_path, 'rb') as local_file:
+                    source = DigestingFile(local_file, digest) if digest else local_file
+                    sftp.putfo(source, remote_path, os.path.getsize(local_path),
+                               callback=progress_callback)
+                    
+            self.ssh_manager.safe_operation(_upload_operation, transfer=True)
+            
+        self._remote_changed(remote_path)
+        if digest is not None:
+            self.verifier.verify(local_path, remote_path, digest)
         self.file_uploaded.emit(remote_filename)
         
     def download_file(self, remote_filename: str, local_path: str,
-                     progress_callback: Callable[[int, int], bool] = None):
+                     progress_callback: Callable[[int, int], bool] = None,
+                     resume: bool = False, resumable: bool = False):
         """Download file from remote server
         
         Args:
             remote_filename: Remote filename
             local_path: Local file path
             progress_callback: Progress callback function (optional)
+            resume: Continue a previously interrupted download of this file
+            resumable: Record progress so an interrupted download can be
+                resumed (compressed downloads still start over)
         """
         remote_path = posixpath.join(self.current_path, remote_filename)
-        sftp = self.ssh_manager.get_sftp()
         
-        def _download_operation():
-            if progress_callback:
-                sftp.get(remote_path, local_path, callback=progress_callback)
-            else:
-                sftp.get(remote_path, local_path)
-                
-        self.ssh_manager.safe_operation(_download_operation)
+        digest = self._new_digest()
+        compressed = self._compressed_transfer("download", remote_path, local_path, resume)
+        remote_size = None
+        if compressed or not (resume or resumable):
+            remote_size = self.ssh_manager.safe_operation(lambda sftp: sftp.stat(remote_path).st_size)
+            
+        if compressed and compressed.remote_worth_compressing(remote_path, remote_size):
+            compressed.download(remote_path, local_path, progress_callback, size=remote_size, digest=digest)
+        elif resume or resumable:
+            self._resumable_transfer().download(remote_path, local_path, progress_callback, digest=digest)
+        elif self._use_chunked(remote_size):
+            transfer = ChunkedTransfer(self.ssh_manager, self.parallel_channels)
+            transfer.download(remote_path, local_path, progress_callback, size=remote_size, digest=digest)
+        else:
+            def _download_operation(sftp):
+                with open(local_path, 'wb') as local_file:
+                    target = DigestingFile(local_file, digest) if digest else local_file
+                    size = sftp.getfo(remote_path, target, callback=progress_callback)
+                if os.path.getsize(local_path) != size:
+                    raise IOError(f"Size mismatch in download of {remote_path}: "
+                                  f"{os.path.getsize(local_path)} != {size}")
+                    
+            self.ssh_manager.safe_operation(_download_operation, transfer=True)
+            
+        if digest is not None:
+            self.verifier.verify(local_path, remote_path, digest)
         self.file_downloaded.emit(remote_filename)
         
+    def download_folder(self, remote_folder_name: str, local_folder_path: str,
+                        progress_callback: Callable[[int, int, int, int], bool] = None,
+                        use_tar: bool = True):
+        """Download entire folder recursively
+        
+        Args:
+            remote_folder_name: Remote folder name or absolute path
+            local_folder_path: Local path the folder is created as
+            progress_callback: Called with (bytes, total bytes, entries,
+                total entries); returning False cancels the download (optional)
+            use_tar: Stream the folder through tar when the server has it
+            
+        Raises:
+            TransferCancelled: If the progress callback cancelled the download
+        """
+        remote_path = posixpath.join(self.current_path, remote_folder_name)
+        
+        if use_tar and self._remote_tar_available():
+            engine = TarStreamDownload(self.ssh_manager)
+        else:
+            engine = ParallelFolderDownload(self.ssh_manager, self.parallel_channels)
+        engine.download(remote_path, local_folder_path, progress_callback)
+        self.file_downloaded.emit(remote_folder_name)
+        
+    def _use_chunked(self, size: int) -> bool:
+        """Check whether a transfer should be split into parallel ranges
+        
+        Args:
+            size: File size in bytes
+            
+        Returns:
+            True if the file is large enough to benefit from range transfers
+        """
+        return self.parallel_channels > 1 and size >= self.CHUNKED_THRESHOLD
+        
+    def _new_digest(self) -> Optional[StreamingDigest]:
+        """Start a digest fed during a transfer, if transfers are verified"""
+        if not self.verify_transfers:
+            return None
+        return StreamingDigest(self.verifier.preferred_algorithm())
+        
+    def _compressed_transfer(self, direction: str, remote_path: str, local_path: str,
+                             resume: bool) -> Optional[CompressedTransfer]:
+        """Create a compressed transfer if enabled and the server has a codec
+        
+        Compressed transfers cannot continue from an offset, so none is
+        created when a resume is requested or an interrupted transfer of
+        the file left progress behind. The codecs are looked up once per
+        connection.
+        """
+        if not self.compression_enabled or resume:
+            return None
+        if self._resumable_transfer().has_state(direction, remote_path, local_path):
+            return None
+        if self._remote_codecs is None:
+            self._remote_codecs = CompressedTransfer.available_codecs(self.ssh_manager)
+        if not self._remote_codecs:
+            return None
+        return CompressedTransfer(self.ssh_manager, self._remote_codecs[0])
+        
+    def _resumable_transfer(self) -> ResumableTransfer:
+        """Create a resumable transfer sharing this manager's settings"""
+        return ResumableTransfer(
+            self.ssh_manager, self.state_store,
+            self.parallel_channels, self.CHUNKED_THRESHOLD
+        )
+        
     def delete_file(self, filename: str):
         """Delete file or directory
         
         Args:
             filename: Remote filename
         """
-        remote_path = posixpath.join(self.current_path, filename)
-        sftp = self.ssh_manager.get_sftp()
-        
-        def _delete_operation():
-            file_stat = sftp.stat(remote_path)
-            if stat.S_ISDIR(file_stat.st_mode):
-                sftp.rmdir(remote_path)
-            else:
-                sftp.remove(remote_path)
-                
-        self.ssh_manager.safe_operation(_delete_operation)
+        errors = self.delete_files([filename])
+        if errors:
+            raise errors[filename]
+            
+    def delete_files(self, filenames: List[str]) -> Dict[str, Exception]:
+        """Delete files and empty directories with pipelined requests
+        
+        All entries are stat'ed in one pipelined batch and then removed in
+        another, so deleting many entries costs a few round trips instead
+        of two per entry.
         
+        Args:
+            filenames: Remote filenames
+            
+        Returns:
+            Errors by filename, empty if everything was deleted
+        """
+        names = {posixpath.join(self.current_path, filename): filename for filename in filenames}
+        
+        def _delete_operation(sftp):
+            pipeline = SFTPPipeline(sftp)
+            stats = pipeline.stat(names)
+            errors = {result.path: result.error for result in stats if not result.ok}
+            directories = [result.path for result in stats
+                           if result.ok and stat.S_ISDIR(result.attributes.st_mode or 0)]
+            files = [result.path for result in stats
+                     if result.ok and not stat.S_ISDIR(result.attributes.st_mode or 0)]
+            for result in pipeline.remove(files) + pipeline.rmdir(directories):
+                if not result.ok:
+                    errors[result.path] = result.error
+            return directories, errors
+            
+        directories, errors = self.ssh_manager.safe_operation(_delete_operation, idempotent=False)
+        for remote_path in names:
+            if remote_path in errors:
+                continue
+            self.listing_cache.remove_entry(posixpath.dirname(remote_path), posixpath.basename(remote_path))
+            if remote_path in directories:
+                self.listing_cache.invalidate(remote_path, recursive=True)
+                self._forget_realpaths(remote_path)
+        return {names[path]: error for path, error in errors.items()}
+            
     def rename_file(self, old_name: str, new_name: str):
         """Rename file or directory
         
@@ -200,9 +532,19 @@ class FileManager(QObject):
         """
         old_path = posixpath.join(self.current_path, old_name)
         new_path = posixpath.join(self.current_path, new_name)
-        sftp = self.ssh_manager.get_sftp()
         
-        self.ssh_manager.safe_operation(sftp.rename, old_path, new_path)
+        self.ssh_manager.safe_operation(lambda sftp: sftp.rename(old_path, new_path), idempotent=False)
+        
+        old_dir, new_dir = posixpath.dirname(old_path), posixpath.dirname(new_path)
+        if old_dir == new_dir:
+            self.listing_cache.rename_entry(old_dir, posixpath.basename(old_path), posixpath.basename(new_path))
+        else:
+            self.listing_cache.remove_entry(old_dir, posixpath.basename(old_path))
+            self.listing_cache.invalidate(new_dir)
+        self.listing_cache.invalidate(old_path, recursive=True)
+        self.listing_cache.invalidate(new_path, recursive=True)
+        self._forget_realpaths(old_path)
+        self._forget_realpaths(new_path)
         
     def create_file(self, filename: str):
         """Create empty file
@@ -211,13 +553,13 @@ class FileManager(QObject):
             filename: Remote filename
         """
         remote_path = posixpath.join(self.current_path, filename)
-        sftp = self.ssh_manager.get_sftp()
         
-        def _create_operation():
+        def _create_operation(sftp):
             with sftp.open(remote_path, 'w') as f:
                 pass  # Create empty file
                 
         self.ssh_manager.safe_operation(_create_operation)
+        self._remote_changed(remote_path)
         
     def create_directory(self, dirname: str):
         """Create directory
@@ -226,9 +568,9 @@ class FileManager(QObject):
             dirname: Directory name
         """
         remote_path = posixpath.join(self.current_path, dirname)
-        sftp = self.ssh_manager.get_sftp()
         
-        self.ssh_manager.safe_operation(sftp.mkdir, remote_path)
+        self.ssh_manager.safe_operation(lambda sftp: sftp.mkdir(remote_path), idempotent=False)
+        self._remote_changed(remote_path)
         
     def get_file_for_editing(self, filename: str) -> str:
         """Download file to temporary location for editing
@@ -252,109 +594,206 @@ class FileManager(QObject):
         
         # Download file
         self.download_file(filename, temp_path)
+        self._remember_signature(temp_path, remote_path)
         return temp_path
         
     def upload_edited_file(self, temp_path: str, remote_filename: str):
         """Upload edited file back to server
         
+        Large files are updated by sending only the changed blocks when the
+        server can run the delta helper, and uploaded in full otherwise.
+        
         Args:
             temp_path: Local temporary file path
             remote_filename: Remote filename
         """
-        self.upload_file(temp_path, remote_filename)
+        remote_path = posixpath.join(self.current_path, remote_filename)
+        
+        if self._upload_delta(temp_path, remote_path):
+            self._remote_changed(remote_path)
+            self.file_uploaded.emit(remote_filename)
+        else:
+            self.upload_file(temp_path, remote_filename)
+        self._remember_signature(temp_path, remote_path)
+        
+    def _remember_signature(self, temp_path: str, remote_path: str):
+        """Keep the block signature of a file that matches its remote copy"""
+        self._edit_signatures.pop(temp_path, None)
+        try:
+            if os.path.getsize(temp_path) < self.DELTA_MIN_SIZE:
+                return
+            remote_mtime = self.ssh_manager.safe_operation(lambda sftp: sftp.stat(remote_path).st_mtime)
+            self._edit_signatures[temp_path] = DeltaUpload.signature(temp_path, remote_mtime)
+        except Exception as e:
+            print(f"Failed to compute block signature of {temp_path}: {e}")
+            
+    def _upload_delta(self, temp_path: str, remote_path: str) -> bool:
+        """Try to update a remote file by sending only changed blocks
+        
+        Returns:
+            bool: True if the remote file was updated, False if it still
+            needs a full upload
+        """
+        if os.path.getsize(temp_path) < self.DELTA_MIN_SIZE:
+            return False
+        if self._remote_python is None:
+            self._remote_python = DeltaUpload.helper_available(self.ssh_manager)
+        if not self._remote_python:
+            return False
+            
+        try:
+            return DeltaUpload(self.ssh_manager).upload(
+                temp_path, remote_path, self._edit_signatures.get(temp_path)
+            )
+        except Exception as e:
+            print(f"Delta upload of {remote_path} failed, uploading the whole file: {e}")
+            return False
 
-    def upload_folder(self, local_folder_path: str, remote_folder_name: str = None):
-        """Upload entire folder recursively
+    def _remote_tar_available(self) -> bool:
+        """Check once per connection whether the server has tar"""
+        if self._remote_tar is None:
+            self._remote_tar = TarStreamUpload(self.ssh_manager).remote_tar_available()
+        return self._remote_tar
+        
+    def _upload_folder_tar(self, local_folder_path: str, remote_folder_path: str,
+                           remote_folder_name: str,
+                           entries: Optional[List[Tuple[str, str]]] = None,
+                           progress_callback: Callable[[int, int, int, int], bool] = None) -> bool:
+        """Upload a folder as a single tar stream
         
         Args:
             local_folder_path: Local folder path
-            remote_folder_name: Remote folder name (optional)
+            remote_folder_path: Absolute remote folder path
+            remote_folder_name: Remote folder name used in messages
+            entries: Only upload these (local path, relative path) entries (optional)
+            progress_callback: Called with (bytes, total bytes, entries,
+                total entries); returning False cancels (optional)
             
         Returns:
             bool: True if successful, False otherwise
         """
-        if remote_folder_name is None:
-            remote_folder_name = os.path.basename(local_folder_path)
+        try:
+            TarStreamUpload(self.ssh_manager).upload(
+                local_folder_path, remote_folder_path, progress_callback, entries=entries
+            )
+            return True
+        except TransferCancelled:
+            return False
+        except Exception as e:
+            print(f"Failed to upload folder {remote_folder_name}: {e}")
+            return False
             
-        remote_folder_path = posixpath.join(self.current_path, remote_folder_name)
-        sftp = self.ssh_manager.get_sftp()
+    def _upload_folder_sftp(self, entries: List[Tuple[str, str]], remote_folder_path: str,
+                            remote_folder_name: str,
+                            progress_callback: Callable[[int, int, int, int], bool] = None) -> bool:
+        """Upload folder entries one by one over SFTP
+        
+        Missing directories are created first with pipelined requests.
+        Uploaded files keep their local modification time.
         
-        # Count total files for progress tracking
-        total_files = 0
-        for root, dirs, files in os.walk(local_folder_path):
-            total_files += len(files)
+        Args:
+            entries: List of (local path, relative POSIX path)
+            remote_folder_path: Absolute remote folder path
+            remote_folder_name: Remote folder name used in messages
+            progress_callback: Called with (bytes, total bytes, entries,
+                total entries) after each file; returning False cancels
+                (optional)
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        directories = [
+            posixpath.join(remote_folder_path, relative_path) if relative_path else remote_folder_path
+            for local_path, relative_path in entries if os.path.isdir(local_path)
+        ]
+        files = [(local_path, relative_path) for local_path, relative_path in entries
+                 if not os.path.isdir(local_path)]
+        total_bytes = sum(os.path.getsize(local_path) for local_path, _ in files)
+        sent_bytes = 0
+        done_files = 0
+        
+        # Create every missing directory in a few pipelined batches
+        try:
+            failed = self.ssh_manager.safe_operation(
+                lambda sftp: SFTPPipeline(sftp).makedirs(directories)
+            )
+        except Exception as e:
+            failed = [e]
+        if failed:
+            print(f"Failed to create directories in {remote_folder_name}: {failed[0]}")
+            return False
+            
+        for local_path, relative_path in files:
+            remote_path = posixpath.join(remote_folder_path, relative_path)
             
-        if total_files == 0:
-            # Create empty directory if no files
+            def _upload_operation(sftp):
+                sftp.put(local_path, remote_path)
+                local_stat = os.stat(local_path)
+                sftp.utime(remote_path, (local_stat.st_atime, local_stat.st_mtime))
+                
             try:
-                self.create_directory(remote_folder_name)
-                self.file_uploaded.emit(remote_folder_name)
-                return True
+                self.ssh_manager.safe_operation(_upload_operation, transfer=True)
             except Exception as e:
-                print(f"Failed to create empty directory: {e}")
+                print(f"Failed to upload {relative_path}: {e}")
+                # Continue with other files
+            done_files += 1
+            sent_bytes += os.path.getsize(local_path)
+            if progress_callback and progress_callback(sent_bytes, total_bytes, done_files, len(files)) is False:
                 return False
+                
+        return True
         
-        # Create progress dialog
-        progress = QProgressDialog(
-            f"Uploading folder {remote_folder_name}...", 
-            "Cancel", 0, total_files, None
-        )
-        progress.setWindowModality(Qt.WindowModal)
-        progress.setMinimumDuration(0)
-        progress.setValue(0)
-        progress.show()
+    def upload_folder(self,local_folder_path: str, remote_folder_name: str = None,
+                      use_tar: bool = True, only_changed: bool = False,
+                      compare_hash: bool = False,
+                      progress_callback: Callable[[int, int, int, int], bool] = None):
+        """Upload entire folder recursively
         
-        uploaded_files = 0
-        cancelled = False
+        With ``only_changed``, files whose remote copy has the same size and
+        modification time are skipped, and ``last_upload_summary`` tells
+        how much was sent and skipped.
         
-        def _upload_recursive(local_dir, remote_dir):
-            nonlocal uploaded_files, cancelled
-            
-            if cancelled:
-                return False
+        Args:
+            local_folder_path: Local folder path
+            remote_folder_name: Remote folder name (optional)
+            use_tar: Stream the folder through tar when the server has it
+            only_changed: Skip files that are unchanged on the server
+            compare_hash: With only_changed, compare files of equal size by
+                checksum instead of modification time
+            progress_callback: Called with (bytes, total bytes, entries,
+                total entries); returning False cancels the upload (optional)
                 
-            # Create remote directory if it doesn't exist
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if remote_folder_name is None:
+            remote_folder_name = os.path.basename(os.path.normpath(local_folder_path))
+            
+        remote_folder_path = posixpath.join(self.current_path, remote_folder_name)
+        
+        entries = None
+        if only_changed:
+            scanner = ChangedFileScanner(self.ssh_manager, self.verifier, self.parallel_channels)
             try:
-                try:
-                    sftp.stat(remote_dir)
-                except IOError:
-                    # Directory doesn't exist, create it
-                    self.ssh_manager.safe_operation(sftp.mkdir, remote_dir)
+                entries, self.last_upload_summary = scanner.scan(
+                    local_folder_path, remote_folder_path, compare_hash
+                )
             except Exception as e:
-                print(f"Failed to create directory {remote_dir}: {e}")
+                print(f"Failed to compare folder {remote_folder_name}: {e}")
                 return False
+            if not entries:
+                return True
                 
-            # Upload files and subdirectories
-            for item in os.listdir(local_dir):
-                if progress.wasCanceled():
-                    cancelled = True
-                    return False
-                    
-                local_item_path = os.path.join(local_dir, item)
-                remote_item_path = posixpath.join(remote_dir, item)
-                
-                if os.path.isfile(local_item_path):
-                    # Upload file
-                    try:
-                        self.ssh_manager.safe_operation(sftp.put, local_item_path, remote_item_path)
-                        uploaded_files += 1
-                        progress.setValue(uploaded_files)
-                        progress.setLabelText(f"Uploading: {item} ({uploaded_files}/{total_files})")
-                        QApplication.processEvents()
-                    except Exception as e:
-                        print(f"Failed to upload {item}: {e}")
-                        # Continue with other files
-                elif os.path.isdir(local_item_path):
-                    # Recursively upload subdirectory
-                    if not _upload_recursive(local_item_path, remote_item_path):
-                        return False
-                        
-            return True
+        if use_tar and self._remote_tar_available():
+            result = self._upload_folder_tar(local_folder_path, remote_folder_path,
+                                             remote_folder_name, entries, progress_callback)
+        else:
+            if entries is None:
+                entries, _ = TarStreamUpload.scan(local_folder_path)
+            result = self._upload_folder_sftp(entries, remote_folder_path, remote_folder_name,
+                                              progress_callback)
             
-        # Start recursive upload
-        result = _upload_recursive(local_folder_path, remote_folder_path)
-        progress.close()
-        
+        self._remote_changed(remote_folder_path, recursive=True)
         if result:
             self.file_uploaded.emit(remote_folder_name)
             
@@ -0,0 +1,340 @@
+"""Recursive folder transfers over several SFTP channels"""
+import os
+import posixpath
+import stat
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.errors import TransferCancelled
+
+
+class ParallelFolderDownload:
+    """Downloads a remote folder tree with one SFTP channel per file in flight
+    
+    The tree is listed first to learn the total size, then files are
+    fetched by worker threads, each through ``SSHManager.safe_operation``
+    so a failed file is retried on its own. Files already present locally
+    with the same size and modification time are skipped, which makes a
+    repeated download continue where an interrupted one stopped. Symbolic
+    links are not followed.
+    """
+    
+    def __init__(self, ssh_manager, workers: int = 4):
+        """Initialize parallel folder download
+        
+        Args:
+            ssh_manager: SSH manager instance
+            workers: Number of files downloaded concurrently
+        """
+        self.ssh_manager = ssh_manager
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._transferred = 0
+        self._done_entries = 0
+        
+    def _walk(self, remote_folder: str, local_folder: str) -> List[Tuple[str, str, int, float]]:
+        """List the remote tree and create its local directories
+        
+        Returns:
+            List of (remote path, local path, size, mtime) for every file
+        """
+        files = []
+        pending = [(remote_folder, local_folder)]
+        while pending:
+            remote_dir, local_dir = pending.pop()
+            entries = self.ssh_manager.safe_operation(lambda sftp: sftp.listdir_attr(remote_dir))
+            os.makedirs(local_dir, exist_ok=True)
+            for entry in sorted(entries, key=lambda e: e.filename):
+                remote_path = posixpath.join(remote_dir, entry.filename)
+                local_path = os.path.join(local_dir, entry.filename)
+                mode = entry.st_mode or 0
+                if stat.S_ISDIR(mode):
+                    pending.append((remote_path, local_path))
+                elif stat.S_ISREG(mode):
+                    files.append((remote_path, local_path, entry.st_size or 0, entry.st_mtime or 0))
+                else:
+                    print(f"Skipping {remote_path}: not a regular file")
+        return files
+        
+    def _add_progress(self, count: int, entries: int = 0):
+        """Add to the shared progress counters"""
+        with self._lock:
+            self._transferred += count
+            self._done_entries += entries
+            
+    def download(self, remote_folder: str, local_folder: str,
+                 progress_callback: Optional[Callable[[int, int, int, int], bool]] = None):
+        """Download a remote folder into a local folder path
+        
+        Args:
+            remote_folder: Absolute remote folder path
+            local_folder: Local path the folder is created as
+            progress_callback: Called with (bytes, total bytes, entries,
+                total entries); returning False cancels the download
+                
+        Raises:
+            TransferCancelled: If the progress callback cancelled the download
+        """
+        files = self._walk(remote_folder, local_folder)
+        total_bytes = sum(size for _, _, size, _ in files)
+        self._transferred = 0
+        self._done_entries = 0
+        self._cancelled.clear()
+        pending = list(reversed(files))
+        errors: List[BaseException] = []
+        
+        def _get_file(sftp, remote_path, local_path, size, mtime):
+            copied = 0
+            
+            def _file_progress(transferred, _total):
+                nonlocal copied
+                if self._cancelled.is_set():
+                    raise TransferCancelled("Download cancelled")
+                self._add_progress(transferred - copied)
+                copied = transferred
+                
+            try:
+                sftp.get(remote_path, local_path, callback=_file_progress)
+            except BaseException:
+                # The file is retried from its start, so forget its progress
+                self._add_progress(-copied)
+                raise
+            self._add_progress(size - copied, 1)
+            os.utime(local_path, (mtime, mtime))
+            
+        def _worker():
+            while not self._cancelled.is_set():
+                with self._lock:
+                    if not pending:
+                        return
+                    remote_path, local_path, size, mtime = pending.pop()
+                try:
+                    local_stat = os.stat(local_path)
+                    if local_stat.st_size == size and int(local_stat.st_mtime) == int(mtime):
+                        self._add_progress(size, 1)
+                        continue
+                except OSError:
+                    pass
+                try:
+                    self.ssh_manager.safe_operation(
+                        _get_file, remote_path, local_path, size, mtime, transfer=True
+                    )
+                except TransferCancelled:
+                    return
+                except BaseException as e:
+                    errors.append(e)
+                    self._cancelled.set()
+                    return
+                    
+        workers = [
+            threading.Thread(target=_worker, daemon=True)
+            for _ in range(min(self.workers, len(pending)))
+        ]
+        for worker in workers:
+            worker.start()
+            
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(0.1)
+                if progress_callback and not self._cancelled.is_set():
+                    if progress_callback(self._transferred, total_bytes,
+                                         self._done_entries, len(files)) is False:
+                        self.cancel()
+                        
+        if errors:
+            raise errors[0]
+        if self._cancelled.is_set():
+            raise TransferCancelled("Download cancelled")
+        if progress_callback:
+            progress_callback(total_bytes, total_bytes, len(files), len(files))
+            
+    def cancel(self):
+        """Cancel the running download"""
+        self._cancelled.set()
+
+
+@dataclass
+class FolderUploadSummary:
+    """What an upload of a folder sent and what it skipped"""
+    uploaded_files: int = 0
+    uploaded_bytes: int = 0
+    skipped_files: int = 0
+    skipped_bytes: int = 0
+    hashed_files: int = 0
+    
+    def __str__(self) -> str:
+        """Human readable summary"""
+        text = (
+            f"Uploaded {self.uploaded_files} files ({self.uploaded_bytes / (1024 * 1024):.1f} MB), "
+            f"skipped {self.skipped_files} unchanged files ({self.skipped_bytes / (1024 * 1024):.1f} MB)"
+        )
+        if self.hashed_files:
+            text += f", compared {self.hashed_files} by checksum"
+        return text
+
+
+class ChangedFileScanner:
+    """Finds the entries of a local folder that differ from the remote copy
+    
+    Remote directories are listed level by level, several at a time, and
+    each listing gives the size and modification time of all its files in
+    one round trip. Files whose size and whole-second mtime match are
+    unchanged. With ``compare_hash``, files of equal size are compared by
+    digest instead, which also catches rebuilt files that kept their
+    content; their remote mtime is then updated so the next scan can skip
+    the checksum.
+    """
+    
+    def __init__(self, ssh_manager, verifier=None, workers: int = 4):
+        """Initialize changed file scanner
+        
+        Args:
+            ssh_manager: SSH manager instance
+            verifier: TransferVerifier used for checksum comparison (optional)
+            workers: Number of directories listed at once
+        """
+        self.ssh_manager = ssh_manager
+        self.verifier = verifier
+        self.workers = max(1, workers)
+        
+    def _list_directories(self, remote_dirs: List[str]) -> Dict[str, Optional[Dict]]:
+        """List remote directories in parallel
+        
+        Returns:
+            Dictionary of path to {name: SFTPAttributes}, or None for
+            directories that do not exist
+        """
+        listings: Dict[str, Optional[Dict]] = {}
+        pending = list(remote_dirs)
+        errors: List[BaseException] = []
+        lock = threading.Lock()
+        
+        def _worker():
+            while not errors:
+                with lock:
+                    if not pending:
+                        return
+                    remote_dir = pending.pop()
+                try:
+                    with self.ssh_manager.sftp_channel() as sftp:
+                        listing = {attr.filename: attr for attr in sftp.listdir_attr(remote_dir)}
+                except FileNotFoundError:
+                    listing = None
+                except BaseException as e:
+                    errors.append(e)
+                    return
+                listings[remote_dir] = listing
+                
+        workers = [
+            threading.Thread(target=_worker, daemon=True)
+            for _ in range(min(self.workers, len(pending)))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        if errors:
+            raise errors[0]
+        return listings
+        
+    def scan(self, local_folder: str, remote_folder: str,
+             compare_hash: bool = False) -> Tuple[List[Tuple[str, str]], FolderUploadSummary]:
+        """Compare a local folder with a remote folder
+        
+        Args:
+            local_folder: Local folder path
+            remote_folder: Absolute remote folder path
+            compare_hash: Compare files of equal size by checksum
+            
+        Returns:
+            Tuple of ([(local path, relative POSIX path)] to upload, in
+            walk order with directories first, planned summary)
+        """
+        summary = FolderUploadSummary()
+        entries: List[Tuple[str, str]] = []
+        same_size: List[Tuple[str, str, os.stat_result, object]] = []
+        
+        # Walk both trees level by level; a missing remote directory makes
+        # its whole local subtree new without listing it
+        level = [("", True)]  # (relative directory, exists remotely)
+        while level:
+            remote_dirs = [
+                posixpath.join(remote_folder, relative) if relative else remote_folder
+                for relative, exists in level if exists
+            ]
+            listings = self._list_directories(remote_dirs)
+            next_level = []
+            for relative, exists in level:
+                remote_dir = posixpath.join(remote_folder, relative) if relative else remote_folder
+                listing = listings.get(remote_dir) if exists else None
+                local_dir = os.path.join(local_folder, *relative.split('/')) if relative else local_folder
+                if listing is None:
+                    entries.append((local_dir, relative))
+                try:
+                    names = sorted(os.listdir(local_dir))
+                except OSError as e:
+                    print(f"Failed to read {local_dir}: {e}")
+                    continue
+                for name in names:
+                    local_path = os.path.join(local_dir, name)
+                    relative_path = posixpath.join(relative, name) if relative else name
+                    try:
+                        local_stat = os.stat(local_path)
+                    except OSError:
+                        continue
+                    remote_attr = listing.get(name) if listing is not None else None
+                    if stat.S_ISDIR(local_stat.st_mode):
+                        remote_is_dir = remote_attr is not None and stat.S_ISDIR(remote_attr.st_mode or 0)
+                        next_level.append((relative_path, remote_is_dir))
+                        continue
+                    if not stat.S_ISREG(local_stat.st_mode):
+                        continue
+                    if remote_attr is not None and remote_attr.st_size == local_stat.st_size:
+                        if compare_hash and self.verifier is not None:
+                            same_size.append((local_path, relative_path, local_stat, remote_attr))
+                            continue
+                        if int(remote_attr.st_mtime or 0) == int(local_stat.st_mtime):
+                            summary.skipped_files += 1
+                            summary.skipped_bytes += local_stat.st_size
+                            continue
+                    entries.append((local_path, relative_path))
+                    summary.uploaded_files += 1
+                    summary.uploaded_bytes += local_stat.st_size
+            level = next_level
+            
+        if same_size:
+            self._compare_digests(remote_folder, same_size, entries, summary)
+        return entries, summary
+        
+    def _compare_digests(self, remote_folder: str, candidates, entries, summary: FolderUploadSummary):
+        """Sort files of equal size into changed and unchanged by checksum"""
+        remote_paths = [posixpath.join(remote_folder, relative) for _, relative, _, _ in candidates]
+        digests = self.verifier.remote_digests([
+            (remote_path, attr.st_size, attr.st_mtime)
+            for remote_path, (_, _, _, attr) in zip(remote_paths, candidates)
+        ])
+        retime = []
+        for remote_path, (local_path, relative_path, local_stat, attr) in zip(remote_paths, candidates):
+            digest = digests.get(remote_path)
+            if digest is not None:
+                summary.hashed_files += 1
+                algorithm, remote_hex = digest
+                if self.verifier.local_digest(local_path, algorithm) == remote_hex:
+                    summary.skipped_files += 1
+                    summary.skipped_bytes += local_stat.st_size
+                    if int(attr.st_mtime or 0) != int(local_stat.st_mtime):
+                        retime.append((remote_path, local_stat))
+                    continue
+            entries.append((local_path, relative_path))
+            summary.uploaded_files += 1
+            summary.uploaded_bytes += local_stat.st_size
+            
+        if retime:
+            with self.ssh_manager.sftp_channel() as sftp:
+                for remote_path, local_stat in retime:
+                    try:
+                        sftp.utime(remote_path, (local_stat.st_atime, local_stat.st_mtime))
+                    except IOError as e:
+                        print(f"Failed to set modification time of {remote_path}: {e}")
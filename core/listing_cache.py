@@ -0,0 +1,158 @@
+"""Cache of remote directory listings"""
+import dataclasses
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+
+class ListingCache:
+    """Keeps recent directory listings by absolute path
+    
+    Listings expire after ``ttl`` seconds. Once the cached listings hold
+    more than ``max_files`` entries in total, the least recently used
+    listings are evicted. File operations patch or invalidate the affected
+    listings so the cache does not show stale results after a change made
+    through this connection.
+    """
+    
+    def __init__(self, ttl: float = 30.0, max_files: int = 200000):
+        """Initialize listing cache
+        
+        Args:
+            ttl: Seconds a listing stays valid
+            max_files: Maximum number of cached entries over all listings
+        """
+        self.ttl = ttl
+        self.max_files = max_files
+        self._listings: "OrderedDict[str, tuple]" = OrderedDict()  # path -> (time, files)
+        self._file_count = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        
+    def generation(self) -> int:
+        """Current invalidation counter
+        
+        Take it before starting a listing and pass it to put(), so a
+        listing that raced with a change is not stored.
+        
+        Returns:
+            Counter value
+        """
+        with self._lock:
+            return self._generation
+            
+    def get(self, path: str) -> Optional[List]:
+        """Get a cached listing
+        
+        Args:
+            path: Absolute directory path
+            
+        Returns:
+            Copy of the cached file list, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._listings.get(path)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                self._drop(path)
+                return None
+            self._listings.move_to_end(path)
+            return list(entry[1])
+            
+    def contains(self, path: str) -> bool:
+        """Check for a valid listing without marking it as recently used
+        
+        Args:
+            path: Absolute directory path
+            
+        Returns:
+            True if the listing is cached and not expired
+        """
+        with self._lock:
+            entry = self._listings.get(path)
+            return entry is not None and time.monotonic() - entry[0] <= self.ttl
+            
+    def put(self, path: str, files: List, generation: Optional[int] = None):
+        """Store a listing
+        
+        Args:
+            path: Absolute directory path
+            files: List of RemoteFileInfo objects
+            generation: Value of generation() when the listing started (optional)
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._drop(path)
+            if len(files) > self.max_files:
+                return
+            self._listings[path] = (time.monotonic(), list(files))
+            self._file_count += len(files)
+            while self._file_count > self.max_files:
+                self._drop(next(iter(self._listings)))
+                
+    def _drop(self, path: str):
+        """Remove a listing (caller holds the lock)"""
+        entry = self._listings.pop(path, None)
+        if entry is not None:
+            self._file_count -= len(entry[1])
+            
+    def invalidate(self, path: str, recursive: bool = False):
+        """Forget the listing of a directory
+        
+        Args:
+            path: Absolute directory path
+            recursive: Also forget the listings of all subdirectories
+        """
+        path = posixpath.normpath(path)
+        prefix = path.rstrip('/') + '/'
+        with self._lock:
+            self._generation += 1
+            self._drop(path)
+            if recursive:
+                for cached_path in [p for p in self._listings if p.startswith(prefix)]:
+                    self._drop(cached_path)
+                    
+    def remove_entry(self, directory: str, filename: str):
+        """Drop one file from a cached listing
+        
+        Args:
+            directory: Absolute directory path
+            filename: Name of the removed file
+        """
+        self._patch(directory, lambda files: [f for f in files if f.filename != filename])
+        
+    def rename_entry(self, directory: str, old_name: str, new_name: str):
+        """Rename one file in a cached listing
+        
+        Args:
+            directory: Absolute directory path
+            old_name: Previous file name
+            new_name: New file name
+        """
+        self._patch(directory, lambda files: [
+            dataclasses.replace(f, filename=new_name) if f.filename == old_name else f
+            for f in files if f.filename != new_name
+        ])
+        
+    def _patch(self, directory: str, change):
+        """Apply a change to a cached listing, keeping its age"""
+        directory = posixpath.normpath(directory)
+        with self._lock:
+            self._generation += 1
+            entry = self._listings.get(directory)
+            if entry is None:
+                return
+            files = change(entry[1])
+            self._file_count += len(files) - len(entry[1])
+            self._listings[directory] = (entry[0], files)
+            
+    def clear(self):
+        """Forget all listings"""
+        with self._lock:
+            self._generation += 1
+            self._listings.clear()
+            self._file_count = 0
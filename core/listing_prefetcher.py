@@ -0,0 +1,159 @@
+"""Background prefetch of directory listings"""
+import heapq
+import itertools
+import posixpath
+import threading
+from typing import List, Optional, Tuple
+
+
+class ListingPrefetcher:
+    """Lists directories the user is likely to open next into the listing cache
+    
+    Candidates are ranked: directories under the mouse or selection first,
+    then the parent and recently visited directories, then the
+    subdirectories of the directory just listed. Prefetching only uses SFTP
+    channels that are already open and idle, and leaves ``reserve``
+    channels free, so it never delays foreground operations or transfers.
+    """
+    
+    HINT, HISTORY, CHILD = range(3)  # priorities, lowest first
+    IDLE_TIMEOUT = 5.0  # seconds before an idle worker exits
+    RETRY_DELAY = 0.2  # seconds to wait for an idle channel
+    
+    def __init__(self, file_manager, workers: int = 1, max_depth: int = 1,
+                 max_per_directory: int = 32, reserve: int = 1):
+        """Initialize listing prefetcher
+        
+        Args:
+            file_manager: File manager whose listing cache is filled
+            workers: Number of listings fetched at once
+            max_depth: Levels of subdirectories below a listed directory
+            max_per_directory: Subdirectories queued per listed directory
+            reserve: Pool channels always left free for foreground work
+        """
+        self.file_manager = file_manager
+        self.workers = workers
+        self.max_depth = max_depth
+        self.max_per_directory = max_per_directory
+        self.reserve = reserve
+        self._queue: List[Tuple[int, int, str, int]] = []  # (priority, order, path, depth)
+        self._queued = set()
+        self._order = itertools.count()
+        self._running = 0
+        self._condition = threading.Condition()
+        
+    def directory_loaded(self, path: str, files):
+        """Queue prefetches after a directory listing has loaded
+        
+        Pending candidates of the previously shown directory are dropped.
+        
+        Args:
+            path: Absolute path of the listed directory
+            files: List of RemoteFileInfo objects of the directory
+        """
+        with self._condition:
+            self._queue = []
+            self._queued = set()
+            
+            # History entries are not expanded into their subdirectories
+            parent = posixpath.dirname(path)
+            if parent != path:
+                self._push(parent, self.HISTORY, self.max_depth)
+            for visited in reversed(self.file_manager.path_history[-5:]):
+                self._push(visited, self.HISTORY, self.max_depth)
+            self._push_children(path, files, 1)
+            self._start_workers()
+            
+    def hint(self, path: str):
+        """Prefetch a directory the user is pointing at before other candidates
+        
+        Args:
+            path: Absolute directory path
+        """
+        with self._condition:
+            self._push(path, self.HINT, 1)
+            self._start_workers()
+            
+    def _push_children(self, path: str, files, depth: int):
+        """Queue subdirectories of a listing (caller holds the lock)"""
+        if depth > self.max_depth:
+            return
+        directories = sorted(f.filename for f in files if f.is_directory)
+        for name in directories[:self.max_per_directory]:
+            self._push(posixpath.join(path, name), self.CHILD, depth)
+            
+    def _push(self, path: str, priority: int, depth: int):
+        """Queue a candidate unless it is queued or cached (caller holds the lock)"""
+        if not path.startswith('/') or path in self._queued:
+            return
+        if self.file_manager.listing_cache.contains(path):
+            return
+        self._queued.add(path)
+        heapq.heappush(self._queue, (priority, next(self._order), path, depth))
+        self._condition.notify()
+        
+    def _start_workers(self):
+        """Start workers up to the budget (caller holds the lock)"""
+        missing = min(self.workers, len(self._queue)) - self._running
+        for _ in range(max(0, missing)):
+            self._running += 1
+            threading.Thread(target=self._work, daemon=True).start()
+            
+    def _next(self) -> Optional[Tuple[int, str, int]]:
+        """Take the best candidate, or None when idle for too long"""
+        with self._condition:
+            while not self._queue:
+                if not self._condition.wait(self.IDLE_TIMEOUT) and not self._queue:
+                    self._running -= 1
+                    return None
+            priority, _, path, depth = heapq.heappop(self._queue)
+            self._queued.discard(path)
+            return priority, path, depth
+            
+    def _acquire_idle_channel(self):
+        """Check out an idle pool channel if enough channels stay free"""
+        pool = self.file_manager.ssh_manager.sftp_pool
+        if pool is None or pool.in_use + self.reserve >= pool.size:
+            return pool, None
+        return pool, pool.try_acquire()
+        
+    def _work(self):
+        """Worker loop listing queued directories"""
+        while True:
+            candidate = self._next()
+            if candidate is None:
+                return
+            priority, path, depth = candidate
+            if self.file_manager.listing_cache.contains(path):
+                continue
+                
+            pool, sftp = self._acquire_idle_channel()
+            if pool is None:
+                # Disconnected; drop everything
+                with self._condition:
+                    self._queue = []
+                    self._queued = set()
+                continue
+            if sftp is None:
+                # Channels are busy with foreground work; try again shortly
+                with self._condition:
+                    self._push(path, priority, depth)
+                    self._condition.wait(self.RETRY_DELAY)
+                continue
+                
+            cache = self.file_manager.listing_cache
+            generation = cache.generation()
+            broken = False
+            try:
+                files = [self.file_manager._to_file_info(a) for a in sftp.listdir_attr(path)]
+            except IOError:
+                continue  # not readable or gone; nothing to cache
+            except Exception:
+                broken = True
+                continue
+            finally:
+                pool.release(sftp, discard=broken)
+                
+            cache.put(path, files, generation)
+            with self._condition:
+                self._push_children(path, files, depth + 1)
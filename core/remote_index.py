@@ -0,0 +1,370 @@
+"""Persistent index of remote tree metadata for offline search"""
+import hashlib
+import posixpath
+import sqlite3
+import stat
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+
+@dataclass
+class IndexedFile:
+    """A remote file or directory known to the index"""
+    path: str
+    size: int
+    mtime: int
+    mode: int
+    
+    @property
+    def is_directory(self) -> bool:
+        """Whether the entry is a directory"""
+        return stat.S_ISDIR(self.mode)
+
+
+class RemoteIndex:
+    """SQLite database of the paths, sizes, mtimes and modes of one host
+    
+    Names are indexed with an FTS5 trigram table when SQLite has one, so
+    substring and glob searches over millions of entries use the index
+    instead of scanning every row. Each thread gets its own connection;
+    the database runs in WAL mode so searches never wait for the crawler.
+    """
+    
+    DIRECTORY_NAME = "index"
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            parent TEXT NOT NULL,
+            name TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime INTEGER NOT NULL,
+            mode INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS entries_parent ON entries(parent);
+        CREATE TABLE IF NOT EXISTS directories (
+            path TEXT PRIMARY KEY,
+            mtime INTEGER NOT NULL,
+            listed REAL NOT NULL
+        );
+    """
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(
+            name, content='entries', content_rowid='id', tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+            INSERT INTO names(rowid, name) VALUES (new.id, new.name);
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+            INSERT INTO names(names, rowid, name) VALUES ('delete', old.id, old.name);
+        END;
+    """
+    
+    def __init__(self, db_path: str):
+        """Initialize remote index
+        
+        Args:
+            db_path: SQLite database file path
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        connection = self._connection()
+        connection.executescript(self.SCHEMA)
+        try:
+            connection.executescript(self.FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite without FTS5 or the trigram tokenizer (before 3.34)
+            self.has_fts = False
+            
+    @classmethod
+    def for_host(cls, host_id: str, index_dir: str = None) -> "RemoteIndex":
+        """Open the index of a host
+        
+        Args:
+            host_id: Connection identifier (user@host:port)
+            index_dir: Directory holding indexes (optional, defaults to the
+                config directory)
+                
+        Returns:
+            Remote index of the host
+        """
+        if index_dir is None:
+            from utils.config import ConfigManager
+            index_dir = ConfigManager().config_dir / cls.DIRECTORY_NAME
+        digest = hashlib.sha1(host_id.encode('utf-8')).hexdigest()
+        return cls(Path(index_dir) / f"{digest}.sqlite")
+        
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the calling thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+        
+    def close(self):
+        """Close the connection of the calling thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+            
+    def count(self) -> int:
+        """Number of indexed entries"""
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        
+    def directory_state(self, path: str) -> Optional[Tuple[int, float]]:
+        """Get the mtime a directory had when it was listed
+        
+        Args:
+            path: Absolute remote directory path
+            
+        Returns:
+            Tuple of (directory mtime, time listed), or None if never listed
+        """
+        return self._connection().execute(
+            "SELECT mtime, listed FROM directories WHERE path = ?", (path,)
+        ).fetchone()
+        
+    def child_directories(self, path: str) -> List[str]:
+        """Paths of the indexed subdirectories of a directory
+        
+        Args:
+            path: Absolute remote directory path
+        """
+        rows = self._connection().execute(
+            "SELECT path, mode FROM entries WHERE parent = ?", (path,)
+        ).fetchall()
+        return [child for child, mode in rows if stat.S_ISDIR(mode)]
+        
+    def replace_directory(self, path: str, mtime: int, entries) -> List[str]:
+        """Store a fresh listing of a directory
+        
+        Args:
+            path: Absolute remote directory path
+            mtime: Modification time of the directory
+            entries: SFTP attributes of the directory's entries
+            
+        Returns:
+            Paths of subdirectories that disappeared; their subtrees are
+            removed from the index too
+        """
+        connection = self._connection()
+        with connection:
+            old_directories = set(self.child_directories(path))
+            connection.execute("DELETE FROM entries WHERE parent = ?", (path,))
+            rows = [
+                (posixpath.join(path, attr.filename), path, attr.filename,
+                 attr.st_size or 0, int(attr.st_mtime or 0), attr.st_mode or 0)
+                for attr in entries
+            ]
+            connection.executemany(
+                "INSERT INTO entries (path, parent, name, size, mtime, mode) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO directories (path, mtime, listed) VALUES (?, ?, ?)",
+                (path, int(mtime), time.time())
+            )
+            gone = old_directories - {row[0] for row in rows if stat.S_ISDIR(row[5])}
+            for directory in gone:
+                self._remove_subtree(connection, directory)
+        return sorted(gone)
+        
+    @staticmethod
+    def _remove_subtree(connection: sqlite3.Connection, path: str):
+        """Delete everything below a directory (caller commits)"""
+        prefix = path.rstrip('/') + '/'
+        # "0" sorts right after "/", so this range is exactly the prefix
+        upper = prefix[:-1] + '0'
+        connection.execute("DELETE FROM entries WHERE path >= ? AND path < ?", (prefix, upper))
+        connection.execute(
+            "DELETE FROM directories WHERE path = ? OR (path >= ? AND path < ?)",
+            (path, prefix, upper)
+        )
+        
+    def remove_tree(self, path: str):
+        """Forget a directory that no longer exists or cannot be read
+        
+        Args:
+            path: Absolute remote directory path
+        """
+        connection = self._connection()
+        with connection:
+            self._remove_subtree(connection, path)
+            
+    def search(self, pattern: str, limit: int = 1000, directory: str = None) -> List[IndexedFile]:
+        """Find entries by name without contacting the server
+        
+        A pattern with ``*``, ``?`` or ``[`` is a case-sensitive glob over
+        the whole name; anything else matches a case-insensitive substring.
+        
+        Args:
+            pattern: Substring or glob pattern
+            limit: Maximum number of results
+            directory: Only search below this directory (optional)
+            
+        Returns:
+            Matching entries
+        """
+        pattern = pattern.strip()
+        if not pattern:
+            return []
+        query, params = self._search_query(pattern, limit, directory)
+        return [IndexedFile(*row) for row in self._connection().execute(query, params)]
+        
+    def _search_query(self, pattern: str, limit: int, directory: Optional[str]) -> Tuple[str, list]:
+        """Build the SQL and parameters of a search"""
+        if any(char in pattern for char in "*?["):
+            condition, params = "GLOB ?", [pattern]
+        elif self.has_fts:
+            # FTS5 cannot use its index for LIKE with an ESCAPE clause, so a
+            # literal % or _ is matched as a wildcard by the index and
+            # checked exactly on the rows it returns
+            condition, params = "LIKE ?", [f"%{pattern}%"]
+            if '%' in pattern or '_' in pattern:
+                condition += " AND instr(lower(e.name), ?) > 0"
+                params.append(pattern.lower())
+        else:
+            escaped = pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            condition, params = "LIKE ? ESCAPE '\\'", [f"%{escaped}%"]
+            
+        if self.has_fts:
+            query = (
+                "SELECT e.path, e.size, e.mtime, e.mode FROM names "
+                f"JOIN entries e ON e.id = names.rowid WHERE names.name {condition}"
+            )
+        else:
+            query = f"SELECT path, size, mtime, mode FROM entries e WHERE e.name {condition}"
+        if directory:
+            prefix = directory.rstrip('/') + '/'
+            query += " AND e.path >= ? AND e.path < ?"
+            params += [prefix, prefix[:-1] + '0']
+        query += " LIMIT ?"
+        params.append(limit)
+        return query, params
+
+
+class IndexCrawler:
+    """Keeps a RemoteIndex up to date from a background thread
+    
+    The crawler walks the tree breadth first over its own SFTP channel, so
+    it never competes with the channel pool used by the browser and
+    transfers. A directory whose mtime still matches the index is not
+    listed again; only its subdirectories are checked. Because editing a
+    file in place does not change its directory's mtime, directories are
+    listed again anyway once their listing is older than ``max_age``.
+    """
+    
+    PROGRESS_INTERVAL = 64  # directories visited between progress reports
+    
+    def __init__(self, ssh_manager, index: RemoteIndex, root: str = ".",
+                 max_age: float = 24 * 3600,
+                 progress_callback: Optional[Callable[[int, int], None]] = None):
+        """Initialize index crawler
+        
+        Args:
+            ssh_manager: SSH manager instance
+            index: Index to fill
+            root: Remote directory the crawl starts at
+            max_age: Seconds after which unchanged directories are listed again
+            progress_callback: Called from the crawler thread with
+                (directories visited, directories listed) (optional)
+        """
+        self.ssh_manager = ssh_manager
+        self.index = index
+        self.root = root
+        self.max_age = max_age
+        self.progress_callback = progress_callback
+        self.visited = 0
+        self.listed = 0
+        self.error = ""
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        
+    @property
+    def running(self) -> bool:
+        """Whether a crawl is in progress"""
+        return self._thread is not None and self._thread.is_alive()
+        
+    def start(self):
+        """Start a crawl unless one is running"""
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        
+    def stop(self, wait: bool = False):
+        """Stop the crawl after the current directory
+        
+        Args:
+            wait: Block until the crawler thread has exited
+        """
+        self._stopped.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+            
+    def _run(self):
+        """Crawler thread"""
+        self.visited = 0
+        self.listed = 0
+        self.error = ""
+        try:
+            sftp = self.ssh_manager.open_sftp_channel()
+        except Exception as e:
+            self.error = str(e)
+            return
+        try:
+            self._crawl(sftp)
+        except Exception as e:
+            if not self._stopped.is_set():
+                self.error = str(e)
+                print(f"Remote index crawl stopped: {e}")
+        finally:
+            sftp.close()
+            self.index.close()
+            
+    def _crawl(self, sftp):
+        """Walk the tree and refresh stale directories"""
+        root = sftp.normalize(self.root)
+        pending = deque([(root, None)])  # (path, mtime if known from the parent listing)
+        while pending and not self._stopped.is_set():
+            path, mtime = pending.popleft()
+            self.visited += 1
+            if mtime is None:
+                try:
+                    mtime = sftp.stat(path).st_mtime or 0
+                except IOError:
+                    self.index.remove_tree(path)
+                    continue
+                    
+            state = self.index.directory_state(path)
+            if state is not None and state[0] == int(mtime) and time.time() - state[1] < self.max_age:
+                # Same entries as before; subdirectories may still have changed
+                pending.extend((child, None) for child in self.index.child_directories(path))
+            else:
+                try:
+                    entries = sftp.listdir_attr(path)
+                except IOError:
+                    self.index.remove_tree(path)
+                    continue
+                self.index.replace_directory(path, mtime, entries)
+                self.listed += 1
+                pending.extend(
+                    (posixpath.join(path, attr.filename), attr.st_mtime or 0)
+                    for attr in entries if stat.S_ISDIR(attr.st_mode or 0)
+                )
+                
+            if self.progress_callback and self.visited % self.PROGRESS_INTERVAL == 0:
+                self.progress_callback(self.visited, self.listed)
+        if self.progress_callback:
+            self.progress_callback(self.visited, self.listed)
@@ -0,0 +1,140 @@
+"""Server-side file name and content search with streamed results"""
+import shlex
+import threading
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass
+class SearchResult:
+    """A file found by name, or a matching line found by content"""
+    path: str
+    line_number: int = 0  # 0 for name matches
+    text: str = ""
+    is_directory: bool = False
+
+
+class RemoteSearch:
+    """Runs ``find`` or ``grep -rn`` on the server and parses its output
+    
+    Results are yielded as the server prints them, so searching a huge
+    tree shows the first matches at once and holds no more than one
+    buffer of output in memory. Errors for unreadable directories are
+    discarded.
+    """
+    
+    def __init__(self, ssh_manager):
+        """Initialize remote search
+        
+        Args:
+            ssh_manager: SSH manager instance
+        """
+        self.ssh_manager = ssh_manager
+        self._cancelled = threading.Event()
+        
+    @staticmethod
+    def _name_pattern(name: str) -> str:
+        """Turn a plain name fragment into a glob matching it anywhere"""
+        if any(char in name for char in "*?["):
+            return name
+        return f"*{name}*"
+        
+    @classmethod
+    def find_command(cls, directory: str, name: str) -> str:
+        """Build the command listing files whose name matches
+        
+        Directories are printed with a trailing slash, which no file name
+        can end with.
+        
+        Args:
+            directory: Remote directory to search
+            name: Name fragment, or glob pattern (case-insensitive)
+            
+        Returns:
+            Shell command
+        """
+        return (
+            f"find {shlex.quote(directory)} -iname {shlex.quote(cls._name_pattern(name))} "
+            f"\\( -type d -exec printf '%s/\\n' {{}} \\; -o -print \\) 2>/dev/null"
+        )
+        
+    @classmethod
+    def grep_command(cls, directory: str, text: str, name: str = "",
+                     regex: bool = False, ignore_case: bool = False) -> str:
+        """Build the command printing lines that contain a text
+        
+        Binary files are skipped. File names are terminated by a NUL
+        byte so names containing colons parse unambiguously.
+        
+        Args:
+            directory: Remote directory to search
+            text: Text or regular expression to look for
+            name: Only search files whose name matches this glob (optional)
+            regex: Treat the text as an extended regular expression
+            ignore_case: Match case-insensitively
+            
+        Returns:
+            Shell command
+        """
+        options = "-rnI --null " + ("-E " if regex else "-F ") + ("-i " if ignore_case else "")
+        if name:
+            options += f"--include={shlex.quote(cls._name_pattern(name))} "
+        return f"grep {options}-e {shlex.quote(text)} -- {shlex.quote(directory)} 2>/dev/null"
+        
+    @staticmethod
+    def parse_grep_line(line: str) -> Optional[SearchResult]:
+        """Parse one line of ``grep -n --null`` output
+        
+        Returns:
+            Search result, or None if the line has another format
+        """
+        path, separator, rest = line.partition("\0")
+        if not separator:
+            return None
+        line_number, _, text = rest.partition(":")
+        try:
+            return SearchResult(path, int(line_number), text)
+        except ValueError:
+            return None
+            
+    def search(self, directory: str, text: str = "", name: str = "",
+               regex: bool = False, ignore_case: bool = False) -> Iterator[SearchResult]:
+        """Search a remote tree and yield results as they arrive
+        
+        With text, lines containing it are found; otherwise files whose
+        name matches ``name``.
+        
+        Args:
+            directory: Remote directory to search
+            text: Text to look for inside files (optional)
+            name: File name fragment or glob (optional)
+            regex: Treat the text as an extended regular expression
+            ignore_case: Match the text case-insensitively
+            
+        Yields:
+            Search results
+        """
+        self._cancelled.clear()
+        if text:
+            command = self.grep_command(directory, text, name, regex, ignore_case)
+        else:
+            command = self.find_command(directory, name or "*")
+            
+        lines = self.ssh_manager.stream_command(command, self._cancelled)
+        try:
+            for line in lines:
+                if not text:
+                    if line.endswith("/") and len(line) > 1:
+                        yield SearchResult(line[:-1], is_directory=True)
+                    else:
+                        yield SearchResult(line)
+                    continue
+                result = self.parse_grep_line(line)
+                if result is not None:
+                    yield result
+        finally:
+            lines.close()
+            
+    def cancel(self):
+        """Stop the running search; safe to call from any thread"""
+        self._cancelled.set()
@@ -0,0 +1,261 @@
+"""Transfers that continue from the last good offset after a failure"""
+import hashlib
+import os
+from typing import Callable, Optional
+
+from core.chunked_transfer import ChunkedTransfer
+from core.errors import TransferCancelled
+from core.transfer_state import TransferStateStore
+from core.transfer_verifier import StreamingDigest
+
+
+class ResumableTransfer:
+    """Uploads and downloads files so that retries do not start from zero
+    
+    A sequential transfer stats the partial destination and appends from its
+    size, optionally checking that the overlapping tail matches the source
+    by hash. Large files use ``ChunkedTransfer`` and skip the byte ranges
+    already recorded as complete. Progress is kept in a
+    ``TransferStateStore`` so a resume also works after a restart.
+    """
+    
+    BLOCK_SIZE = 1024 * 1024
+    VERIFY_SIZE = 64 * 1024
+    
+    def __init__(self, ssh_manager, state_store: TransferStateStore,
+                 channels: int = 4, chunked_threshold: Optional[int] = None):
+        """Initialize resumable transfer
+        
+        Args:
+            ssh_manager: SSH manager instance
+            state_store: Store for persisted transfer progress
+            channels: Number of channels used for chunked transfers
+            chunked_threshold: Minimum size for chunked transfers (None disables them)
+        """
+        self.ssh_manager = ssh_manager
+        self.state_store = state_store
+        self.channels = channels
+        self.chunked_threshold = chunked_threshold
+        
+    def _host_id(self) -> str:
+        """Identify the connection in state keys"""
+        return f"{self.ssh_manager.username}@{self.ssh_manager.host}:{self.ssh_manager.port}"
+        
+    def _use_chunked(self, size: int) -> bool:
+        """Check whether a transfer of this size should be chunked"""
+        return (self.chunked_threshold is not None and self.channels > 1
+                and size >= self.chunked_threshold)
+                
+    def has_state(self, direction: str, remote_path: str, local_path: str) -> bool:
+        """Check whether an interrupted transfer left progress to resume
+        
+        Args:
+            direction: "upload" or "download"
+            remote_path: Remote file path
+            local_path: Local file path
+        """
+        key = TransferStateStore.make_key(direction, self._host_id(), remote_path, local_path)
+        return self.state_store.get(key) is not None
+        
+    def _begin(self, direction: str, remote_path: str, local_path: str,
+               size: int, mtime: float) -> str:
+        """Load or create the state entry of a transfer
+        
+        Returns:
+            State key
+        """
+        key = TransferStateStore.make_key(direction, self._host_id(), remote_path, local_path)
+        state = self.state_store.get(key)
+        if state is not None and (state.get("size") != size or state.get("mtime") != mtime):
+            # The source changed since the interrupted attempt
+            self.state_store.remove(key)
+            state = None
+            
+        if state is None:
+            self.state_store.update(
+                key, force=True, direction=direction, host=self._host_id(),
+                remote_path=remote_path, local_path=local_path,
+                size=size, mtime=mtime, started=False, ranges=[]
+            )
+        return key
+        
+    def _resume_offset(self, key: str, partial_size: int, size: int) -> int:
+        """Offset to continue a sequential transfer from"""
+        state = self.state_store.get(key) or {}
+        if not state.get("started") or partial_size > size:
+            return 0
+        return partial_size
+        
+    def _tails_match(self, remote_file, local_file, offset: int) -> bool:
+        """Compare the bytes just before offset on both sides by hash"""
+        length = min(self.VERIFY_SIZE, offset)
+        remote_file.seek(offset - length)
+        local_file.seek(offset - length)
+        remote_digest = hashlib.sha256(remote_file.read(length)).digest()
+        local_digest = hashlib.sha256(local_file.read(length)).digest()
+        return remote_digest == local_digest
+        
+    def _run(self, key: str, operation: Callable[[], None]):
+        """Run a transfer, keeping its state on failure and dropping it on success"""
+        try:
+            operation()
+        except BaseException:
+            self.state_store.flush()
+            raise
+        self.state_store.remove(key)
+        
+    def upload(self, local_path: str, remote_path: str,
+               progress_callback: Optional[Callable[[int, int], bool]] = None,
+               verify: bool = True, digest: Optional[StreamingDigest] = None):
+        """Upload a file, continuing a previous partial upload if possible
+        
+        Args:
+            local_path: Local file path
+            remote_path: Remote file path
+            progress_callback: Called with (transferred, total); returning
+                False cancels the transfer
+            verify: Hash the overlapping tail before appending
+            digest: Fed with the data sent (optional)
+            
+        Raises:
+            TransferCancelled: If the progress callback cancelled the transfer
+        """
+        local_stat = os.stat(local_path)
+        size = local_stat.st_size
+        key = self._begin("upload", remote_path, local_path, size, local_stat.st_mtime)
+        
+        if self._use_chunked(size):
+            self._run(key, lambda: self._chunked_upload(
+                key, local_path, remote_path, size, progress_callback, digest
+            ))
+            return
+            
+        def _upload_operation(sftp):
+            try:
+                partial_size = sftp.stat(remote_path).st_size
+            except IOError:
+                partial_size = 0
+            offset = self._resume_offset(key, partial_size, size)
+            
+            with open(local_path, 'rb') as local_file:
+                if offset:
+                    with sftp.open(remote_path, 'r') as remote_file:
+                        if verify and not self._tails_match(remote_file, local_file, offset):
+                            offset = 0
+                            
+                with sftp.open(remote_path, 'r+' if offset else 'w') as remote_file:
+                    self.state_store.update(key, force=True, started=True)
+                    remote_file.set_pipelined(True)
+                    remote_file.seek(offset)
+                    local_file.seek(offset)
+                    while True:
+                        data = local_file.read(self.BLOCK_SIZE)
+                        if not data:
+                            break
+                        remote_file.write(data)
+                        if digest:
+                            digest.update(offset, data)
+                        offset += len(data)
+                        if progress_callback and progress_callback(offset, size) is False:
+                            raise TransferCancelled("Transfer cancelled")
+                            
+        self._run(key, lambda: self.ssh_manager.safe_operation(_upload_operation, transfer=True))
+        
+    def _chunked_upload(self, key: str, local_path: str, remote_path: str, size: int,
+                        progress_callback: Optional[Callable[[int, int], bool]],
+                        digest: Optional[StreamingDigest] = None):
+        """Upload in parallel ranges, skipping ranges already completed"""
+        state = self.state_store.get(key) or {}
+        completed = state.get("ranges", []) if state.get("started") else []
+        if completed:
+            try:
+                remote_size = self.ssh_manager.safe_operation(
+                    lambda sftp: sftp.stat(remote_path).st_size
+                )
+            except IOError:
+                remote_size = None
+            if remote_size != size:
+                completed = []
+        if not completed:
+            self.state_store.update(key, force=True, started=True, ranges=[])
+            
+        transfer = ChunkedTransfer(self.ssh_manager, self.channels)
+        transfer.upload(
+            local_path, remote_path, progress_callback,
+            completed=completed,
+            range_done=lambda offset: self.state_store.add_range(key, offset),
+            digest=digest
+        )
+        
+    def download(self, remote_path: str, local_path: str,
+                 progress_callback: Optional[Callable[[int, int], bool]] = None,
+                 verify: bool = True, digest: Optional[StreamingDigest] = None):
+        """Download a file, continuing a previous partial download if possible
+        
+        Args:
+            remote_path: Remote file path
+            local_path: Local file path
+            progress_callback: Called with (transferred, total); returning
+                False cancels the transfer
+            verify: Hash the overlapping tail before appending
+            digest: Fed with the data received (optional)
+            
+        Raises:
+            TransferCancelled: If the progress callback cancelled the transfer
+        """
+        remote_stat = self.ssh_manager.safe_operation(lambda sftp: sftp.stat(remote_path))
+        size = remote_stat.st_size or 0
+        key = self._begin("download", remote_path, local_path, size, remote_stat.st_mtime)
+        
+        if self._use_chunked(size):
+            self._run(key, lambda: self._chunked_download(
+                key, remote_path, local_path, size, progress_callback, digest
+            ))
+            return
+            
+        def _download_operation(sftp):
+            partial_size = os.path.getsize(local_path) if os.path.exists(local_path) else 0
+            offset = self._resume_offset(key, partial_size, size)
+            
+            with sftp.open(remote_path, 'r') as remote_file:
+                if offset:
+                    with open(local_path, 'rb') as local_file:
+                        if verify and not self._tails_match(remote_file, local_file, offset):
+                            offset = 0
+                            
+                with open(local_path, 'r+b' if offset else 'wb') as local_file:
+                    self.state_store.update(key, force=True, started=True)
+                    local_file.seek(offset)
+                    remote_file.seek(offset)
+                    remote_file.prefetch(size)
+                    while offset < size:
+                        data = remote_file.read(self.BLOCK_SIZE)
+                        if not data:
+                            break
+                        local_file.write(data)
+                        if digest:
+                            digest.update(offset, data)
+                        offset += len(data)
+                        if progress_callback and progress_callback(offset, size) is False:
+                            raise TransferCancelled("Transfer cancelled")
+                            
+        self._run(key, lambda: self.ssh_manager.safe_operation(_download_operation, transfer=True))
+        
+    def _chunked_download(self, key: str, remote_path: str, local_path: str, size: int,
+                          progress_callback: Optional[Callable[[int, int], bool]],
+                          digest: Optional[StreamingDigest] = None):
+        """Download in parallel ranges, skipping ranges already completed"""
+        state = self.state_store.get(key) or {}
+        completed = state.get("ranges", []) if state.get("started") else []
+        if completed and (not os.path.exists(local_path) or os.path.getsize(local_path) != size):
+            completed = []
+        if not completed:
+            self.state_store.update(key, force=True, started=True, ranges=[])
+            
+        transfer = ChunkedTransfer(self.ssh_manager, self.channels)
+        transfer.download(
+            remote_path, local_path, progress_callback,
+            size=size, completed=completed,
+            range_done=lambda offset: self.state_store.add_range(key, offset),
+            digest=digest
+        )
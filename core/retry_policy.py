@@ -0,0 +1,176 @@
+"""Retry decisions for failed SFTP operations"""
+import copy
+import errno
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+import paramiko
+
+from core.errors import NotConnectedError
+
+
+class ErrorKind:
+    """How a failed operation should be handled"""
+    PERMANENT = "permanent"  # retrying gives the same result
+    TRANSIENT = "transient"  # may succeed on the same connection
+    CONNECTION_LOST = "connection lost"  # needs a new connection
+
+
+# errno values for which a retry on the same server cannot help
+PERMANENT_ERRNOS = {
+    getattr(errno, name) for name in (
+        "ENOENT", "EACCES", "EPERM", "EEXIST", "ENOTDIR", "EISDIR", "ENOTEMPTY",
+        "EROFS", "ENOSPC", "EDQUOT", "ENAMETOOLONG", "EINVAL", "ELOOP",
+    ) if hasattr(errno, name)
+}
+
+# Messages paramiko raises when the session under a channel is gone
+CONNECTION_LOST_MESSAGES = (
+    "session not active", "connection dropped", "is closed", "not connected",
+)
+
+
+def classify_error(error: BaseException) -> str:
+    """Classify an exception raised by an SFTP operation
+    
+    Status codes from the server are permanent: paramiko maps "no such
+    file" and "permission denied" to ENOENT and EACCES, and reports other
+    refusals such as an existing directory as a bare "Failure". Broken
+    sockets and closed sessions are connection losses; timeouts and
+    refused channels are transient. Having no connection at all, before
+    connecting or after disconnecting, is permanent.
+    
+    Args:
+        error: Exception to classify
+        
+    Returns:
+        An ErrorKind value
+    """
+    if isinstance(error, NotConnectedError):
+        return ErrorKind.PERMANENT
+    if isinstance(error, (EOFError, ConnectionResetError, ConnectionAbortedError,
+                          BrokenPipeError)):
+        return ErrorKind.CONNECTION_LOST
+    if isinstance(error, (socket.timeout, TimeoutError, paramiko.ChannelException)):
+        return ErrorKind.TRANSIENT
+    message = str(error).lower()
+    if any(text in message for text in CONNECTION_LOST_MESSAGES):
+        return ErrorKind.CONNECTION_LOST
+    if isinstance(error, paramiko.SSHException):
+        return ErrorKind.TRANSIENT
+    if isinstance(error, OSError):
+        if error.errno in PERMANENT_ERRNOS:
+            return ErrorKind.PERMANENT
+        if error.errno is None and (message in ("failure", "") or "unsupported" in message):
+            return ErrorKind.PERMANENT
+        return ErrorKind.TRANSIENT
+    return ErrorKind.PERMANENT
+
+
+class RetryPolicy:
+    """Decides whether and when a failed operation is tried again
+    
+    Transient errors of idempotent operations are retried with
+    exponential backoff and jitter until the attempts or the deadline run
+    out. Permanent errors fail at once. Operations that are not idempotent
+    are never retried, because the first attempt may have taken effect.
+    """
+    
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.25,
+                 max_delay: float = 5.0, deadline: Optional[float] = 60.0,
+                 classifier: Callable[[BaseException], str] = classify_error):
+        """Initialize retry policy
+        
+        Args:
+            max_attempts: Attempts for transient errors, including the first
+            base_delay: Seconds before the first retry, doubled for each
+                further retry
+            max_delay: Upper bound of a single delay in seconds
+            deadline: Seconds after the first attempt in which retries may
+                start (None for no limit)
+            classifier: Maps an exception to an ErrorKind value
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.classifier = classifier
+        
+    def with_attempts(self, max_attempts: int) -> "RetryPolicy":
+        """Copy of this policy allowing a different number of attempts
+        
+        Args:
+            max_attempts: Attempts for transient errors, including the first
+        """
+        policy = copy.copy(self)
+        policy.max_attempts = max(1, max_attempts)
+        return policy
+        
+    def classify(self, error: BaseException) -> str:
+        """Classify an exception with the configured classifier"""
+        return self.classifier(error)
+        
+    def expired(self, started: float) -> bool:
+        """Check whether the deadline of an operation has passed
+        
+        Args:
+            started: time.monotonic() of the first attempt
+        """
+        return self.deadline is not None and time.monotonic() - started >= self.deadline
+        
+    def retry_delay(self, kind: str, attempt: int, started: float,
+                    idempotent: bool = True) -> Optional[float]:
+        """Seconds to wait before retrying after a failed attempt
+        
+        Args:
+            kind: ErrorKind of the failure
+            attempt: Number of attempts made so far
+            started: time.monotonic() of the first attempt
+            idempotent: Whether the operation may run again
+            
+        Returns:
+            Delay in seconds, or None if the error should be raised
+        """
+        if kind != ErrorKind.TRANSIENT or not idempotent or attempt >= self.max_attempts:
+            return None
+        delay = random.uniform(0.5, 1.0) * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if self.deadline is not None:
+            remaining = self.deadline - (time.monotonic() - started)
+            if remaining <= delay:
+                return None
+        return delay
+
+
+class RetryStats:
+    """Thread-safe counters describing how operations fared"""
+    
+    def __init__(self):
+        """Initialize retry counters"""
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        
+    def record(self, event: str, kind: Optional[str] = None):
+        """Count an event, optionally per error kind
+        
+        Args:
+            event: Event name, e.g. "retries" or "failures"
+            kind: ErrorKind the event was caused by (optional)
+        """
+        with self._lock:
+            self._counts[event] += 1
+            if kind:
+                self._counts[f"{event} ({kind})"] += 1
+                
+    def snapshot(self) -> Dict[str, int]:
+        """Current counter values"""
+        with self._lock:
+            return dict(self._counts)
+            
+    def reset(self):
+        """Set every counter back to zero"""
+        with self._lock:
+            self._counts.clear()
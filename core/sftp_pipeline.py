@@ -0,0 +1,185 @@
+"""Metadata requests for many paths kept in flight on one SFTP channel"""
+import posixpath
+import stat
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import paramiko
+from paramiko.sftp import CMD_ATTRS, CMD_LSTAT, CMD_MKDIR, CMD_REMOVE, CMD_RMDIR, CMD_SETSTAT, CMD_STAT, CMD_STATUS
+
+
+@dataclass
+class MetadataResult:
+    """Outcome of one request of a pipelined batch"""
+    path: str
+    attributes: Optional[paramiko.SFTPAttributes] = None  # for stat requests
+    error: Optional[Exception] = None
+    
+    @property
+    def ok(self) -> bool:
+        """The request succeeded"""
+        return self.error is None
+
+
+class SFTPPipeline:
+    """Sends batches of stat, mkdir, remove and chmod requests without
+    waiting for each answer
+    
+    paramiko's SFTP client waits for the reply of every request before
+    sending the next, so a thousand stats cost a thousand round trips.
+    This class uses the client's asynchronous request mechanism, the one
+    behind read prefetching, to keep up to ``max_in_flight`` requests
+    outstanding and matches the replies to their paths by request
+    number, in whatever order the server sends them. A batch of any size
+    then costs about ``len(paths) / max_in_flight`` round trips.
+    
+    The client must not be used by anyone else while a batch runs; check
+    it out with ``SSHManager.sftp_channel()`` or run the batch inside
+    ``safe_operation()``. Errors are reported per path instead of being
+    raised, except for a lost connection.
+    """
+    
+    MAX_IN_FLIGHT = 64
+    
+    def __init__(self, sftp: paramiko.SFTPClient, max_in_flight: int = MAX_IN_FLIGHT):
+        """Initialize pipeline
+        
+        Args:
+            sftp: SFTP client reserved for the caller
+            max_in_flight: Requests sent ahead of their replies
+        """
+        self.sftp = sftp
+        self.max_in_flight = max(1, max_in_flight)
+        self._replies: Dict[int, Tuple[int, paramiko.Message]] = {}
+        
+    def _async_response(self, t: int, msg: paramiko.Message, num: int):
+        """Receive a reply; called by the SFTP client while reading"""
+        self._replies[num] = (t, msg)
+        
+    def _run(self, requests: Iterable[Tuple[str, int, tuple]]) -> List[MetadataResult]:
+        """Send requests with a bounded window and collect their results
+        
+        Args:
+            requests: Tuples of (path, SFTP command, request arguments)
+            
+        Returns:
+            One result per request, in request order
+        """
+        results: List[MetadataResult] = []
+        in_flight: Dict[int, MetadataResult] = {}
+        requests = iter(requests)
+        exhausted = False
+        
+        while True:
+            while not exhausted and len(in_flight) < self.max_in_flight:
+                request = next(requests, None)
+                if request is None:
+                    exhausted = True
+                    break
+                path, command, arguments = request
+                result = MetadataResult(path)
+                results.append(result)
+                num = self.sftp._async_request(self, command, *arguments)
+                in_flight[num] = result
+            if not in_flight:
+                return results
+                
+            self.sftp._read_response()
+            for num, (t, msg) in self._replies.items():
+                result = in_flight.pop(num, None)
+                if result is None:
+                    continue  # reply to a request of an abandoned batch
+                try:
+                    if t == CMD_STATUS:
+                        self.sftp._convert_status(msg)
+                    elif t == CMD_ATTRS:
+                        result.attributes = paramiko.SFTPAttributes._from_msg(msg)
+                        result.attributes.filename = posixpath.basename(result.path)
+                    else:
+                        raise paramiko.SFTPError(f"Unexpected response type {t}")
+                except (IOError, EOFError, paramiko.SFTPError) as e:
+                    result.error = e
+            self._replies.clear()
+            
+    def _path(self, path: str) -> bytes:
+        """Encode a path relative to the client's working directory"""
+        return self.sftp._adjust_cwd(path)
+        
+    def stat(self, paths: Iterable[str], follow_symlinks: bool = True) -> List[MetadataResult]:
+        """Get the attributes of many paths
+        
+        Args:
+            paths: Remote paths
+            follow_symlinks: Describe link targets rather than the links
+            
+        Returns:
+            Results in path order; missing paths have FileNotFoundError
+        """
+        command = CMD_STAT if follow_symlinks else CMD_LSTAT
+        return self._run((path, command, (self._path(path),)) for path in paths)
+        
+    def mkdir(self, paths: Iterable[str], mode: int = 0o777) -> List[MetadataResult]:
+        """Create many directories whose parents exist"""
+        return self._run(
+            (path, CMD_MKDIR, (self._path(path), self._mode(mode))) for path in paths
+        )
+        
+    def makedirs(self, paths: Iterable[str], mode: int = 0o777) -> List[MetadataResult]:
+        """Create directories and their missing parents, like ``mkdir -p``
+        
+        Directories are created one depth level at a time, with a whole
+        level in flight at once, so the cost grows with the depth of the
+        tree rather than the number of directories. Directories that
+        already exist are not errors.
+        
+        Args:
+            paths: Remote directory paths
+            mode: Permissions of created directories
+            
+        Returns:
+            Results of the requested paths that could not be created
+        """
+        requested = {posixpath.normpath(path) for path in paths}
+        levels: Dict[int, set] = {}
+        for path in requested:
+            while path not in ("", "/", "."):
+                levels.setdefault(path.count("/"), set()).add(path)
+                path = posixpath.dirname(path)
+                
+        failed: Dict[str, MetadataResult] = {}
+        for depth in sorted(levels):
+            pending = []
+            for path in sorted(levels[depth]):
+                parent = failed.get(posixpath.dirname(path))
+                if parent is None:
+                    pending.append(path)
+                else:
+                    # Below a directory that cannot be created nothing can be
+                    failed[path] = MetadataResult(path, error=parent.error)
+            refused = {result.path: result for result in self.mkdir(pending, mode) if not result.ok}
+            # mkdir fails without a specific reason for existing paths
+            for result in self.stat(refused):
+                if not result.ok or not stat.S_ISDIR(result.attributes.st_mode or 0):
+                    failed[result.path] = refused[result.path]
+        return [failed[path] for path in sorted(failed) if path in requested]
+        
+    def remove(self, paths: Iterable[str]) -> List[MetadataResult]:
+        """Remove many files"""
+        return self._run((path, CMD_REMOVE, (self._path(path),)) for path in paths)
+        
+    def rmdir(self, paths: Iterable[str]) -> List[MetadataResult]:
+        """Remove many empty directories"""
+        return self._run((path, CMD_RMDIR, (self._path(path),)) for path in paths)
+        
+    def chmod(self, paths: Iterable[str], mode: int) -> List[MetadataResult]:
+        """Change the permissions of many paths"""
+        return self._run(
+            (path, CMD_SETSTAT, (self._path(path), self._mode(mode))) for path in paths
+        )
+        
+    @staticmethod
+    def _mode(mode: int) -> paramiko.SFTPAttributes:
+        """Attributes carrying only permissions"""
+        attributes = paramiko.SFTPAttributes()
+        attributes.st_mode = mode
+        return attributes
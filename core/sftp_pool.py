@@ -0,0 +1,202 @@
+"""Pool of SFTP channels sharing one SSH transport"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+import paramiko
+
+
+class SFTPChannelPool:
+    """Hands out SFTP clients opened on separate channels of one transport
+    
+    Every SFTP client in the pool owns its own channel, so a long transfer
+    on one client does not block listings or stats running on another.
+    Channels are opened lazily up to ``size`` and reused after release.
+    """
+    
+    def __init__(self, transport: paramiko.Transport, size: int = 4,
+                 window_size: Optional[int] = None, max_packet_size: Optional[int] = None):
+        """Initialize channel pool
+        
+        Args:
+            transport: Connected SSH transport to open channels on
+            size: Maximum number of SFTP channels
+            window_size: SSH channel window size (optional)
+            max_packet_size: SSH channel maximum packet size (optional)
+        """
+        self.transport = transport
+        self.size = max(1, size)
+        self.window_size = window_size
+        self.max_packet_size = max_packet_size
+        self._idle: List[paramiko.SFTPClient] = []
+        self._clients: List[paramiko.SFTPClient] = []
+        self._opening = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        
+    @property
+    def in_use(self) -> int:
+        """Number of channels currently checked out"""
+        with self._condition:
+            return len(self._clients) - len(self._idle)
+            
+    @property
+    def available(self) -> int:
+        """Number of channels that can be checked out without waiting"""
+        with self._condition:
+            return len(self._idle) + (self.size - len(self._clients) - self._opening)
+            
+    def acquire(self, timeout: Optional[float] = None) -> paramiko.SFTPClient:
+        """Check out a free SFTP client, opening a new channel if allowed
+        
+        Args:
+            timeout: Seconds to wait for a free channel (None waits forever)
+            
+        Returns:
+            SFTP client reserved for the caller
+            
+        Raises:
+            ConnectionError: If the pool is closed
+            TimeoutError: If no channel became free within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            client = self._reserve(deadline)
+            if client is not None:
+                return client
+            client = self._open_client()
+            if client is not None:
+                return client
+                
+    def _reserve(self, deadline: Optional[float]) -> Optional[paramiko.SFTPClient]:
+        """Wait for an idle client or a free slot to open one in
+        
+        Args:
+            deadline: time.monotonic() after which to give up (None waits forever)
+            
+        Returns:
+            Idle SFTP client, or None if a slot was reserved for a new channel
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise ConnectionError("SFTP channel pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if len(self._clients) + self._opening < self.size:
+                    self._opening += 1
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a free SFTP channel")
+                self._condition.wait(remaining)
+                
+    def _open_client(self) -> Optional[paramiko.SFTPClient]:
+        """Open a new channel in a slot reserved by _reserve()
+        
+        Returns:
+            New SFTP client, or None if the server refused the channel and
+            the caller should wait for an existing one
+        """
+        try:
+            client = paramiko.SFTPClient.from_transport(
+                self.transport,
+                window_size=self.window_size,
+                max_packet_size=self.max_packet_size
+            )
+        except paramiko.ChannelException:
+            # The server refused another session (e.g. OpenSSH MaxSessions),
+            # so shrink the pool to what it accepted and wait for a free one
+            with self._condition:
+                self._opening -= 1
+                self.size = max(1, len(self._clients))
+                has_clients = bool(self._clients)
+            if not has_clients:
+                raise
+            return None
+        except Exception:
+            with self._condition:
+                self._opening -= 1
+                self._condition.notify()
+            raise
+            
+        with self._condition:
+            self._opening -= 1
+            self._clients.append(client)
+        return client
+        
+    def try_acquire(self) -> Optional[paramiko.SFTPClient]:
+        """Check out an already open idle SFTP client without blocking
+        
+        Returns:
+            SFTP client, or None if no idle channel exists
+        """
+        with self._condition:
+            if self._closed or not self._idle:
+                return None
+            return self._idle.pop()
+            
+    def release(self, client: paramiko.SFTPClient, discard: bool = False):
+        """Return a checked out SFTP client to the pool
+        
+        Args:
+            client: SFTP client obtained from acquire()
+            discard: Close the channel instead of reusing it
+        """
+        channel = client.get_channel()
+        if discard or channel is None or channel.closed:
+            with self._condition:
+                if client in self._clients:
+                    self._clients.remove(client)
+                self._condition.notify()
+            try:
+                client.close()
+            except Exception:
+                pass
+            return
+            
+        with self._condition:
+            if self._closed:
+                close_client = True
+            else:
+                close_client = False
+                self._idle.append(client)
+                self._condition.notify()
+        if close_client:
+            client.close()
+            
+    @contextmanager
+    def channel(self, timeout: Optional[float] = None):
+        """Context manager that checks out an SFTP client for a block
+        
+        Args:
+            timeout: Seconds to wait for a free channel
+            
+        Yields:
+            SFTP client reserved for the block
+        """
+        client = self.acquire(timeout)
+        broken = False
+        try:
+            yield client
+        except (EOFError, paramiko.SSHException):
+            broken = True
+            raise
+        finally:
+            self.release(client, discard=broken)
+            
+    def close(self):
+        """Close every channel in the pool"""
+        with self._condition:
+            self._closed = True
+            clients = list(self._clients)
+            self._clients.clear()
+            self._idle.clear()
+            self._condition.notify_all()
+            
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
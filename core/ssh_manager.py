@@ -1,25 +1,70 @@
 """SSH Connection and SFTP Management"""
+import logging
 import paramiko
+import random
+import socket
+import threading
 import time
-from typing import Optional, Callable, Any
-from PySide6.QtCore import QObject, Signal
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Callable, Any
 
+from core.command_stream import CommandStream
+from core.errors import NotConnectedError
+from core.events import Event
+from core.retry_policy import ErrorKind, RetryPolicy, RetryStats
+from core.sftp_pool import SFTPChannelPool
 
-class SSHManager(QObject):
-    """Manages SSH connections and SFTP operations"""
+logger = logging.getLogger(__name__)
+
+
+class SSHManager:
+    """Manages SSH connections and SFTP operations
+    
+    Has no Qt dependency. Its events (connection_lost, reconnecting,
+    reconnected) are emitted from whichever thread noticed the change.
+    """
+    
+    DEFAULT_POOL_SIZE = 4
+    MAX_CONNECTIONS_PER_HOST = 8
+    TRANSFER_WINDOW_SIZE = 32 * 1024 * 1024  # sized for high bandwidth-delay links
+    KEEPALIVE_INTERVAL = 15  # seconds between keepalive packets and link checks
+    RECONNECT_ATTEMPTS = 6
+    RECONNECT_BASE_DELAY = 1.0  # seconds, doubled after every failed attempt
+    RECONNECT_MAX_DELAY = 30.0
+    MAX_REPLAYS = 5  # reconnects a single operation may be replayed across
     
-    connection_lost = Signal()
-    operation_progress = Signal(int, int)  # transferred, total
+    _host_connections: Dict[str, int] = {}
+    _host_lock = threading.Lock()
     
-    def __init__(self):
-        """Initialize SSH manager"""
-        super().__init__()
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        """Initialize SSH manager
+        
+        Args:
+            pool_size: Number of SFTP channels opened on the SSH transport
+        """
+        self.connection_lost = Event()
+        self.reconnecting = Event()  # attempt
+        self.reconnected = Event()
+        self.operation_progress = Event()  # transferred, total
         self.ssh_client: Optional[paramiko.SSHClient] = None
         self.sftp_client: Optional[paramiko.SFTPClient] = None
+        self.sftp_pool: Optional[SFTPChannelPool] = None
+        self.transfer_clients: List[paramiko.SSHClient] = []
+        self.transfer_pools: List[SFTPChannelPool] = []
+        self.pool_size = pool_size
         self.host = ""
         self.port = 22
         self.username = ""
         self.password = ""
+        self.timeout = 30
+        self._pool_lock = threading.Lock()
+        self._reconnect_lock = threading.Lock()
+        self._generation = 0  # incremented by every reconnect
+        self._gave_up = False
+        self._stop_monitor = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self.retry_policy = RetryPolicy()
+        self.retry_stats = RetryStats()
         
     def connect(self, host: str, port: int, username: str, password: str, timeout: int = 30):
         """Establish SSH connection and create SFTP client
@@ -38,21 +83,200 @@ class SSHManager(QObject):
         self.port = port
         self.username = username
         self.password = password
+        self.timeout = timeout
         
-        self.ssh_client = paramiko.SSHClient()
-        self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        self.ssh_client.connect(
-            hostname=host,
-            port=port,
-            username=username,
-            password=password,
-            timeout=timeout
+        self.ssh_client = self._open_client()
+        self.sftp_client = self.ssh_client.open_sftp()
+        self.sftp_pool = SFTPChannelPool(
+            self.ssh_client.get_transport(), self.pool_size,
+            window_size=self.TRANSFER_WINDOW_SIZE
         )
+        self._gave_up = False
+        self._stop_monitor.clear()
+        if self._monitor is None or not self._monitor.is_alive():
+            self._monitor = threading.Thread(target=self._watch_link, daemon=True)
+            self._monitor.start()
+            
+    def _open_client(self) -> paramiko.SSHClient:
+        """Open a new SSH client using the stored connection credentials
         
-        self.sftp_client = self.ssh_client.open_sftp()
+        The transport sends keepalives and its socket gives up on
+        unacknowledged data after a few keepalive intervals, so a link that
+        silently died closes the transport instead of hanging it.
+        
+        Returns:
+            Connected SSH client
+        """
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(
+            hostname=self.host,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            timeout=self.timeout
+        )
+        transport = client.get_transport()
+        transport.set_keepalive(self.KEEPALIVE_INTERVAL)
+        self._configure_socket(transport.sock)
+        return client
+        
+    def _configure_socket(self, sock):
+        """Enable TCP keepalives and a send timeout where the platform has them"""
+        if not isinstance(sock, socket.socket):
+            return  # e.g. a proxy command
+        options = [
+            (socket.SOL_SOCKET, 'SO_KEEPALIVE', 1),
+            (socket.IPPROTO_TCP, 'TCP_KEEPIDLE', self.KEEPALIVE_INTERVAL),
+            (socket.IPPROTO_TCP, 'TCP_KEEPINTVL', self.KEEPALIVE_INTERVAL),
+            (socket.IPPROTO_TCP, 'TCP_KEEPCNT', 3),
+            (socket.IPPROTO_TCP, 'TCP_USER_TIMEOUT', self.KEEPALIVE_INTERVAL * 4 * 1000),
+        ]
+        for level, name, value in options:
+            if hasattr(socket, name):
+                try:
+                    sock.setsockopt(level, getattr(socket, name), value)
+                except OSError:
+                    pass
+                    
+    def _link_alive(self) -> bool:
+        """Check whether the primary transport is still active"""
+        client = self.ssh_client
+        transport = client.get_transport() if client else None
+        return transport is not None and transport.is_active()
+        
+    def _watch_link(self):
+        """Reconnect in the background when the transport dies"""
+        while not self._stop_monitor.wait(self.KEEPALIVE_INTERVAL):
+            if self._gave_up or self.ssh_client is None:
+                continue
+            if not self._link_alive():
+                logger.warning("Connection to %s lost, reconnecting", self.host)
+                self.reconnect(self._generation)
+                
+    def reconnect(self, generation: Optional[int] = None) -> bool:
+        """Replace a dead connection with a new one
+        
+        Attempts are spaced by exponential backoff with full jitter. The
+        pool size and the number of transfer connections are restored.
+        Operations running in safe_operation() replay on the new
+        connection; connection_lost is emitted only when every attempt
+        failed.
+        
+        Args:
+            generation: Connection generation the caller saw fail; if
+                another thread reconnected since, nothing is done (optional)
+                
+        Returns:
+            True if a working connection is available
+        """
+        with self._reconnect_lock:
+            if generation is not None and generation != self._generation:
+                return self.is_connected()
+            if self._gave_up or self._stop_monitor.is_set():
+                return False
+                
+            transfer_count = len(self.transfer_clients)
+            self._close_connections()
+            last_exception = None
+            for attempt in range(self.RECONNECT_ATTEMPTS):
+                if attempt:
+                    delay = min(self.RECONNECT_MAX_DELAY, self.RECONNECT_BASE_DELAY * 2 ** attempt)
+                    if self._stop_monitor.wait(random.uniform(0, delay)):
+                        return False
+                self.reconnecting.emit(attempt + 1)
+                try:
+                    self.connect(self.host, self.port, self.username, self.password, self.timeout)
+                    if transfer_count:
+                        self.open_transfer_connections(1 + transfer_count)
+                except paramiko.AuthenticationException as e:
+                    last_exception = e
+                    break
+                except (OSError, EOFError, paramiko.SSHException) as e:
+                    last_exception = e
+                    self._close_connections()
+                    continue
+                self._generation += 1
+                self.reconnected.emit()
+                return True
+                
+            logger.error("Reconnect to %s failed: %s", self.host, last_exception)
+            self._gave_up = True
+            self.connection_lost.emit()
+            return False
+            
+    def open_transfer_connections(self, count: int) -> int:
+        """Open additional SSH connections to stripe transfers across
+        
+        Each extra connection has its own TCP stream and SSH window, so
+        transfers spread over them are not limited by a single connection's
+        throughput. The total per host is capped by MAX_CONNECTIONS_PER_HOST.
+        
+        Args:
+            count: Desired total number of connections, including the primary
+            
+        Returns:
+            Number of connections now available for transfers
+            
+        Raises:
+            ConnectionError: If SSH client is not connected
+        """
+        if not self.ssh_client:
+            raise self._not_connected("SSH client")
+            
+        wanted = count - 1 - len(self.transfer_clients)
+        with self._host_lock:
+            in_use = self._host_connections.get(self.host, 0)
+            wanted = max(0, min(wanted, self.MAX_CONNECTIONS_PER_HOST - 1 - in_use))
+            self._host_connections[self.host] = in_use + wanted
+            
+        opened = 0
+        try:
+            for _ in range(wanted):
+                client = self._open_client()
+                pool = SFTPChannelPool(
+                    client.get_transport(), self.pool_size,
+                    window_size=self.TRANSFER_WINDOW_SIZE
+                )
+                with self._pool_lock:
+                    self.transfer_clients.append(client)
+                    self.transfer_pools.append(pool)
+                opened += 1
+        finally:
+            if opened < wanted:
+                with self._host_lock:
+                    self._host_connections[self.host] -= wanted - opened
+                    
+        return 1 + len(self.transfer_clients)
         
+    def close_transfer_connections(self):
+        """Close the additional transfer connections"""
+        with self._pool_lock:
+            pools, self.transfer_pools = self.transfer_pools, []
+            clients, self.transfer_clients = self.transfer_clients, []
+            
+        for pool in pools:
+            pool.close()
+        for client in clients:
+            client.close()
+            
+        if clients:
+            with self._host_lock:
+                self._host_connections[self.host] -= len(clients)
+                
     def disconnect(self):
         """Close SSH and SFTP connections"""
+        self._stop_monitor.set()
+        self._close_connections()
+        
+    def _close_connections(self):
+        """Close every connection, keeping the credentials for a reconnect"""
+        self.close_transfer_connections()
+        
+        if self.sftp_pool:
+            self.sftp_pool.close()
+            self.sftp_pool = None
+            
         if self.sftp_client:
             self.sftp_client.close()
             self.sftp_client = None
@@ -61,6 +285,18 @@ class SSHManager(QObject):
             self.ssh_client.close()
             self.ssh_client = None
             
+    def _not_connected(self, what: str) -> ConnectionError:
+        """Error for an operation that found no connection
+        
+        While a lost connection is being restored this is a ConnectionError
+        that safe_operation() replays; when connect() never succeeded or
+        disconnect() was called it is a NotConnectedError, which is not
+        retried.
+        """
+        if self._monitor is None or self._stop_monitor.is_set():
+            return NotConnectedError(f"{what} not connected")
+        return ConnectionError(f"{what} not connected")
+        
     def is_connected(self) -> bool:
         """Check if connection is active
         
@@ -69,12 +305,31 @@ class SSHManager(QObject):
         """
         return self.ssh_client is not None and self.sftp_client is not None
         
-    def safe_operation(self, operation: Callable, *args, max_retries: int = 3, **kwargs) -> Any:
-        """Execute SFTP operation with retry logic
+    def safe_operation(self, operation: Callable, *args, max_retries: Optional[int] = None,
+                       transfer: bool = False, idempotent: bool = True,
+                       policy: Optional[RetryPolicy] = None, **kwargs) -> Any:
+        """Execute SFTP operation on a free pooled channel with retry logic
+        
+        The operation is called as ``operation(sftp, *args, **kwargs)`` where
+        ``sftp`` is checked out of the channel pool for the duration of the
+        call, so concurrent operations run on separate channels.
+        
+        Failures are classified by the retry policy. Permanent errors, like
+        a missing file or a denied permission, are raised at once.
+        Transient errors are retried with exponential backoff until the
+        policy's attempts or deadline run out. When the connection died, it
+        is reconnected and an idempotent operation is replayed on the new
+        connection; operations that resume from the remote state, like
+        resumable transfers, continue where they stopped. Outcomes are
+        counted in retry_stats.
         
         Args:
             operation: SFTP operation to execute
-            max_retries: Maximum number of retries
+            max_retries: Maximum number of attempts (defaults to the policy's)
+            transfer: Spread the call across the transfer connections
+            idempotent: The operation may run again after a failure; pass
+                False for e.g. rename, whose repetition would fail
+            policy: Retry policy for this call (defaults to retry_policy)
             *args: Arguments to pass to operation
             **kwargs: Keyword arguments to pass to operation
             
@@ -84,22 +339,110 @@ class SSHManager(QObject):
         Raises:
             Exception: If operation fails after all retries
         """
-        last_exception = None
+        policy = policy or self.retry_policy
+        if max_retries:
+            policy = policy.with_attempts(max_retries)
+        started = time.monotonic()
+        attempt = 0
+        replays = 0
+        self.retry_stats.record("operations")
         
-        for attempt in range(max_retries):
+        while True:
+            generation = self._generation
             try:
-                return operation(*args, **kwargs)
-            except (OSError, IOError, paramiko.SSHException) as e:
-                last_exception = e
-                if attempt < max_retries - 1:
-                    print(f"Operation failed (attempt {attempt + 1}), retrying: {e}")
-                    time.sleep(1)
+                channel = self.transfer_channel() if transfer else self.sftp_channel()
+                with channel as sftp:
+                    return operation(sftp, *args, **kwargs)
+            except (OSError, EOFError, paramiko.SSHException) as e:
+                kind = policy.classify(e)
+                if kind != ErrorKind.PERMANENT and (
+                        generation != self._generation or not self._link_alive()):
+                    kind = ErrorKind.CONNECTION_LOST
+                    
+                if kind == ErrorKind.CONNECTION_LOST:
+                    restored = self.reconnect(generation)
+                    if not restored or not idempotent or replays >= self.MAX_REPLAYS or policy.expired(started):
+                        self.retry_stats.record("failures", kind)
+                        raise
+                    replays += 1
+                    self.retry_stats.record("replays", kind)
+                    logger.info("Connection restored, replaying operation: %s", e)
+                    continue
                     
-        if last_exception:
-            raise last_exception
+                attempt += 1
+                delay = policy.retry_delay(kind, attempt, started, idempotent)
+                if delay is None:
+                    self.retry_stats.record("failures", kind)
+                    raise
+                self.retry_stats.record("retries", kind)
+                logger.info("Operation failed (attempt %d), retrying in %.2f s: %s", attempt, delay, e)
+                time.sleep(delay)
+                
+    @contextmanager
+    def sftp_channel(self, timeout: Optional[float] = None):
+        """Check out a free SFTP channel from the pool
+        
+        Args:
+            timeout: Seconds to wait for a free channel (optional)
+            
+        Yields:
+            SFTP client reserved for the caller
             
+        Raises:
+            ConnectionError: If SFTP client is not connected
+        """
+        if not self.sftp_pool:
+            raise self._not_connected("SFTP client")
+        with self.sftp_pool.channel(timeout) as sftp:
+            yield sftp
+            
+    @contextmanager
+    def transfer_channel(self, timeout: Optional[float] = None):
+        """Check out an SFTP channel on the least busy connection
+        
+        Falls back to the primary connection's pool when no transfer
+        connections were opened.
+        
+        Args:
+            timeout: Seconds to wait for a free channel (optional)
+            
+        Yields:
+            SFTP client reserved for the caller
+            
+        Raises:
+            ConnectionError: If SFTP client is not connected
+        """
+        if not self.sftp_pool:
+            raise self._not_connected("SFTP client")
+            
+        with self._pool_lock:
+            pools = [self.sftp_pool] + self.transfer_pools
+        pool = min(pools, key=lambda p: (p.in_use, -p.available))
+        
+        with pool.channel(timeout) as sftp:
+            yield sftp
+            
+    def open_sftp_channel(self) -> paramiko.SFTPClient:
+        """Open an SFTP client on a new channel outside the pool
+        
+        For long running background work that should neither wait for
+        nor occupy pooled channels. The caller closes the client.
+        
+        Returns:
+            SFTP client owned by the caller
+            
+        Raises:
+            ConnectionError: If SSH client is not connected
+        """
+        if not self.ssh_client:
+            raise self._not_connected("SSH client")
+        return paramiko.SFTPClient.from_transport(self.ssh_client.get_transport())
+        
     def get_sftp(self) -> paramiko.SFTPClient:
-        """Get SFTP client instance
+        """Get the primary SFTP client instance
+        
+        The primary client is not part of the channel pool and must not be
+        shared between threads; prefer sftp_channel() or safe_operation().
         
         Returns:
             SFTP client instance
@@ -108,29 +451,89 @@ class SSHManager(QObject):
             ConnectionError: If SFTP client is not connected
         """
         if not self.sftp_client:
-            raise ConnectionError("SFTP client not connected")
+            raise self._not_connected("SFTP client")
         return self.sftp_client
         
-    def execute_command(self, command: str) -> tuple[str, str, int]:
+    def open_command(self, command: str, timeout: Optional[float] = None,
+                     cancel_event: Optional[threading.Event] = None,
+                     encoding: str = 'utf-8', window_size: Optional[int] = None) -> CommandStream:
+        """Start an SSH command and return a stream over its output
+        
+        The output is read incrementally from the returned CommandStream,
+        as raw chunks, decoded chunks or lines, or copied into a file. Its
+        exit status is available once the output has been read.
+        
+        Args:
+            command: Command to execute
+            timeout: Seconds the whole command may take (optional)
+            cancel_event: Stops the command when set (optional)
+            encoding: Encoding of the output
+            window_size: SSH window of the channel, for commands with a
+                lot of output (optional)
+                
+        Returns:
+            Command stream owning the channel
+            
+        Raises:
+            ConnectionError: If SSH client is not connected
+        """
+        if not self.ssh_client:
+            raise self._not_connected("SSH client")
+            
+        transport = self.ssh_client.get_transport()
+        if window_size:
+            channel = transport.open_session(window_size=window_size)
+        else:
+            channel = transport.open_session()
+        try:
+            channel.exec_command(command)
+        except Exception:
+            channel.close()
+            raise
+        return CommandStream(channel, timeout, cancel_event, encoding)
+        
+    def execute_command(self, command: str, timeout: Optional[float] = None) -> tuple[str, str, int]:
         """Execute SSH command and return stdout, stderr, exit_code
         
+        Both streams are read while the command runs, so a command writing
+        a lot to one of them cannot stall. Undecodable bytes are replaced.
+        Use open_command() for output too large to hold in memory.
+        
         Args:
             command: Command to execute
+            timeout: Seconds the command may take (optional)
             
         Returns:
             Tuple of (stdout, stderr, exit_code)
             
         Raises:
             ConnectionError: If SSH client is not connected
+            TimeoutError: If the timeout expired
         """
-        if not self.ssh_client:
-            raise ConnectionError("SSH client not connected")
-            
-        stdin, stdout, stderr = self.ssh_client.exec_command(command)
-        exit_code = stdout.channel.recv_exit_status()
+        with self.open_command(command, timeout) as stream:
+            stdout, stderr = stream.read_all()
+        return stdout, stderr, stream.exit_status
         
-        return (
-            stdout.read().decode('utf-8'),
-            stderr.read().decode('utf-8'),
-            exit_code
-        )
+    def stream_command(self, command: str,
+                       cancel_event: Optional[threading.Event] = None) -> Iterator[str]:
+        """Execute SSH command and yield its stdout lines as they arrive
+        
+        Lines are yielded without their line break. Standard error is
+        discarded. Closing the generator early, or setting the cancel
+        event, closes the channel, which stops the remote command.
+        
+        Args:
+            command: Command to execute
+            cancel_event: Stops the command when set, even while it is
+                silent (optional)
+                
+        Yields:
+            Lines of standard output, decoded as UTF-8
+            
+        Raises:
+            ConnectionError: If SSH client is not connected
+        """
+        with self.open_command(command, cancel_event=cancel_event) as stream:
+            for name, line in stream.lines():
+                if name == CommandStream.STDOUT:
+                    yield line
@@ -0,0 +1,625 @@
+"""Two-way folder synchronization planned from metadata snapshots"""
+import hashlib
+import json
+import os
+import posixpath
+import shlex
+import stat
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.errors import TransferCancelled
+from core.sftp_pipeline import SFTPPipeline
+
+FileState = Tuple[int, int]  # size, whole-second mtime
+
+
+class SyncAction:
+    """Actions a sync plan can take for one file"""
+    UPLOAD = "Upload"
+    DOWNLOAD = "Download"
+    DELETE_LOCAL = "Delete local"
+    DELETE_REMOTE = "Delete remote"
+    CONFLICT = "Conflict"
+    SKIP = "Skip"
+
+
+@dataclass
+class SyncEntry:
+    """A planned action for one file, by path relative to the synced folders"""
+    path: str
+    action: str
+    local: Optional[FileState] = None
+    remote: Optional[FileState] = None
+    reason: str = ""
+    done: bool = False
+    error: str = ""
+    
+    @property
+    def size(self) -> int:
+        """Bytes moved by the action"""
+        if self.action == SyncAction.UPLOAD and self.local:
+            return self.local[0]
+        if self.action == SyncAction.DOWNLOAD and self.remote:
+            return self.remote[0]
+        return 0
+
+
+@dataclass
+class SyncPlan:
+    """Changes needed to bring a local and a remote folder in sync
+    
+    Only files that need an action or a decision are listed in
+    ``entries``; ``unchanged`` counts the rest.
+    """
+    local_folder: str
+    remote_folder: str
+    entries: List[SyncEntry] = field(default_factory=list)
+    unchanged: int = 0
+    base: Dict[str, list] = field(default_factory=dict, repr=False)  # snapshot the plan was made against
+    scan_seconds: float = 0.0
+    
+    def count(self, action: str) -> int:
+        """Number of entries with an action"""
+        return sum(1 for entry in self.entries if entry.action == action)
+        
+    @property
+    def conflicts(self) -> List[SyncEntry]:
+        """Entries that still need a decision"""
+        return [entry for entry in self.entries if entry.action == SyncAction.CONFLICT]
+        
+    @property
+    def transfer_bytes(self) -> int:
+        """Bytes the plan uploads and downloads"""
+        return sum(entry.size for entry in self.entries)
+        
+    def __str__(self) -> str:
+        """Human readable summary"""
+        return (
+            f"{self.count(SyncAction.UPLOAD)} to upload, "
+            f"{self.count(SyncAction.DOWNLOAD)} to download, "
+            f"{self.count(SyncAction.DELETE_LOCAL) + self.count(SyncAction.DELETE_REMOTE)} to delete, "
+            f"{self.count(SyncAction.CONFLICT)} conflicts, {self.unchanged} unchanged"
+        )
+
+
+class SyncSnapshot:
+    """State of a folder pair after its last sync, kept in a JSON file
+    
+    Each synced file is stored as ``[local size, local mtime, remote size,
+    remote mtime]``, which is what makes the next plan three-way: a side
+    that still matches the snapshot did not change, so the other side's
+    change wins without comparing contents.
+    """
+    
+    DIRECTORY_NAME = "sync"
+    
+    def __init__(self, key: str, snapshot_dir: str = None):
+        """Initialize sync snapshot
+        
+        Args:
+            key: Identifier of the host and folder pair
+            snapshot_dir: Directory holding snapshots (optional, defaults to
+                the config directory)
+        """
+        if snapshot_dir is None:
+            from utils.config import ConfigManager
+            snapshot_dir = ConfigManager().config_dir / self.DIRECTORY_NAME
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        self.path = Path(snapshot_dir) / f"{digest}.json"
+        self.key = key
+        
+    def load(self) -> Dict[str, list]:
+        """Load the files of the last sync
+        
+        Returns:
+            Dictionary of relative path to [local size, local mtime,
+            remote size, remote mtime]; empty before the first sync
+        """
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Failed to load sync snapshot from {self.path}: {e}")
+            return {}
+        return data.get("files", {}) if data.get("key") == self.key else {}
+        
+    def save(self, files: Dict[str, list]):
+        """Replace the stored files
+        
+        Args:
+            files: Dictionary as returned by load()
+        """
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.path.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({"key": self.key, "saved": time.time(), "files": files}, f,
+                          separators=(',', ':'))
+            temp_file.replace(self.path)
+        except Exception as e:
+            print(f"Failed to save sync snapshot to {self.path}: {e}")
+
+
+class SyncEngine:
+    """Plans and runs a two-way sync between a local and a remote folder
+    
+    Both trees are scanned for size and modification time only. The
+    remote tree comes from one streamed ``find -printf`` when the server
+    supports it, otherwise from directory listings on several channels.
+    Each file is compared with the snapshot of the previous sync, so a
+    tree that barely changed is planned from metadata alone.
+    
+    Every plan scans both trees in full. The snapshot cannot narrow the
+    scan: a directory's mtime changes when entries are added or removed,
+    but not when a file in it is rewritten in place, so skipping
+    directories by mtime would miss edits. Finding deletions needs every
+    listing anyway.
+    
+    Files changed on both sides, or changed on one and deleted on the
+    other, become conflicts that must be resolved before they are synced.
+    
+    Only regular files are synced; directories are created as needed and
+    empty directories are left alone. Symbolic links are skipped on both
+    sides.
+    """
+    
+    FIND_FORMAT = r"%s %T@ %P\0"
+    
+    def __init__(self, file_manager, workers: int = None, snapshot_dir: str = None):
+        """Initialize sync engine
+        
+        Args:
+            file_manager: File manager instance
+            workers: Number of files transferred at once (optional,
+                defaults to the file manager's parallel channels)
+            snapshot_dir: Directory holding snapshots (optional)
+        """
+        self.file_manager = file_manager
+        self.ssh_manager = file_manager.ssh_manager
+        self.workers = max(1, workers or file_manager.parallel_channels)
+        self.snapshot_dir = snapshot_dir
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        
+    def _snapshot(self, local_folder: str, remote_folder: str) -> SyncSnapshot:
+        """Snapshot of a folder pair on this connection"""
+        host_id = f"{self.ssh_manager.username}@{self.ssh_manager.host}:{self.ssh_manager.port}"
+        key = f"{host_id}|{os.path.abspath(local_folder)}|{remote_folder}"
+        return SyncSnapshot(key, self.snapshot_dir)
+        
+    def cancel(self):
+        """Stop the running scan or sync"""
+        self._cancelled.set()
+        
+    def _check_cancelled(self):
+        """Raise if cancel() was called"""
+        if self._cancelled.is_set():
+            raise TransferCancelled("Sync cancelled")
+            
+    def scan_local(self, local_folder: str, missing_ok: bool = False,
+                   unreadable: Optional[set] = None) -> Dict[str, FileState]:
+        """Collect size and mtime of every local file
+        
+        Args:
+            local_folder: Local folder path
+            missing_ok: Treat a missing folder as empty
+            unreadable: Receives the relative paths of subdirectories that
+                could not be read (optional)
+            
+        Returns:
+            Dictionary of relative POSIX path to (size, mtime)
+            
+        Raises:
+            OSError: If the folder cannot be read
+        """
+        if missing_ok and not os.path.lexists(local_folder):
+            return {}
+        files: Dict[str, FileState] = {}
+        pending = [("", local_folder)]
+        while pending:
+            self._check_cancelled()
+            relative_dir, local_dir = pending.pop()
+            try:
+                entries = list(os.scandir(local_dir))
+            except OSError:
+                if not relative_dir:
+                    raise
+                if unreadable is not None:
+                    unreadable.add(relative_dir)
+                continue
+            for entry in entries:
+                relative_path = posixpath.join(relative_dir, entry.name) if relative_dir else entry.name
+                try:
+                    # Links are skipped, as find does on the server; following
+                    # them could loop or pull in trees outside the folder
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((relative_path, entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        entry_stat = entry.stat()
+                        files[relative_path] = (entry_stat.st_size, int(entry_stat.st_mtime))
+                except OSError:
+                    continue
+        return files
+        
+    def scan_remote(self, remote_folder: str, missing_ok: bool = False,
+                    unreadable: Optional[set] = None) -> Dict[str, FileState]:
+        """Collect size and mtime of every remote file
+        
+        Args:
+            remote_folder: Absolute remote folder path
+            missing_ok: Treat a missing folder as empty
+            unreadable: Receives the relative paths of subdirectories that
+                could not be read, or "" if find did not say which (optional)
+            
+        Returns:
+            Dictionary of relative POSIX path to (size, mtime)
+            
+        Raises:
+            FileNotFoundError: If the folder does not exist and not missing_ok
+        """
+        try:
+            folder_stat = self.ssh_manager.safe_operation(lambda sftp: sftp.stat(remote_folder))
+        except FileNotFoundError:
+            if missing_ok:
+                return {}
+            raise FileNotFoundError(f"Remote folder {remote_folder} does not exist")
+        if not stat.S_ISDIR(folder_stat.st_mode or 0):
+            raise IOError(f"{remote_folder} is not a directory")
+            
+        files = self._find_remote(remote_folder, unreadable)
+        if files is None:
+            files = self._list_remote(remote_folder)
+        return files
+        
+    def _find_remote(self, remote_folder: str,
+                     unreadable: Optional[set] = None) -> Optional[Dict[str, FileState]]:
+        """Read the remote tree from one streamed find command
+        
+        Returns:
+            Files as for scan_remote(), or None if find lacks -printf
+        """
+        command = (
+            f"find {shlex.quote(remote_folder)} -mindepth 1 -type f "
+            f"-printf {shlex.quote(self.FIND_FORMAT)}"
+        )
+        files: Dict[str, FileState] = {}
+        stream = self.ssh_manager.open_command(
+            command, cancel_event=self._cancelled,
+            window_size=self.ssh_manager.TRANSFER_WINDOW_SIZE
+        )
+        try:
+            buffer = b""
+            for name, data in stream.raw_chunks():
+                if name != stream.STDOUT:
+                    continue
+                records = (buffer + data).split(b"\0")
+                buffer = records.pop()
+                for record in records:
+                    size, mtime, path = record.decode('utf-8', errors='surrogateescape').split(" ", 2)
+                    files[path] = (int(size), int(float(mtime)))
+            self._check_cancelled()
+            exit_code = stream.exit_status
+        except ValueError:
+            # Output was not in the requested format, e.g. a find without -printf
+            return None
+        finally:
+            stream.close()
+        if exit_code != 0 and not files:
+            return None
+        if exit_code != 0 and unreadable is not None:
+            unreadable.add("")
+        return files
+        
+    def _list_remote(self, remote_folder: str) -> Dict[str, FileState]:
+        """Read the remote tree by listing directories on several channels"""
+        files: Dict[str, FileState] = {}
+        pending = [""]
+        active = 0
+        errors: List[BaseException] = []
+        condition = threading.Condition()
+        
+        def _worker():
+            nonlocal active
+            while True:
+                with condition:
+                    while not pending and active and not errors and not self._cancelled.is_set():
+                        condition.wait(0.1)
+                    if not pending or errors or self._cancelled.is_set():
+                        condition.notify_all()
+                        return
+                    relative_dir = pending.pop()
+                    active += 1
+                remote_dir = posixpath.join(remote_folder, relative_dir) if relative_dir else remote_folder
+                try:
+                    entries = self.ssh_manager.safe_operation(lambda sftp: sftp.listdir_attr(remote_dir))
+                except BaseException as e:
+                    entries = []
+                    errors.append(e)
+                with condition:
+                    for entry in entries:
+                        relative_path = posixpath.join(relative_dir, entry.filename) if relative_dir else entry.filename
+                        mode = entry.st_mode or 0
+                        if stat.S_ISDIR(mode):
+                            pending.append(relative_path)
+                        elif stat.S_ISREG(mode):
+                            files[relative_path] = (entry.st_size or 0, int(entry.st_mtime or 0))
+                    active -= 1
+                    condition.notify_all()
+                    
+        workers = [threading.Thread(target=_worker, daemon=True) for _ in range(self.workers)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self._check_cancelled()
+        if errors:
+            raise errors[0]
+        return files
+        
+    @staticmethod
+    def _compare(path: str, local: Optional[FileState], remote: Optional[FileState],
+                 base: Optional[list]) -> Optional[SyncEntry]:
+        """Decide the action for one file
+        
+        Returns:
+            Planned entry, or None if the file is in sync
+        """
+        local_changed = local is not None and (base is None or tuple(base[:2]) != local)
+        remote_changed = remote is not None and (base is None or tuple(base[2:]) != remote)
+        
+        if local is not None and remote is not None:
+            if local == remote:
+                return None
+            if local_changed and remote_changed:
+                return SyncEntry(path, SyncAction.CONFLICT, local, remote, "Changed on both sides")
+            if local_changed:
+                return SyncEntry(path, SyncAction.UPLOAD, local, remote, "Changed locally")
+            if remote_changed:
+                return SyncEntry(path, SyncAction.DOWNLOAD, local, remote, "Changed on server")
+            return None
+            
+        if local is not None:
+            if base is None:
+                return SyncEntry(path, SyncAction.UPLOAD, local, None, "New local file")
+            if local_changed:
+                return SyncEntry(path, SyncAction.CONFLICT, local, None, "Changed locally, deleted on server")
+            return SyncEntry(path, SyncAction.DELETE_LOCAL, local, None, "Deleted on server")
+            
+        if remote is not None:
+            if base is None:
+                return SyncEntry(path, SyncAction.DOWNLOAD, None, remote, "New file on server")
+            if remote_changed:
+                return SyncEntry(path, SyncAction.CONFLICT, None, remote, "Changed on server, deleted locally")
+            return SyncEntry(path, SyncAction.DELETE_REMOTE, None, remote, "Deleted locally")
+        return None
+        
+    @staticmethod
+    def _inside(path: str, directories: set) -> bool:
+        """Check whether a relative path lies in one of the directories"""
+        return any(not directory or path.startswith(directory + "/") for directory in directories)
+        
+    def plan(self, local_folder: str, remote_folder: str) -> SyncPlan:
+        """Compare a local and a remote folder against their last sync
+        
+        A folder that is missing or unreadable fails the plan once the pair
+        has been synced, since every file in it would otherwise look
+        deleted; only a first sync may create it. Files inside unreadable
+        subdirectories are left out of the plan for the same reason.
+        
+        Args:
+            local_folder: Local folder path
+            remote_folder: Absolute remote folder path
+            
+        Returns:
+            Sync plan; nothing is changed until it is executed
+            
+        Raises:
+            TransferCancelled: If cancel() was called
+            OSError: If a synced folder is missing or cannot be read
+        """
+        self._cancelled.clear()
+        started = time.monotonic()
+        base = self._snapshot(local_folder, remote_folder).load()
+        first_sync = not base
+        
+        # The local walk overlaps with the remote scan
+        local_files: Dict[str, FileState] = {}
+        local_unreadable: set = set()
+        remote_unreadable: set = set()
+        local_errors: List[BaseException] = []
+        
+        def _scan_local():
+            try:
+                local_files.update(self.scan_local(local_folder, first_sync, local_unreadable))
+            except BaseException as e:
+                local_errors.append(e)
+                
+        local_thread = threading.Thread(target=_scan_local, daemon=True)
+        local_thread.start()
+        try:
+            remote_files = self.scan_remote(remote_folder, first_sync, remote_unreadable)
+        finally:
+            local_thread.join()
+        if local_errors:
+            raise local_errors[0]
+            
+        plan = SyncPlan(local_folder, remote_folder, base=base)
+        for path in sorted(local_files.keys() | remote_files.keys() | base.keys()):
+            if (path not in local_files and self._inside(path, local_unreadable)) or \
+                    (path not in remote_files and self._inside(path, remote_unreadable)):
+                # The side without the file could not be read there
+                continue
+            entry = self._compare(path, local_files.get(path), remote_files.get(path), base.get(path))
+            if entry is not None:
+                plan.entries.append(entry)
+            elif path in local_files:
+                # Identical on both sides; remember the states in case they
+                # were never synced or both changed the same way
+                plan.unchanged += 1
+                base[path] = list(local_files[path]) + list(remote_files[path])
+            else:
+                base.pop(path, None)
+        plan.scan_seconds = time.monotonic() - started
+        return plan
+        
+    def _ensure_remote_dirs(self, sftp, remote_dir: str, created: set):
+        """Create a remote directory and its missing parents"""
+        missing = []
+        while remote_dir not in created and remote_dir not in ("", "/"):
+            try:
+                sftp.stat(remote_dir)
+                break
+            except FileNotFoundError:
+                missing.append(remote_dir)
+                remote_dir = posixpath.dirname(remote_dir)
+        for path in reversed(missing):
+            try:
+                sftp.mkdir(path)
+            except IOError:
+                # Another worker created it first
+                pass
+        with self._lock:
+            created.update(missing)
+            
+    def execute(self, plan: SyncPlan,
+                progress_callback: Optional[Callable[[int, int, int, int], bool]] = None) -> List[SyncEntry]:
+        """Carry out a sync plan on parallel transfer channels
+        
+        Conflicts and skipped entries are left alone. The snapshot is
+        updated for every file that was synced, so an interrupted sync
+        continues where it stopped the next time it is planned.
+        
+        Args:
+            plan: Plan returned by plan()
+            progress_callback: Called with (bytes, total bytes, entries,
+                total entries); returning False cancels the sync
+                
+        Returns:
+            Entries that failed, with their error set
+            
+        Raises:
+            TransferCancelled: If the sync was cancelled
+        """
+        self._cancelled.clear()
+        base = plan.base
+        snapshot = self._snapshot(plan.local_folder, plan.remote_folder)
+        work = [
+            entry for entry in plan.entries
+            if entry.action not in (SyncAction.CONFLICT, SyncAction.SKIP) and not entry.done
+        ]
+        total_bytes = sum(entry.size for entry in work)
+        pending = list(reversed(work))
+        created_dirs: set = set()
+        
+        # Create the directories uploads go to in a few pipelined batches;
+        # workers create any that failed here one by one
+        upload_dirs = {
+            posixpath.normpath(posixpath.dirname(posixpath.join(plan.remote_folder, entry.path)))
+            for entry in work if entry.action == SyncAction.UPLOAD
+        }
+        if upload_dirs:
+            try:
+                failed = self.ssh_manager.safe_operation(
+                    lambda sftp: SFTPPipeline(sftp).makedirs(upload_dirs)
+                )
+                created_dirs.update(upload_dirs - {result.path for result in failed})
+            except Exception as e:
+                print(f"Failed to create directories in {plan.remote_folder}: {e}")
+                
+        transferred = 0
+        done_entries = 0
+        
+        def _add_progress(count: int, entries: int = 0):
+            nonlocal transferred, done_entries
+            with self._lock:
+                transferred += count
+                done_entries += entries
+                
+        def _run(sftp, entry: SyncEntry):
+            local_path = os.path.join(plan.local_folder, *entry.path.split('/'))
+            remote_path = posixpath.join(plan.remote_folder, entry.path)
+            copied = 0
+            
+            def _file_progress(count, _total):
+                nonlocal copied
+                self._check_cancelled()
+                _add_progress(count - copied)
+                copied = count
+                
+            try:
+                if entry.action == SyncAction.UPLOAD:
+                    self._ensure_remote_dirs(sftp, posixpath.dirname(remote_path), created_dirs)
+                    local_stat = os.stat(local_path)
+                    sftp.put(local_path, remote_path, callback=_file_progress)
+                    sftp.utime(remote_path, (local_stat.st_atime, local_stat.st_mtime))
+                    state = [local_stat.st_size, int(local_stat.st_mtime)]
+                    new_base = state + state
+                elif entry.action == SyncAction.DOWNLOAD:
+                    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                    remote_stat = sftp.stat(remote_path)
+                    sftp.get(remote_path, local_path, callback=_file_progress)
+                    os.utime(local_path, (remote_stat.st_mtime, remote_stat.st_mtime))
+                    state = [remote_stat.st_size, int(remote_stat.st_mtime)]
+                    new_base = state + state
+                elif entry.action == SyncAction.DELETE_REMOTE:
+                    sftp.remove(remote_path)
+                    new_base = None
+                else:
+                    os.remove(local_path)
+                    new_base = None
+            except BaseException:
+                # The file is retried from its start, so forget its progress
+                _add_progress(-copied)
+                raise
+            _add_progress(entry.size - copied, 1)
+            if entry.action in (SyncAction.UPLOAD, SyncAction.DELETE_REMOTE):
+                self.file_manager._remote_changed(remote_path)
+            with self._lock:
+                if new_base is None:
+                    base.pop(entry.path, None)
+                else:
+                    base[entry.path] = new_base
+                    
+        def _worker():
+            while not self._cancelled.is_set():
+                with self._lock:
+                    if not pending:
+                        return
+                    entry = pending.pop()
+                try:
+                    self.ssh_manager.safe_operation(_run, entry, transfer=True)
+                    entry.done = True
+                    entry.error = ""
+                except TransferCancelled:
+                    return
+                except Exception as e:
+                    entry.error = str(e)
+                    _add_progress(0, 1)
+                    
+        workers = [
+            threading.Thread(target=_worker, daemon=True)
+            for _ in range(min(self.workers, len(pending)))
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(0.1)
+                    if progress_callback and not self._cancelled.is_set():
+                        if progress_callback(transferred, total_bytes, done_entries, len(work)) is False:
+                            self.cancel()
+        finally:
+            snapshot.save(base)
+            
+        if self._cancelled.is_set():
+            raise TransferCancelled("Sync cancelled")
+        if progress_callback:
+            progress_callback(total_bytes, total_bytes, len(work), len(work))
+        return [entry for entry in work if entry.error]
@@ -0,0 +1,298 @@
+"""Folder transfers streamed through tar over an SSH exec channel"""
+import os
+import posixpath
+import shlex
+import tarfile
+import time
+from typing import Callable, List, Optional, Tuple
+
+from core.errors import TransferCancelled
+
+
+class _ChannelWriter:
+    """File-like object writing a tar stream to an exec channel"""
+    
+    def __init__(self, channel):
+        """Initialize channel writer
+        
+        Args:
+            channel: Channel running the remote tar command
+        """
+        self.channel = channel
+        
+    def write(self, data: bytes) -> int:
+        """Send data, blocking while the channel window is full"""
+        self.channel.sendall(data)
+        return len(data)
+
+
+class _ProgressReader:
+    """File-like object counting bytes read from a local file"""
+    
+    def __init__(self, file, on_read: Callable[[int], None]):
+        """Initialize progress reader
+        
+        Args:
+            file: Local file opened for reading
+            on_read: Called with the number of bytes of each read
+        """
+        self.file = file
+        self.on_read = on_read
+        
+    def read(self, size: int = -1) -> bytes:
+        """Read from the file and report the byte count"""
+        data = self.file.read(size)
+        self.on_read(len(data))
+        return data
+
+
+class TarStreamUpload:
+    """Uploads a folder as one tar stream piped into ``tar -x`` on the server
+    
+    The local tree is packed on the fly while it is sent, so a folder of
+    many small files costs one channel instead of a stat, mkdir or put
+    round trip per entry. Progress is reported by bytes and by entries.
+    """
+    
+    PROGRESS_INTERVAL = 0.1  # seconds between progress callbacks
+    
+    def __init__(self, ssh_manager):
+        """Initialize tar stream upload
+        
+        Args:
+            ssh_manager: SSH manager instance
+        """
+        self.ssh_manager = ssh_manager
+        
+    def remote_tar_available(self) -> bool:
+        """Check whether the server can extract a tar stream
+        
+        Returns:
+            True if a tar command exists on the server
+        """
+        try:
+            stdout, _, exit_code = self.ssh_manager.execute_command("command -v tar")
+        except Exception:
+            return False
+        return exit_code == 0 and bool(stdout.strip())
+        
+    @staticmethod
+    def scan(local_folder: str) -> Tuple[List[Tuple[str, str]], int]:
+        """Collect the entries of a local folder in one walk
+        
+        Args:
+            local_folder: Local folder path
+            
+        Returns:
+            Tuple of ([(local path, relative POSIX path)], total file bytes)
+        """
+        entries = [(local_folder, "")]
+        total_bytes = 0
+        for root, dirs, files in os.walk(local_folder, followlinks=True):
+            dirs.sort()
+            relative_root = os.path.relpath(root, local_folder).replace(os.sep, '/')
+            if relative_root == '.':
+                relative_root = ""
+            for name in dirs:
+                entries.append((os.path.join(root, name), posixpath.join(relative_root, name)))
+            for name in sorted(files):
+                local_path = os.path.join(root, name)
+                try:
+                    total_bytes += os.path.getsize(local_path)
+                except OSError:
+                    continue
+                entries.append((local_path, posixpath.join(relative_root, name)))
+        return entries, total_bytes
+        
+    def upload(self, local_folder: str, remote_folder: str,
+               progress_callback: Optional[Callable[[int, int, int, int], bool]] = None,
+               entries: Optional[List[Tuple[str, str]]] = None):
+        """Upload a local folder to a remote folder path
+        
+        Args:
+            local_folder: Local folder path
+            remote_folder: Absolute remote path the folder is created as
+            progress_callback: Called with (bytes, total bytes, entries,
+                total entries); returning False cancels the upload
+            entries: Only send these (local path, relative POSIX path)
+                entries instead of the whole folder (optional)
+                
+        Raises:
+            TransferCancelled: If the progress callback cancelled the upload
+            IOError: If the remote tar command failed
+        """
+        if entries is None:
+            entries, total_bytes = self.scan(local_folder)
+        else:
+            total_bytes = sum(os.path.getsize(path) for path, _ in entries if os.path.isfile(path))
+        parent = posixpath.dirname(remote_folder) or "."
+        name = posixpath.basename(remote_folder)
+        command = f"mkdir -p {shlex.quote(parent)} && tar -xf - -C {shlex.quote(parent)}"
+        
+        transport = self.ssh_manager.ssh_client.get_transport()
+        channel = transport.open_session(window_size=self.ssh_manager.TRANSFER_WINDOW_SIZE)
+        sent_bytes = 0
+        done_entries = 0
+        last_report = 0.0
+        
+        def _report(force: bool = False):
+            nonlocal last_report
+            now = time.monotonic()
+            if not progress_callback or (not force and now - last_report < self.PROGRESS_INTERVAL):
+                return
+            last_report = now
+            if progress_callback(sent_bytes, total_bytes, done_entries, len(entries)) is False:
+                raise TransferCancelled("Upload cancelled")
+                
+        def _on_read(count: int):
+            nonlocal sent_bytes
+            sent_bytes += count
+            _report()
+            
+        try:
+            channel.exec_command(command)
+            try:
+                with tarfile.open(fileobj=_ChannelWriter(channel), mode='w|', dereference=True) as tar:
+                    for local_path, relative_path in entries:
+                        arcname = posixpath.join(name, relative_path) if relative_path else name
+                        try:
+                            tarinfo = tar.gettarinfo(local_path, arcname)
+                            local_file = open(local_path, 'rb') if tarinfo.isfile() else None
+                        except OSError as e:
+                            print(f"Failed to pack {local_path}: {e}")
+                            continue
+                        tarinfo.uid = tarinfo.gid = 0
+                        tarinfo.uname = tarinfo.gname = ""
+                        if local_file is None:
+                            tar.addfile(tarinfo)
+                        else:
+                            with local_file:
+                                tar.addfile(tarinfo, _ProgressReader(local_file, _on_read))
+                        done_entries += 1
+                        _report()
+                channel.shutdown_write()
+            except (OSError, EOFError):
+                if not channel.exit_status_ready():
+                    raise
+                # The remote command exited early; its status explains why
+                
+            exit_code= channel.recv_exit_status()
+            if exit_code != 0:
+                error = channel.makefile_stderr('rb').read().decode('utf-8', errors='replace')
+                raise IOError(f"Remote tar failed with exit code {exit_code}: {error.strip()}")
+            _report(force=True)
+        finally:
+            channel.close()
+
+
+class TarStreamDownload:
+    """Downloads a folder as one ``tar -c`` stream extracted locally as it arrives
+    
+    The remote tree is packed by the server, so no per-entry listing or
+    open round trips are needed. The total size is not known in advance;
+    progress reports a total of 0 until the stream ends. Only directories
+    and regular files are extracted, and entries that would land outside
+    the target folder are refused.
+    """
+    
+    PROGRESS_INTERVAL = 0.1  # seconds between progress callbacks
+    CHUNK_SIZE = 256 * 1024
+    
+    def __init__(self, ssh_manager):
+        """Initialize tar stream download
+        
+        Args:
+            ssh_manager: SSH manager instance
+        """
+        self.ssh_manager = ssh_manager
+        
+    @staticmethod
+    def _relative_parts(member_name: str, name: str) -> Optional[List[str]]:
+        """Map an archive member to path parts below the target folder
+        
+        Returns:
+            List of path components (empty for the folder itself), or None
+            if the member is outside the downloaded folder
+        """
+        if member_name.startswith('/'):
+            return None
+        parts = [part for part in member_name.split('/') if part not in ('', '.')]
+        if not parts or parts[0] != name or '..' in parts:
+            return None
+        return parts[1:]
+        
+    def download(self, remote_folder: str, local_folder: str,
+                 progress_callback: Optional[Callable[[int, int, int, int], bool]] = None):
+        """Download a remote folder into a local folder path
+        
+        Args:
+            remote_folder: Absolute remote folder path
+            local_folder: Local path the folder is created as
+            progress_callback: Called with (bytes, total bytes, entries,
+                total entries); totals are 0 until the download finished.
+                Returning False cancels the download
+                
+        Raises:
+            TransferCancelled: If the progress callback cancelled the download
+            IOError: If the remote tar command failed
+        """
+        parent = posixpath.dirname(remote_folder) or "."
+        name = posixpath.basename(remote_folder.rstrip('/'))
+        command = f"tar -cf - -C {shlex.quote(parent)} {shlex.quote(name)}"
+        
+        transport = self.ssh_manager.ssh_client.get_transport()
+        channel = transport.open_session(window_size=self.ssh_manager.TRANSFER_WINDOW_SIZE)
+        received_bytes = 0
+        done_entries = 0
+        last_report = 0.0
+        
+        def _report(total_bytes: int = 0, total_entries: int = 0, force: bool = False):
+            nonlocal last_report
+            now = time.monotonic()
+            if not progress_callback or (not force and now - last_report < self.PROGRESS_INTERVAL):
+                return
+            last_report = now
+            if progress_callback(received_bytes, total_bytes, done_entries, total_entries) is False:
+                raise TransferCancelled("Download cancelled")
+                
+        try:
+            channel.exec_command(command)
+            try:
+                with tarfile.open(fileobj=channel.makefile('rb'), mode='r|') as tar:
+                    for member in tar:
+                        parts = self._relative_parts(member.name, name)
+                        if parts is None:
+                            print(f"Skipping {member.name}: outside of {name}")
+                            continue
+                        target = os.path.join(local_folder, *parts)
+                        if member.isdir():
+                            os.makedirs(target, exist_ok=True)
+                        elif member.isfile():
+                            os.makedirs(os.path.dirname(target), exist_ok=True)
+                            source = tar.extractfile(member)
+                            with open(target, 'wb') as local_file:
+                                while True:
+                                    data = source.read(self.CHUNK_SIZE)
+                                    if not data:
+                                        break
+                                    local_file.write(data)
+                                    received_bytes += len(data)
+                                    _report()
+                            os.utime(target, (member.mtime, member.mtime))
+                        else:
+                            print(f"Skipping {member.name}: not a regular file")
+                            continue
+                        done_entries += 1
+                        _report()
+            except tarfile.ReadError:
+                if channel.recv_exit_status() == 0:
+                    raise
+                # The remote command failed before sending an archive
+                
+            exit_code = channel.recv_exit_status()
+            if exit_code != 0:
+                error = channel.makefile_stderr('rb').read().decode('utf-8', errors='replace')
+                raise IOError(f"Remote tar failed with exit code {exit_code}: {error.strip()}")
+            _report(received_bytes, done_entries, force=True)
+        finally:
+            channel.close()
@@ -0,0 +1,403 @@
+"""Background transfer queue"""
+import itertools
+import os
+import posixpath
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from core.errors import TransferCancelled
+from core.events import Event
+
+
+class TransferStatus:
+    """Transfer item states"""
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    PAUSED = "Paused"
+    DONE = "Done"
+    FAILED = "Failed"
+    CANCELLED = "Cancelled"
+
+
+@dataclass
+class TransferItem:
+    """A single queued upload or download"""
+    id: int
+    direction: str  # "upload" or "download"
+    local_path: str
+    remote_path: str
+    size: int = 0
+    transferred: int = 0
+    status: str = TransferStatus.QUEUED
+    error: str = ""
+    rate: float = 0.0  # bytes per second
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    is_folder: bool = False  # downloads a whole directory tree
+    resumed: bool = False  # continues an interrupted transfer
+    _control: Optional[str] = field(default=None, repr=False)  # "pause" or "cancel"
+    _last_sample: tuple = field(default=(0.0, 0), repr=False)
+    
+    @property
+    def name(self) -> str:
+        """File name shown for the item"""
+        if self.direction == "upload":
+            return os.path.basename(self.local_path)
+        return posixpath.basename(self.remote_path)
+        
+    @property
+    def is_active(self) -> bool:
+        """Whether the item is still queued or running"""
+        return self.status in (TransferStatus.QUEUED, TransferStatus.RUNNING)
+
+
+class TransferWorker(threading.Thread):
+    """Worker thread that runs queued transfers one at a time"""
+    
+    def __init__(self, queue: "TransferQueue"):
+        """Initialize transfer worker
+        
+        Args:
+            queue: Queue to take items from
+        """
+        super().__init__(daemon=True)
+        self.queue = queue
+        
+    def run(self):
+        """Process items until the queue shrinks or shuts down"""
+        while True:
+            item = self.queue._next_item(self)
+            if item is None:
+                return
+            self.queue._run_item(item)
+
+
+class TransferQueue:
+    """Runs uploads and downloads on worker threads
+    
+    Items are processed by up to ``concurrency`` workers. Progress is
+    reported through events, emitted from the worker threads, so the GUI
+    thread never blocks on a transfer. Pausing stops a transfer and keeps
+    its partial data; resuming re-queues it as a resumable transfer.
+    """
+    
+    UPDATE_INTERVAL = 0.25  # seconds between progress events per item
+    
+    def __init__(self, file_manager, concurrency: int = 3):
+        """Initialize transfer queue
+        
+        Args:
+            file_manager: File manager used to perform transfers
+            concurrency: Number of transfers running at once
+        """
+        self.item_added = Event()  # TransferItem
+        self.item_updated = Event()  # TransferItem
+        self.throughput_updated = Event()  # bytes per second, running items
+        self.file_manager = file_manager
+        self.concurrency = max(1, concurrency)
+        self.items: Dict[int, TransferItem] = {}
+        self._pending: Deque[TransferItem] = deque()
+        self._workers: List[TransferWorker] = []
+        self._retired: List[TransferWorker] = []  # kept alive until their thread exits
+        self._condition = threading.Condition()
+        self._ids = itertools.count(1)
+        self._shutdown = False
+        self._stats_lock = threading.Lock()
+        self.total_transferred = 0
+        self.rate = 0.0
+        self._rate_sample = (time.monotonic(), 0)
+        
+    def add_upload(self, local_path: str, remote_path: str) -> TransferItem:
+        """Queue a file upload
+        
+        Args:
+            local_path: Local file path
+            remote_path: Absolute remote destination path
+            
+        Returns:
+            Queued transfer item
+        """
+        size = os.path.getsize(local_path) if os.path.exists(local_path) else 0
+        return self._add(TransferItem(next(self._ids), "upload", local_path, remote_path, size))
+        
+    def add_download(self, remote_path: str, local_path: str, size: int = 0) -> TransferItem:
+        """Queue a file download
+        
+        Args:
+            remote_path: Absolute remote file path
+            local_path: Local destination path
+            size: Remote file size if known
+            
+        Returns:
+            Queued transfer item
+        """
+        return self._add(TransferItem(next(self._ids), "download", local_path, remote_path, size))
+        
+    def add_folder_download(self, remote_path: str, local_path: str) -> TransferItem:
+        """Queue a recursive folder download
+        
+        Args:
+            remote_path: Absolute remote folder path
+            local_path: Local path the folder is created as
+            
+        Returns:
+            Queued transfer item
+        """
+        return self._add(TransferItem(next(self._ids), "download", local_path, remote_path, is_folder=True))
+        
+    def restore_pending(self) -> List[TransferItem]:
+        """Add interrupted transfers of this connection as paused items
+        
+        Returns:
+            Restored transfer items
+        """
+        ssh_manager = self.file_manager.ssh_manager
+        host_id = f"{ssh_manager.username}@{ssh_manager.host}:{ssh_manager.port}"
+        restored = []
+        for state in self.file_manager.state_store.pending().values():
+            if state.get("host") != host_id:
+                continue
+            item = TransferItem(
+                next(self._ids), state["direction"], state["local_path"],
+                state["remote_path"], state.get("size", 0),
+                status=TransferStatus.PAUSED
+            )
+            self.items[item.id] = item
+            self.item_added.emit(item)
+            restored.append(item)
+        return restored
+        
+    def _add(self, item: TransferItem) -> TransferItem:
+        """Register an item and wake a worker"""
+        self.items[item.id] = item
+        self.item_added.emit(item)
+        self._enqueue(item)
+        return item
+        
+    def _enqueue(self, item: TransferItem):
+        """Put an item on the pending queue and make sure workers exist"""
+        with self._condition:
+            item.status = TransferStatus.QUEUED
+            item._control = None
+            self._pending.append(item)
+            self._condition.notify()
+            self._start_workers()
+        self.item_updated.emit(item)
+        
+    def _start_workers(self):
+        """Start workers up to the concurrency limit (caller holds the lock)"""
+        self._retired = [worker for worker in self._retired if worker.is_alive()]
+        missing = min(self.concurrency, len(self._pending)) - len(self._workers)
+        for _ in range(max(0, missing)):
+            worker = TransferWorker(self)
+            self._workers.append(worker)
+            worker.start()
+            
+    def _next_item(self, worker: TransferWorker) -> Optional[TransferItem]:
+        """Hand the next pending item to a worker, or None to stop it"""
+        with self._condition:
+            while not self._shutdown:
+                if len(self._workers) > self.concurrency:
+                    break
+                if self._pending:
+                    return self._pending.popleft()
+                if not self._condition.wait(5.0) and not self._pending:
+                    break
+            self._workers.remove(worker)
+            self._retired.append(worker)
+            return None
+            
+    def _run_item(self, item: TransferItem):
+        """Perform one transfer on the calling worker thread"""
+        if item._control is not None:
+            self._finish_controlled(item)
+            return
+            
+        item.status = TransferStatus.RUNNING
+        item.error = ""
+        item.started_at = time.monotonic()
+        item._last_sample = (item.started_at, item.transferred)
+        self.item_updated.emit(item)
+        last_emit = 0.0
+        
+        def _progress(transferred, total):
+            nonlocal last_emit
+            self._count_bytes(transferred - item.transferred)
+            item.transferred = transferred
+            item.size = total or item.size
+            now = time.monotonic()
+            sample_time, sample_bytes = item._last_sample
+            if now - sample_time >= 1.0:
+                rate = (transferred - sample_bytes) / (now - sample_time)
+                item.rate = rate if item.rate == 0 else 0.7 * item.rate + 0.3 * rate
+                item._last_sample = (now, transferred)
+            if now - last_emit >= self.UPDATE_INTERVAL:
+                last_emit = now
+                self.item_updated.emit(item)
+                self._emit_throughput()
+            return item._control is None
+            
+        # Only a transfer that continues from partial data gives up
+        # compression; a fresh one just keeps its progress for a pause
+        try:
+            if item.direction == "upload":
+                self.file_manager.upload_file(
+                    item.local_path, item.remote_path, _progress,
+                    resume=item.resumed, resumable=True
+                )
+            elif item.is_folder:
+                self.file_manager.download_folder(
+                    item.remote_path, item.local_path,
+                    lambda transferred, total, entries, total_entries: _progress(transferred, total)
+                )
+            else:
+                self.file_manager.download_file(
+                    item.remote_path, item.local_path, _progress,
+                    resume=item.resumed, resumable=True
+                )
+        except TransferCancelled:
+            self._finish_controlled(item)
+            return
+        except Exception as e:
+            item.status = TransferStatus.FAILED
+            item.error = str(e)
+        else:
+            item.status = TransferStatus.DONE
+            self._count_bytes(item.size - item.transferred)
+            item.transferred = item.size
+        item.rate = 0.0
+        item.finished_at = time.monotonic()
+        self.item_updated.emit(item)
+        self._emit_throughput()
+        
+    def _finish_controlled(self, item: TransferItem):
+        """Mark an item stopped by pause() or cancel()"""
+        item.status = TransferStatus.PAUSED if item._control == "pause" else TransferStatus.CANCELLED
+        item.rate = 0.0
+        self.item_updated.emit(item)
+        self._emit_throughput()
+        
+    def _count_bytes(self, count: int):
+        """Add to the aggregate transferred byte counter"""
+        with self._stats_lock:
+            self.total_transferred += max(0, count)
+            
+    def _emit_throughput(self):
+        """Emit the aggregate rate over all items, including small files"""
+        with self._stats_lock:
+            now = time.monotonic()
+            sample_time, sample_bytes = self._rate_sample
+            if now - sample_time >= 1.0:
+                rate = (self.total_transferred - sample_bytes) / (now - sample_time)
+                self.rate = 0.7 * self.rate + 0.3 * rate
+                self._rate_sample = (now, self.total_transferred)
+            rate = self.rate
+        running = sum(1 for item in self.items.values() if item.status == TransferStatus.RUNNING)
+        if not running and not self._pending:
+            rate = 0.0
+        self.throughput_updated.emit(rate, running)
+        
+    def pause(self, item: TransferItem):
+        """Stop an item, keeping its partial data for a later resume
+        
+        Args:
+            item: Transfer item
+        """
+        self._stop(item, "pause")
+        
+    def cancel(self, item: TransferItem):
+        """Stop an item for good
+        
+        Args:
+            item: Transfer item
+        """
+        if item.status == TransferStatus.PAUSED:
+            item.status = TransferStatus.CANCELLED
+            self.item_updated.emit(item)
+            return
+        self._stop(item, "cancel")
+        
+    def _stop(self, item: TransferItem, control: str):
+        """Request a running or queued item to stop"""
+        with self._condition:
+            if not item.is_active:
+                return
+            item._control = control
+            if item in self._pending:
+                self._pending.remove(item)
+                queued = True
+            else:
+                queued = False
+        if queued:
+            self._finish_controlled(item)
+            
+    def resume(self, item: TransferItem):
+        """Re-queue a paused or failed item
+        
+        Args:
+            item: Transfer item
+        """
+        if item.status in (TransferStatus.PAUSED, TransferStatus.FAILED):
+            item.resumed = True
+            self._enqueue(item)
+            
+    def pause_all(self):
+        """Pause every active item"""
+        for item in list(self.items.values()):
+            self.pause(item)
+            
+    def resume_all(self):
+        """Resume every paused item"""
+        for item in list(self.items.values()):
+            if item.status == TransferStatus.PAUSED:
+                self.resume(item)
+                
+    def cancel_all(self):
+        """Cancel every active or paused item"""
+        for item in list(self.items.values()):
+            self.cancel(item)
+            
+    def clear_finished(self) -> List[TransferItem]:
+        """Forget items that are done, failed or cancelled
+        
+        Returns:
+            Removed transfer items
+        """
+        finished = [
+            item for item in self.items.values()
+            if item.status in (TransferStatus.DONE, TransferStatus.FAILED, TransferStatus.CANCELLED)
+        ]
+        for item in finished:
+            del self.items[item.id]
+        return finished
+        
+    def set_concurrency(self, concurrency: int):
+        """Change the number of transfers running at once
+        
+        Args:
+            concurrency: Number of worker threads
+        """
+        with self._condition:
+            self.concurrency = max(1, concurrency)
+            self._start_workers()
+            self._condition.notify_all()
+            
+    def shutdown(self, wait: bool = True):
+        """Cancel all transfers and stop the workers
+        
+        Args:
+            wait: Block until the workers have exited
+        """
+        for item in list(self.items.values()):
+            if item.is_active:
+                self.pause(item)
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+            workers = self._workers + self._retired
+        if wait:
+            for worker in workers:
+                worker.join()
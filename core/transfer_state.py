@@ -0,0 +1,138 @@
+"""Persistent state for resumable transfers"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class TransferStateStore:
+    """Keeps progress of resumable transfers in a JSON file
+    
+    Each entry records the source fingerprint (size and mtime) so a resume
+    after an application restart only continues when the source is
+    unchanged. Saves are throttled to keep per-block updates cheap.
+    """
+    
+    FILE_NAME = "transfer_state.json"
+    SAVE_INTERVAL = 1.0  # seconds between throttled saves
+    
+    def __init__(self, state_file: str = None):
+        """Initialize transfer state store
+        
+        Args:
+            state_file: State file path (optional, defaults to the config directory)
+        """
+        if state_file is None:
+            from utils.config import ConfigManager
+            state_file = ConfigManager().config_dir / self.FILE_NAME
+            
+        self.state_file = Path(state_file)
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        self._states: Dict[str, Dict[str, Any]] = self._load()
+        
+    @staticmethod
+    def make_key(direction: str, host: str, remote_path: str, local_path: str) -> str:
+        """Build the key identifying one transfer
+        
+        Args:
+            direction: "upload" or "download"
+            host: Connection identifier (user@host:port)
+            remote_path: Remote file path
+            local_path: Local file path
+            
+        Returns:
+            State key
+        """
+        return f"{direction}|{host}|{remote_path}|{local_path}"
+        
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load transfer states from file"""
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Failed to load transfer state from {self.state_file}: {e}")
+            return {}
+            
+    def _save(self, force: bool = False):
+        """Write transfer states to file (caller holds the lock)"""
+        now = time.monotonic()
+        if not force and now - self._last_save < self.SAVE_INTERVAL:
+            return
+        self._last_save = now
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.state_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._states, f)
+            temp_file.replace(self.state_file)
+        except Exception as e:
+            print(f"Failed to save transfer state to {self.state_file}: {e}")
+            
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the stored state of a transfer
+        
+        Args:
+            key: State key
+            
+        Returns:
+            Copy of the state dictionary, or None if unknown
+        """
+        with self._lock:
+            state = self._states.get(key)
+            return dict(state) if state is not None else None
+            
+    def update(self, key: str, force: bool = False, **fields):
+        """Create or update the state of a transfer
+        
+        Args:
+            key: State key
+            force: Save immediately instead of throttling
+            **fields: State fields to set
+        """
+        with self._lock:
+            state = self._states.setdefault(key, {})
+            state.update(fields)
+            state["updated"] = time.time()
+            self._save(force)
+            
+    def add_range(self, key: str, offset: int):
+        """Mark a byte range of a chunked transfer as completed
+        
+        Args:
+            key: State key
+            offset: Start offset of the completed range
+        """
+        with self._lock:
+            state = self._states.setdefault(key, {})
+            state.setdefault("ranges", []).append(offset)
+            state["updated"] = time.time()
+            self._save()
+            
+    def remove(self, key: str):
+        """Forget a finished transfer
+        
+        Args:
+            key: State key
+        """
+        with self._lock:
+            if self._states.pop(key, None) is not None:
+                self._save(force=True)
+                
+    def flush(self):
+        """Write any throttled changes to disk"""
+        with self._lock:
+            self._save(force=True)
+            
+    def pending(self) -> Dict[str, Dict[str, Any]]:
+        """Get all unfinished transfers
+        
+        Returns:
+            Dictionary of state key to state
+        """
+        with self._lock:
+            return {key: dict(state) for key, state in self._states.items()}
@@ -0,0 +1,413 @@
+"""Integrity checks of transfers against digests computed on the server"""
+import hashlib
+import os
+import posixpath
+import shlex
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import paramiko
+
+from core.errors import TransferVerificationError
+
+
+class StreamingDigest:
+    """Hash of a file fed by a transfer as its data passes by
+    
+    Transfers call ``update`` with the file offset of each piece, from any
+    thread. Pieces ahead of the hashed position, such as the ranges of a
+    parallel transfer, are held back until the gap before them is filled,
+    up to ``MAX_BUFFERED`` bytes. The digest is only usable if it covered
+    the whole file without gaps or overlaps; otherwise, e.g. after a
+    resumed transfer, the verifier hashes the local file instead.
+    """
+    
+    MAX_BUFFERED = 64 * 1024 * 1024
+    
+    def __init__(self, algorithm: str):
+        """Initialize streaming digest
+        
+        Args:
+            algorithm: hashlib algorithm name
+        """
+        self.algorithm = algorithm
+        self._hash = hashlib.new(algorithm)
+        self._pending: Dict[int, bytes] = {}  # offset -> piece ahead of position
+        self._buffered = 0
+        self._lock = threading.Lock()
+        self.position = 0
+        self.in_order = True
+        
+    def update(self, offset: int, data: bytes):
+        """Add a piece of the file
+        
+        Args:
+            offset: File offset of the piece
+            data: Piece contents
+        """
+        with self._lock:
+            if offset == 0 and self.position:
+                # The transfer started over
+                self._hash = hashlib.new(self.algorithm)
+                self._pending.clear()
+                self._buffered = 0
+                self.position = 0
+                self.in_order = True
+            if not self.in_order:
+                return
+            if offset == self.position:
+                self._hash.update(data)
+                self.position += len(data)
+                while self.position in self._pending:
+                    piece = self._pending.pop(self.position)
+                    self._buffered -= len(piece)
+                    self._hash.update(piece)
+                    self.position += len(piece)
+            elif offset > self.position and self._buffered + len(data) <= self.MAX_BUFFERED:
+                self._buffered += len(data) - len(self._pending.get(offset, b""))
+                self._pending[offset] = data
+            else:
+                # Data already hashed came again, or too much is held back
+                self.in_order = False
+                self._pending.clear()
+                self._buffered = 0
+                
+    def hexdigest(self, size: int) -> Optional[str]:
+        """Digest of the whole file, if every byte was seen exactly once
+        
+        Args:
+            size: File size
+            
+        Returns:
+            Hex digest, or None if the digest does not cover the file
+        """
+        with self._lock:
+            if not self.in_order or self.position != size:
+                return None
+            return self._hash.hexdigest()
+
+
+class DigestingFile:
+    """File object that feeds the data read from or written to it to a digest
+    
+    Lets paramiko's ``putfo`` and ``getfo`` hash a file while they copy it.
+    """
+    
+    def __init__(self, file, digest: StreamingDigest):
+        """Initialize digesting file
+        
+        Args:
+            file: File object opened at offset 0
+            digest: Digest to feed
+        """
+        self._file = file
+        self._digest = digest
+        self._offset = 0
+        
+    def read(self, size: int = -1) -> bytes:
+        """Read from the file and hash the data"""
+        data = self._file.read(size)
+        self._digest.update(self._offset, data)
+        self._offset += len(data)
+        return data
+        
+    def write(self, data: bytes) -> int:
+        """Write to the file and hash the data"""
+        written = self._file.write(data)
+        self._digest.update(self._offset, data)
+        self._offset += len(data)
+        return written
+        
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+class TransferVerifier:
+    """Compares local files with digests computed by the server
+    
+    The server digest comes from the SFTP "check-file" extension when the
+    server implements it, and otherwise from ``sha256sum``, ``shasum`` or
+    ``md5sum`` run over an exec channel, so verifying never transfers the
+    file again. Digests are cached by path, size and modification time.
+    """
+    
+    CHECK_FILE_ALGORITHMS = ("sha256", "sha1", "md5")
+    CHECK_FILE_MIN_SIZE = 256  # servers refuse smaller hash blocks
+    CACHE_SIZE = 4096
+    READ_SIZE = 1024 * 1024
+    BATCH_SIZE = 200  # files hashed by one remote command
+    
+    def __init__(self, ssh_manager):
+        """Initialize transfer verifier
+        
+        Args:
+            ssh_manager: SSH manager instance
+        """
+        self.ssh_manager = ssh_manager
+        self._check_file_algorithm: Optional[str] = None
+        self._check_file_supported: Optional[bool] = None
+        self._commands: Optional[set] = None
+        self._cache: "OrderedDict[tuple, Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._warned = False
+        
+    def preferred_algorithm(self) -> str:
+        """Algorithm the server is expected to use for the next digest
+        
+        Returns:
+            hashlib algorithm name
+        """
+        if self._check_file_supported:
+            return self._check_file_algorithm
+        if self._check_file_supported is False and self._commands is not None:
+            if not self._commands & {"sha256sum", "shasum"} and "md5sum" in self._commands:
+                return "md5"
+        return "sha256"
+        
+    def _digest_check_file(self, remote_path: str) -> Optional[Tuple[str, str]]:
+        """Ask the SFTP server to hash a file through "check-file"
+        
+        Returns:
+            Tuple of (algorithm, hex digest), or None if unsupported
+        """
+        with self.ssh_manager.sftp_channel() as sftp:
+            with sftp.open(remote_path, 'r') as remote_file:
+                if not self._check_file_supported:
+                    # Probe on the first block so a slow refusal stays cheap
+                    for algorithm in self.CHECK_FILE_ALGORITHMS:
+                        try:
+                            remote_file.check(algorithm, 0, self.CHECK_FILE_MIN_SIZE, 0)
+                        except (IOError, paramiko.SSHException):
+                            continue
+                        self._check_file_algorithm = algorithm
+                        break
+                    else:
+                        self._check_file_supported = False
+                        return None
+                try:
+                    data = remote_file.check(self._check_file_algorithm, 0, 0, 0)
+                except (IOError, paramiko.SSHException):
+                    self._check_file_supported = False
+                    return None
+        self._check_file_supported = True
+        return self._check_file_algorithm, data.hex()
+        
+    def _checksum_program(self) -> Optional[Tuple[str, str]]:
+        """Find the checksum command of the server, looked up once
+        
+        Returns:
+            Tuple of (algorithm, command), or None if no command exists
+        """
+        if self._commands is None:
+            try:
+                stdout, _, _ = self.ssh_manager.execute_command(
+                    "command -v sha256sum; command -v shasum; command -v md5sum"
+                )
+            except Exception:
+                stdout = ""
+            self._commands = {posixpath.basename(line.strip()) for line in stdout.splitlines()}
+            
+        if "sha256sum" in self._commands:
+            return "sha256", "sha256sum"
+        if "shasum" in self._commands:
+            return "sha256", "shasum -a 256"
+        if "md5sum" in self._commands:
+            return "md5", "md5sum"
+        return None
+        
+    def _digest_command(self, remote_path: str) -> Optional[Tuple[str, str]]:
+        """Hash a file with a checksum command on the server
+        
+        Returns:
+            Tuple of (algorithm, hex digest), or None if no command exists
+            or it printed no digest
+        """
+        program = self._checksum_program()
+        if program is None:
+            return None
+        algorithm, command = program
+        stdout, stderr, exit_code = self.ssh_manager.execute_command(
+            f"{command} < {shlex.quote(remote_path)}"
+        )
+        if exit_code != 0:
+            raise IOError(f"Remote checksum of {remote_path} failed: {stderr.strip()}")
+        fields = stdout.split()
+        if not fields:
+            # e.g. a wrapper or restricted shell that swallows the output
+            return None
+        return algorithm, fields[0].lower()
+        
+    def _digest_command_batch(self, remote_paths: List[str]) -> Optional[List[Tuple[str, str]]]:
+        """Hash several files with one checksum command on the server
+        
+        Returns:
+            Digests in the order of the paths, or None if the command did
+            not hash every file
+        """
+        program = self._checksum_program()
+        if program is None:
+            return None
+        algorithm, command = program
+        stdout, _, exit_code = self.ssh_manager.execute_command(
+            f"{command} " + " ".join(shlex.quote(path) for path in remote_paths)
+        )
+        # Names with special characters are reported with a leading backslash
+        lines = [line.lstrip('\\') for line in stdout.splitlines() if line.strip()]
+        if exit_code != 0 or len(lines) != len(remote_paths):
+            return None
+        return [(algorithm, line.split()[0].lower()) for line in lines]
+        
+    def remote_digest(self, remote_path: str, size: int, mtime: float) -> Optional[Tuple[str, str]]:
+        """Get the digest of a remote file, computed by the server
+        
+        Args:
+            remote_path: Absolute remote file path
+            size: Remote file size
+            mtime: Remote modification time
+            
+        Returns:
+            Tuple of (algorithm, hex digest), or None if the server offers
+            no way to hash files
+        """
+        key = (remote_path, size, int(mtime))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+                
+        digest = None
+        if size >= self.CHECK_FILE_MIN_SIZE and self._check_file_supported is not False:
+            digest = self._digest_check_file(remote_path)
+        if digest is None:
+            digest = self._digest_command(remote_path)
+        if digest is None:
+            return None
+            
+        with self._lock:
+            self._cache[key] = digest
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return digest
+        
+    def remote_digests(self, files: List[Tuple[str, int, float]]) -> Dict[str, Tuple[str, str]]:
+        """Get the digests of many remote files with few round trips
+        
+        Files are hashed by one checksum command per batch when the server
+        has one, since "check-file" needs a round trip per file.
+        
+        Args:
+            files: List of (absolute remote path, size, mtime)
+            
+        Returns:
+            Dictionary of remote path to (algorithm, hex digest); files the
+            server could not hash are missing
+        """
+        digests: Dict[str, Tuple[str, str]] = {}
+        pending = []
+        batched = self._checksum_program() is not None
+        for remote_path, size, mtime in files:
+            key = (remote_path, size, int(mtime))
+            with self._lock:
+                cached = self._cache.get(key)
+            if cached is not None:
+                digests[remote_path] = cached
+            elif batched:
+                pending.append(key)
+            else:
+                digest = self.remote_digest(remote_path, size, mtime)
+                if digest is not None:
+                    digests[remote_path] = digest
+                    
+        for start in range(0, len(pending), self.BATCH_SIZE):
+            batch = pending[start:start + self.BATCH_SIZE]
+            results = self._digest_command_batch([key[0] for key in batch])
+            if results is None:
+                # Some file failed; hash the batch one by one
+                for remote_path, size, mtime in batch:
+                    try:
+                        digest = self.remote_digest(remote_path, size, mtime)
+                    except IOError:
+                        digest = None
+                    if digest is not None:
+                        digests[remote_path] = digest
+                continue
+            with self._lock:
+                for key, digest in zip(batch, results):
+                    self._cache[key] = digest
+                    digests[key[0]] = digest
+                while len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return digests
+        
+    def forget(self, remote_path: str):
+        """Drop cached digests of a path
+        
+        Args:
+            remote_path: Absolute remote file path
+        """
+        with self._lock:
+            for key in [key for key in self._cache if key[0] == remote_path]:
+                del self._cache[key]
+                
+    @classmethod
+    def local_digest(cls, local_path: str, algorithm: str) -> str:
+        """Hash a local file
+        
+        Args:
+            local_path: Local file path
+            algorithm: hashlib algorithm name
+            
+        Returns:
+            Hex digest
+        """
+        digest = hashlib.new(algorithm)
+        with open(local_path, 'rb') as local_file:
+            while True:
+                data = local_file.read(cls.READ_SIZE)
+                if not data:
+                    break
+                digest.update(data)
+        return digest.hexdigest()
+        
+    def verify(self, local_path: str, remote_path: str,
+               streamed: Optional[StreamingDigest] = None) -> bool:
+        """Check that a local file and a remote file have the same content
+        
+        Args:
+            local_path: Local file path
+            remote_path: Absolute remote file path
+            streamed: Digest collected during the transfer (optional)
+            
+        Returns:
+            True if verified, False if the server cannot compute digests
+            
+        Raises:
+            TransferVerificationError: If the files differ
+        """
+        remote_stat = self.ssh_manager.safe_operation(lambda sftp: sftp.stat(remote_path))
+        local_size = os.path.getsize(local_path)
+        if remote_stat.st_size != local_size:
+            raise TransferVerificationError(
+                f"Size mismatch for {remote_path}: {local_size} local, {remote_stat.st_size} remote"
+            )
+            
+        remote = self.remote_digest(remote_path, remote_stat.st_size, remote_stat.st_mtime)
+        if remote is None:
+            if not self._warned:
+                self._warned = True
+                print("Warning: the server cannot compute checksums; transfers are not verified")
+            return False
+            
+        algorithm, remote_hex = remote
+        local_hex = None
+        if streamed is not None and streamed.algorithm == algorithm:
+            local_hex = streamed.hexdigest(local_size)
+        if local_hex is None:
+            local_hex = self.local_digest(local_path, algorithm)
+        if local_hex != remote_hex:
+            self.forget(remote_path)
+            raise TransferVerificationError(
+                f"Checksum mismatch for {remote_path}: {algorithm} {local_hex} local, {remote_hex} remote"
+            )
+        return True
@@ -108,9 +108,16 @@ def main():
         host, port, username, password = connection_dialog.get_connection_info()
         
         # Create SSH manager and connect
-        ssh_manager = SSHManager()
+        from utils.config import ConfigManager
+        config_manager = ConfigManager()
+        pool_size = config_manager.get("sftp_pool_size", SSHManager.DEFAULT_POOL_SIZE)
+        ssh_manager = SSHManager(pool_size=pool_size)
         ssh_manager.connect(host, port, username, password)
         
+        transfer_connections = config_manager.get("transfer_connections", 1)
+        if transfer_connections > 1:
+            ssh_manager.open_transfer_connections(transfer_connections)
+        
         # Create and show main window
         main_window = MainWindow(ssh_manager, version_manager)
         main_window.show()
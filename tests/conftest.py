@@ -0,0 +1,239 @@
+"""Shared fixtures: a local SSH server for tests that need a real connection
+
+The server runs in-process on a random port, serves the local file system
+over SFTP with the paths the tests use unchanged, and runs exec requests
+through ``sh -c``, so the code under test sees a real OpenSSH-like peer.
+"""
+import os
+import socket
+import subprocess
+import threading
+
+import paramiko
+import pytest
+
+from core.ssh_manager import SSHManager
+
+
+class _LocalHandle(paramiko.SFTPHandle):
+    """Open local file served over SFTP"""
+    
+    def stat(self):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+            
+    def chattr(self, attr):
+        return _LocalSFTP.apply_attributes(self.filename, attr)
+
+
+class _LocalSFTP(paramiko.SFTPServerInterface):
+    """SFTP server interface over the local file system"""
+    
+    @staticmethod
+    def apply_attributes(path, attr):
+        try:
+            if attr.st_mode is not None:
+                os.chmod(path, attr.st_mode & 0o7777)
+            if attr.st_atime is not None and attr.st_mtime is not None:
+                os.utime(path, (attr.st_atime, attr.st_mtime))
+            if attr.st_size is not None:
+                os.truncate(path, attr.st_size)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+        
+    def _call(self, function, *args):
+        try:
+            function(*args)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+        
+    def canonicalize(self, path):
+        return os.path.normpath(path if os.path.isabs(path) else os.path.join("/", path))
+        
+    def list_folder(self, path):
+        try:
+            return [
+                paramiko.SFTPAttributes.from_stat(os.lstat(os.path.join(path, name)), name)
+                for name in os.listdir(path)
+            ]
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+            
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+            
+    def lstat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.lstat(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+            
+    def open(self, path, flags, attr):
+        try:
+            fd = os.open(path, flags | getattr(os, "O_BINARY", 0), 0o666)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        if flags & os.O_WRONLY:
+            mode = "ab" if flags & os.O_APPEND else "wb"
+        elif flags & os.O_RDWR:
+            mode = "a+b" if flags & os.O_APPEND else "r+b"
+        else:
+            mode = "rb"
+        handle = _LocalHandle(flags)
+        handle.filename = path
+        handle.readfile = handle.writefile = os.fdopen(fd, mode)
+        return handle
+        
+    def remove(self, path):
+        return self._call(os.remove, path)
+        
+    def rename(self, old_path, new_path):
+        if os.path.exists(new_path):
+            return paramiko.SFTP_FAILURE
+        return self._call(os.rename, old_path, new_path)
+        
+    def posix_rename(self, old_path, new_path):
+        return self._call(os.replace, old_path, new_path)
+        
+    def mkdir(self, path, attr):
+        return self._call(os.mkdir, path)
+        
+    def rmdir(self, path):
+        return self._call(os.rmdir, path)
+        
+    def chattr(self, path, attr):
+        return self.apply_attributes(path, attr)
+        
+    def readlink(self, path):
+        try:
+            return os.readlink(path)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+            
+    def symlink(self, target_path, path):
+        return self._call(os.symlink, target_path, path)
+
+
+class _SFTPServer(paramiko.SFTPServer):
+    """SFTP subsystem without "check-file", like OpenSSH"""
+    
+    def _check_file(self, request_number, msg):
+        self._send_status(request_number, paramiko.SFTP_OP_UNSUPPORTED)
+
+
+class _LocalServer(paramiko.ServerInterface):
+    """Accepts any password and runs exec requests with sh"""
+    
+    def __init__(self, exec_enabled):
+        self.exec_enabled = exec_enabled
+        
+    def get_allowed_auths(self, username):
+        return "password"
+        
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+        
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+        
+    def check_channel_exec_request(self, channel, command):
+        if not self.exec_enabled:
+            return False
+        threading.Thread(target=_run_command, args=(channel, command), daemon=True).start()
+        return True
+
+
+def _run_command(channel, command):
+    """Run an exec request, piping the channel to and from the process"""
+    process = subprocess.Popen(
+        ["sh", "-c", command.decode()],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    
+    def _pump_stdin():
+        try:
+            while True:
+                data = channel.recv(65536)
+                if not data:
+                    break
+                process.stdin.write(data)
+        except (OSError, EOFError):
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+                
+    def _pump_stderr():
+        for data in iter(lambda: process.stderr.read1(65536), b""):
+            channel.sendall_stderr(data)
+            
+    threads = [threading.Thread(target=_pump_stdin, daemon=True),
+               threading.Thread(target=_pump_stderr, daemon=True)]
+    for thread in threads:
+        thread.start()
+    try:
+        for data in iter(lambda: process.stdout.read1(65536), b""):
+            channel.sendall(data)
+    except OSError:
+        process.kill()
+    threads[1].join()
+    channel.send_exit_status(process.wait())
+    channel.close()
+
+
+class LocalSSHServer:
+    """SSH server on 127.0.0.1 serving the local file system"""
+    
+    def __init__(self, exec_enabled=True):
+        self.exec_enabled = exec_enabled
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(16)
+        self.port = self.listener.getsockname()[1]
+        self.transports = []
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+        
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self.host_key)
+            transport.set_subsystem_handler("sftp", _SFTPServer, _LocalSFTP)
+            transport.start_server(server=_LocalServer(self.exec_enabled))
+            self.transports.append(transport)
+            
+    def close(self):
+        self.listener.close()
+        for transport in self.transports:
+            transport.close()
+
+
+@pytest.fixture(scope="session")
+def ssh_server():
+    """Local SSH server shared by the whole session"""
+    server = LocalSSHServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def ssh_manager(ssh_server):
+    """SSHManager connected to the local server"""
+    manager = SSHManager(pool_size=2)
+    manager.connect("127.0.0.1", ssh_server.port, "tester", "secret", timeout=10)
+    yield manager
+    manager.disconnect()
@@ -0,0 +1,73 @@
+"""Tests for the command line interface"""
+import functools
+
+import pytest
+
+from core.cli import build_parser, command_sync, parse_target
+from core.file_manager import FileManager
+from core.sync_engine import SyncEngine
+
+
+@pytest.mark.parametrize("target, expected", [
+    ("deploy@example.com", ("deploy", "example.com", 22)),
+    ("deploy@example.com:2222", ("deploy", "example.com", 2222)),
+    ("first.last@corp@example.com", ("first.last@corp", "example.com", 22)),
+])
+def test_parse_target(target, expected):
+    assert parse_target(target) == expected
+
+
+@pytest.mark.parametrize("target", ["example.com", "deploy@", "@example.com"])
+def test_parse_target_rejects_incomplete(target):
+    with pytest.raises(ValueError):
+        parse_target(target)
+
+
+def test_sync_does_not_delete_by_default():
+    args = build_parser().parse_args(["deploy@example.com", "sync", "a", "b"])
+    assert not args.delete
+    args = build_parser().parse_args(["deploy@example.com", "sync", "a", "b", "--delete"])
+    assert args.delete
+
+
+@pytest.fixture
+def synced(ssh_manager, tmp_path, monkeypatch):
+    """Folders after a first sync, with one file removed on each side"""
+    monkeypatch.setattr("core.cli.SyncEngine",
+                        functools.partial(SyncEngine, snapshot_dir=str(tmp_path / "snapshots")))
+    local = tmp_path / "local"
+    remote = tmp_path / "remote"
+    local.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (local / name).write_text(name)
+    file_manager = FileManager(ssh_manager)
+    assert _sync(file_manager, local, remote) == 0
+    (local / "a.txt").unlink()
+    (remote / "b.txt").unlink()
+    return file_manager, local, remote
+
+
+def _sync(file_manager, local, remote, *options):
+    args = build_parser().parse_args(["-q", "deploy@example.com", "sync", str(local), str(remote), *options])
+    return command_sync(file_manager, args)
+
+
+def test_sync_skips_deletions_without_flag(synced, capsys):
+    file_manager, local, remote = synced
+    assert _sync(file_manager, local, remote) == 1
+    assert sorted(p.name for p in local.iterdir()) == ["b.txt", "c.txt"]
+    assert sorted(p.name for p in remote.iterdir()) == ["a.txt", "c.txt"]
+    assert "pass --delete" in capsys.readouterr().err
+    
+    # The deletions stay planned until they are applied
+    assert _sync(file_manager, local, remote, "--delete") == 0
+    assert sorted(p.name for p in local.iterdir()) == ["c.txt"]
+    assert sorted(p.name for p in remote.iterdir()) == ["c.txt"]
+
+
+def test_sync_prefer_does_not_delete_without_flag(synced):
+    file_manager, local, remote = synced
+    (remote / "a.txt").write_text("changed on server")
+    (remote / "a.txt").touch()
+    assert _sync(file_manager, local, remote, "--prefer", "local") == 1
+    assert (remote / "a.txt").read_text() == "changed on server"
@@ -0,0 +1,148 @@
+"""Tests for compressed transfers and how they combine with resumes"""
+import gzip
+import io
+import os
+import stat
+
+import pytest
+
+from core.compressed_transfer import CompressedTransfer
+from core.errors import TransferCancelled
+from core.file_manager import FileManager
+from core.transfer_state import TransferStateStore
+
+
+class FakeSSHManager:
+    username = "user"
+    host = "example.com"
+    port = 22
+
+
+class FakeChannel:
+    """Exec channel replaying a command's output"""
+    
+    def __init__(self, output: bytes, exit_code: int = 0, block_size: int = 1024):
+        self.blocks = [output[i:i + block_size] for i in range(0, len(output), block_size)]
+        self.exit_code = exit_code
+        self.closed = False
+        
+    def recv(self, size):
+        return self.blocks.pop(0) if self.blocks else b""
+        
+    def recv_exit_status(self):
+        return self.exit_code
+        
+    def makefile_stderr(self, mode):
+        return io.BytesIO(b"gzip: unexpected end of file")
+        
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def transfer(monkeypatch):
+    transfer = CompressedTransfer(FakeSSHManager(), "gzip")
+    transfer.channel = None
+    monkeypatch.setattr(transfer, "_open_channel", lambda command: transfer.channel)
+    return transfer
+
+
+def test_download_replaces_destination_on_success(transfer, tmp_path):
+    data = b"log line\n" * 10000
+    destination = tmp_path / "app.log"
+    destination.write_bytes(b"old contents")
+    transfer.channel = FakeChannel(gzip.compress(data))
+    transfer.download("/var/log/app.log", str(destination), size=len(data))
+    assert destination.read_bytes() == data
+    assert os.listdir(tmp_path) == ["app.log"]
+
+
+def test_cancelled_download_keeps_destination(transfer, tmp_path):
+    data = b"log line\n" * 10000
+    destination = tmp_path / "app.log"
+    destination.write_bytes(b"old contents")
+    transfer.channel = FakeChannel(gzip.compress(data, 0), block_size=4096)
+    with pytest.raises(TransferCancelled):
+        transfer.download("/var/log/app.log", str(destination),
+                          lambda transferred, total: transferred < len(data) // 2, size=len(data))
+    assert destination.read_bytes() == b"old contents"
+    assert os.listdir(tmp_path) == ["app.log"]
+
+
+def test_failed_download_keeps_destination(transfer, tmp_path):
+    destination = tmp_path / "app.log"
+    destination.write_bytes(b"old contents")
+    transfer.channel = FakeChannel(gzip.compress(b"partial")[:-8], exit_code=1)
+    with pytest.raises(IOError):
+        transfer.download("/var/log/app.log", str(destination))
+    assert destination.read_bytes() == b"old contents"
+    assert os.listdir(tmp_path) == ["app.log"]
+
+
+@pytest.fixture
+def upload(ssh_manager, tmp_path):
+    local_path = tmp_path / "deploy.sh"
+    local_path.write_bytes(b"echo deployed\n" * 20000)
+    
+    def _upload(remote_path):
+        CompressedTransfer(ssh_manager, "gzip").upload(str(local_path), str(remote_path))
+        assert remote_path.read_bytes() == local_path.read_bytes()
+        assert [path.name for path in remote_path.parent.iterdir() if "partial" in path.name] == []
+        
+    return _upload
+
+
+def test_upload_keeps_mode_of_existing_destination(upload, tmp_path):
+    remote_path = tmp_path / "remote" / "deploy.sh"
+    remote_path.parent.mkdir()
+    remote_path.write_text("old")
+    remote_path.chmod(0o755)
+    upload(remote_path)
+    assert stat.S_IMODE(remote_path.stat().st_mode) == 0o755
+    
+    
+def test_upload_writes_through_symlink(upload, tmp_path):
+    target = tmp_path / "releases" / "deploy.sh"
+    target.parent.mkdir()
+    target.write_text("old")
+    target.chmod(0o750)
+    link = tmp_path / "deploy.sh.link"
+    link.symlink_to(target)
+    upload(link)
+    assert link.is_symlink()
+    assert stat.S_IMODE(target.stat().st_mode) == 0o750
+    
+    
+def test_upload_creates_new_destination(upload, tmp_path):
+    remote_path = tmp_path / "remote" / "deploy.sh"
+    remote_path.parent.mkdir()
+    upload(remote_path)
+
+
+@pytest.fixture
+def file_manager(tmp_path):
+    file_manager = FileManager(FakeSSHManager())
+    file_manager._state_store = TransferStateStore(str(tmp_path / "state.json"))
+    file_manager._remote_codecs = ["gzip"]
+    return file_manager
+
+
+def test_compression_used_for_fresh_transfers(file_manager):
+    assert file_manager._compressed_transfer("upload", "/srv/a.log", "/tmp/a.log", False) is not None
+
+
+def test_compression_skipped_when_resuming(file_manager):
+    assert file_manager._compressed_transfer("upload", "/srv/a.log", "/tmp/a.log", True) is None
+    assert file_manager._compressed_transfer("download", "/srv/a.log", "/tmp/a.log", True) is None
+
+
+def test_compression_skipped_with_interrupted_transfer(file_manager):
+    resumable = file_manager._resumable_transfer()
+    resumable._begin("upload", "/srv/a.log", "/tmp/a.log", 100, 1.0)
+    assert file_manager._compressed_transfer("upload", "/srv/a.log", "/tmp/a.log", False) is None
+    assert file_manager._compressed_transfer("download", "/srv/a.log", "/tmp/a.log", False) is not None
+
+
+def test_compression_disabled(file_manager):
+    file_manager.compression_enabled = False
+    assert file_manager._compressed_transfer("upload", "/srv/a.log", "/tmp/a.log", False) is None
@@ -0,0 +1,38 @@
+"""Tests for folder uploads"""
+import os
+
+import pytest
+
+from core.file_manager import FileManager
+
+
+@pytest.fixture
+def local_folder(tmp_path):
+    folder = tmp_path / "site"
+    (folder / "css").mkdir(parents=True)
+    (folder / "index.html").write_text("<html></html>")
+    (folder / "css" / "style.css").write_text("body {}")
+    return folder
+
+
+@pytest.mark.parametrize("use_tar", [True, False])
+def test_upload_folder(ssh_manager, local_folder, tmp_path, use_tar):
+    file_manager = FileManager(ssh_manager)
+    remote_folder = tmp_path / "remote"
+    assert file_manager.upload_folder(str(local_folder), str(remote_folder), use_tar=use_tar)
+    assert (remote_folder / "index.html").read_text() == "<html></html>"
+    assert (remote_folder / "css" / "style.css").read_text() == "body {}"
+
+
+def test_only_changed_reports_through_summary(ssh_manager, local_folder, tmp_path, capsys):
+    file_manager = FileManager(ssh_manager)
+    remote_folder = tmp_path / "remote"
+    assert file_manager.upload_folder(str(local_folder), str(remote_folder))
+    (local_folder / "index.html").write_text("<html>changed</html>")
+    os.utime(local_folder / "index.html", (1, 1))
+    capsys.readouterr()
+    
+    assert file_manager.upload_folder(str(local_folder), str(remote_folder), only_changed=True)
+    assert (remote_folder / "index.html").read_text() == "<html>changed</html>"
+    assert file_manager.last_upload_summary is not None
+    assert str(file_manager.last_upload_summary) not in capsys.readouterr().out
@@ -0,0 +1,53 @@
+"""Tests for the offline remote index"""
+import re
+import stat
+
+import paramiko
+import pytest
+
+from core.remote_index import RemoteIndex
+
+
+def _attributes(name, mode=stat.S_IFREG | 0o644):
+    attr = paramiko.SFTPAttributes()
+    attr.filename = name
+    attr.st_size = 1
+    attr.st_mtime = 1000
+    attr.st_mode = mode
+    return attr
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = RemoteIndex(str(tmp_path / "index.sqlite"))
+    index.replace_directory("/srv", 1000, [
+        _attributes(name) for name in ("My_File.txt", "myXfile.txt", "report%2024.csv", "notes.md")
+    ])
+    yield index
+    index.close()
+
+
+@pytest.mark.parametrize("pattern, names", [
+    ("file", ["My_File.txt", "myXfile.txt"]),
+    ("my_f", ["My_File.txt"]),
+    ("t%2", ["report%2024.csv"]),
+    ("*.md", ["notes.md"]),
+    ("missing", []),
+])
+def test_search(index, pattern, names):
+    assert sorted(entry.path.rsplit("/", 1)[1] for entry in index.search(pattern)) == names
+
+
+def test_search_below_directory(index):
+    assert [entry.path for entry in index.search("notes", directory="/srv")] == ["/srv/notes.md"]
+    assert not index.search("notes", directory="/sr")
+
+
+@pytest.mark.parametrize("pattern", ["file", "my_file", "100%", "*.txt"])
+def test_search_uses_name_index(index, pattern):
+    if not index.has_fts:
+        pytest.skip("SQLite without the FTS5 trigram tokenizer")
+    query, params = index._search_query(pattern, 10, None)
+    plan = " ".join(row[3] for row in index._connection().execute(f"EXPLAIN QUERY PLAN {query}", params))
+    # The virtual table reports the LIKE (L) or GLOB (G) constraint it handles
+    assert re.search(r"VIRTUAL TABLE INDEX 0:[LG]", plan), plan
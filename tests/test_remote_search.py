@@ -0,0 +1,24 @@
+"""Tests for server-side search"""
+from core.remote_search import RemoteSearch
+
+
+def test_find_marks_directories(ssh_manager, tmp_path):
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "app.log").write_text("started\n")
+    (tmp_path / "LOG.txt").write_text("")
+    (tmp_path / "notes.md").write_text("")
+    results = sorted(RemoteSearch(ssh_manager).search(str(tmp_path), name="log"),
+                     key=lambda result: result.path)
+    assert [(result.path, result.is_directory) for result in results] == [
+        (str(tmp_path / "LOG.txt"), False),
+        (str(tmp_path / "logs"), True),
+        (str(tmp_path / "logs" / "app.log"), False),
+    ]
+
+
+def test_grep_finds_lines(ssh_manager, tmp_path):
+    (tmp_path / "app.log").write_text("started\nfailed: disk full\n")
+    results = list(RemoteSearch(ssh_manager).search(str(tmp_path), text="disk"))
+    assert [(result.path, result.line_number, result.text) for result in results] == [
+        (str(tmp_path / "app.log"), 2, "failed: disk full"),
+    ]
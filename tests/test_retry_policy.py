@@ -0,0 +1,147 @@
+"""Tests for retry decisions"""
+import errno
+import socket
+import time
+
+import paramiko
+import pytest
+
+from core.errors import NotConnectedError
+from core.retry_policy import ErrorKind, RetryPolicy, RetryStats, classify_error
+from core.ssh_manager import SSHManager
+
+
+@pytest.mark.parametrize("error, kind", [
+    # Broken links
+    (EOFError(), ErrorKind.CONNECTION_LOST),
+    (ConnectionResetError(errno.ECONNRESET, "Connection reset by peer"), ErrorKind.CONNECTION_LOST),
+    (BrokenPipeError(errno.EPIPE, "Broken pipe"), ErrorKind.CONNECTION_LOST),
+    (paramiko.SSHException("SSH session not active"), ErrorKind.CONNECTION_LOST),
+    (ConnectionError("SFTP client not connected"), ErrorKind.CONNECTION_LOST),
+    (OSError("Socket is closed"), ErrorKind.CONNECTION_LOST),
+    (paramiko.SSHException("Server connection dropped"), ErrorKind.CONNECTION_LOST),
+    # Worth another try on the same connection
+    (socket.timeout("timed out"), ErrorKind.TRANSIENT),
+    (TimeoutError(), ErrorKind.TRANSIENT),
+    (paramiko.ChannelException(1, "Administratively prohibited"), ErrorKind.TRANSIENT),
+    (paramiko.SSHException("Error reading SSH protocol banner"), ErrorKind.TRANSIENT),
+    (OSError(errno.EIO, "Input/output error"), ErrorKind.TRANSIENT),
+    # Status codes from the server
+    (FileNotFoundError(errno.ENOENT, "No such file"), ErrorKind.PERMANENT),
+    (PermissionError(errno.EACCES, "Permission denied"), ErrorKind.PERMANENT),
+    (OSError(errno.ENOSPC, "No space left on device"), ErrorKind.PERMANENT),
+    (OSError("Failure"), ErrorKind.PERMANENT),
+    (OSError("Operation unsupported"), ErrorKind.PERMANENT),
+    # No connection to restore
+    (NotConnectedError("SFTP client not connected"), ErrorKind.PERMANENT),
+    # Bugs in the operation itself
+    (ValueError("bad argument"), ErrorKind.PERMANENT),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+def test_retry_delay_only_for_transient_idempotent_errors():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0)
+    started = time.monotonic()
+    assert policy.retry_delay(ErrorKind.TRANSIENT, 1, started) is not None
+    assert policy.retry_delay(ErrorKind.PERMANENT, 1, started) is None
+    assert policy.retry_delay(ErrorKind.CONNECTION_LOST, 1, started) is None
+    assert policy.retry_delay(ErrorKind.TRANSIENT, 1, started, idempotent=False) is None
+    assert policy.retry_delay(ErrorKind.TRANSIENT, 3, started) is None
+
+
+def test_retry_delay_backs_off_with_jitter():
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=4.0, deadline=None)
+    started = time.monotonic()
+    for attempt, limit in [(1, 1.0), (2, 2.0), (3, 4.0), (6, 4.0)]:
+        delays = [policy.retry_delay(ErrorKind.TRANSIENT, attempt, started) for _ in range(50)]
+        assert all(limit / 2 <= delay <= limit for delay in delays)
+
+
+def test_retry_delay_respects_deadline():
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, deadline=10.0)
+    assert policy.retry_delay(ErrorKind.TRANSIENT, 1, time.monotonic()) is not None
+    assert policy.retry_delay(ErrorKind.TRANSIENT, 1, time.monotonic() - 9.5) is None
+    assert policy.expired(time.monotonic() - 10.0)
+    assert not RetryPolicy(deadline=None).expired(0.0)
+
+
+def test_with_attempts_copies_policy():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0)
+    longer = policy.with_attempts(10)
+    assert (policy.max_attempts, longer.max_attempts) == (3, 10)
+    assert longer.retry_delay(ErrorKind.TRANSIENT, 5, time.monotonic()) is not None
+
+
+def test_retry_stats():
+    stats = RetryStats()
+    stats.record("operations")
+    stats.record("retries", ErrorKind.TRANSIENT)
+    stats.record("retries", ErrorKind.TRANSIENT)
+    assert stats.snapshot() == {"operations": 1, "retries": 2, "retries (transient)": 2}
+    stats.reset()
+    assert stats.snapshot() == {}
+
+
+class FlakyOperation:
+    """Raises the given errors in turn, then succeeds"""
+    
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+        
+    def __call__(self, sftp):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+FAST = RetryPolicy(max_attempts=3, base_delay=0.001)
+
+
+def test_safe_operation_retries_transient_errors(ssh_manager):
+    operation = FlakyOperation(socket.timeout("timed out"), OSError(errno.EIO, "I/O error"))
+    assert ssh_manager.safe_operation(operation, policy=FAST) == "ok"
+    assert operation.calls == 3
+    assert ssh_manager.retry_stats.snapshot()["retries (transient)"] == 2
+
+
+def test_safe_operation_gives_up_after_max_attempts(ssh_manager):
+    operation = FlakyOperation(*[socket.timeout("timed out")] * 3)
+    with pytest.raises(socket.timeout):
+        ssh_manager.safe_operation(operation, policy=FAST)
+    assert operation.calls == 3
+
+
+@pytest.mark.parametrize("error, idempotent", [
+    (FileNotFoundError(errno.ENOENT, "No such file"), True),
+    (socket.timeout("timed out"), False),
+])
+def test_safe_operation_raises_at_once(ssh_manager, error, idempotent):
+    operation = FlakyOperation(error)
+    with pytest.raises(type(error)):
+        ssh_manager.safe_operation(operation, policy=FAST, idempotent=idempotent)
+    assert operation.calls == 1
+
+
+def test_safe_operation_honours_max_retries(ssh_manager):
+    operation = FlakyOperation(*[socket.timeout("timed out")] * 5)
+    assert ssh_manager.safe_operation(operation, max_retries=6, policy=FAST) == "ok"
+    assert operation.calls == 6
+
+
+@pytest.mark.parametrize("connected", [False, True])
+def test_safe_operation_without_connection_fails_at_once(ssh_server, connected):
+    manager = SSHManager()
+    if connected:
+        manager.connect("127.0.0.1", ssh_server.port, "tester", "secret", timeout=10)
+        manager.disconnect()
+    operation = FlakyOperation()
+    started = time.monotonic()
+    with pytest.raises(NotConnectedError):
+        manager.safe_operation(operation)
+    assert operation.calls == 0
+    assert time.monotonic() - started < 1
+    assert manager.retry_stats.snapshot()["failures (permanent)"] == 1
@@ -0,0 +1,105 @@
+"""Tests for the SFTP channel pool"""
+import threading
+import time
+
+import paramiko
+import pytest
+
+from core.sftp_pool import SFTPChannelPool
+
+
+class FakeChannel:
+    closed = False
+
+
+class FakeClient:
+    def get_channel(self):
+        return FakeChannel()
+        
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Make the pool open fake clients; the list holds what it opened"""
+    clients = []
+    
+    def _from_transport(transport, window_size=None, max_packet_size=None):
+        if len(clients) >= transport.max_sessions:
+            raise paramiko.ChannelException(1, "Administratively prohibited")
+        clients.append(FakeClient())
+        return clients[-1]
+        
+    monkeypatch.setattr(paramiko.SFTPClient, "from_transport", _from_transport)
+    return clients
+
+
+class FakeTransport:
+    def __init__(self, max_sessions=10):
+        self.max_sessions = max_sessions
+
+
+def _notify_until(pool, stop):
+    """Wake waiters repeatedly without freeing a channel"""
+    while not stop.is_set():
+        with pool._condition:
+            pool._condition.notify_all()
+        time.sleep(0.02)
+
+
+def test_acquire_reuses_released_client(opened):
+    pool = SFTPChannelPool(FakeTransport(), size=2)
+    client = pool.acquire()
+    pool.release(client)
+    assert pool.acquire() is client
+    assert len(opened) == 1
+
+
+def test_acquire_times_out_when_full(opened):
+    pool = SFTPChannelPool(FakeTransport(), size=1)
+    pool.acquire()
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.1)
+    assert time.monotonic() - started < 1.0
+
+
+def test_acquire_timeout_is_not_restarted_by_wakeups(opened):
+    pool = SFTPChannelPool(FakeTransport(), size=1)
+    pool.acquire()
+    stop = threading.Event()
+    notifier = threading.Thread(target=_notify_until, args=(pool, stop), daemon=True)
+    notifier.start()
+    started = time.monotonic()
+    try:
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.2)
+    finally:
+        stop.set()
+        notifier.join()
+    assert time.monotonic() - started < 1.0
+
+
+def test_refused_channel_shrinks_pool_and_keeps_deadline(opened):
+    pool = SFTPChannelPool(FakeTransport(max_sessions=1), size=4)
+    pool.acquire()
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.2)
+    assert time.monotonic() - started < 1.0
+    assert pool.size == 1
+
+
+def test_refused_channel_waits_for_release(opened):
+    pool = SFTPChannelPool(FakeTransport(max_sessions=1), size=2)
+    client = pool.acquire()
+    threading.Timer(0.05, pool.release, args=(client,)).start()
+    assert pool.acquire(timeout=2.0) is client
+
+
+def test_closed_pool_refuses_acquire(opened):
+    pool = SFTPChannelPool(FakeTransport(), size=1)
+    pool.close()
+    with pytest.raises(ConnectionError):
+        pool.acquire(timeout=0.1)
@@ -0,0 +1,135 @@
+"""Tests for sync planning"""
+import os
+import shutil
+
+import pytest
+
+from core.file_manager import FileManager
+from core.sync_engine import SyncAction, SyncEngine
+
+OLD = (100, 1000)
+NEW = (120, 2000)
+OTHER = (130, 3000)
+
+
+@pytest.mark.parametrize("local, remote, base, action", [
+    # Never synced
+    (NEW, None, None, SyncAction.UPLOAD),
+    (None, NEW, None, SyncAction.DOWNLOAD),
+    (NEW, NEW, None, None),
+    (NEW, OTHER, None, SyncAction.CONFLICT),
+    # Unchanged since the last sync
+    (OLD, OLD, list(OLD + OLD), None),
+    # Changed on one side
+    (NEW, OLD, list(OLD + OLD), SyncAction.UPLOAD),
+    (OLD, NEW, list(OLD + OLD), SyncAction.DOWNLOAD),
+    # Changed on both sides, the same way or not
+    (NEW, NEW, list(OLD + OLD), None),
+    (NEW, OTHER, list(OLD + OLD), SyncAction.CONFLICT),
+    # Deleted on one side
+    (OLD, None, list(OLD + OLD), SyncAction.DELETE_LOCAL),
+    (None, OLD, list(OLD + OLD), SyncAction.DELETE_REMOTE),
+    # Changed on one side, deleted on the other
+    (NEW, None, list(OLD + OLD), SyncAction.CONFLICT),
+    (None, NEW, list(OLD + OLD), SyncAction.CONFLICT),
+    # Deleted on both sides
+    (None, None, list(OLD + OLD), None),
+])
+def test_compare(local, remote, base, action):
+    entry = SyncEngine._compare("a.txt", local, remote, base)
+    assert (entry.action if entry else None) == action
+
+
+@pytest.fixture
+def folders(tmp_path):
+    local = tmp_path / "local"
+    remote = tmp_path / "remote"
+    local.mkdir()
+    for name in ("a.txt", "b.txt", "docs/c.txt"):
+        (local / name).parent.mkdir(parents=True, exist_ok=True)
+        (local / name).write_text(name)
+    return local, remote
+
+
+@pytest.fixture
+def engine(ssh_manager, tmp_path):
+    return SyncEngine(FileManager(ssh_manager), workers=2, snapshot_dir=str(tmp_path / "snapshots"))
+
+
+def _sync(engine, local, remote):
+    plan = engine.plan(str(local), str(remote))
+    assert not engine.execute(plan)
+    return plan
+
+
+def test_first_sync_creates_missing_remote_folder(engine, folders):
+    local, remote = folders
+    plan = _sync(engine, local, remote)
+    assert plan.count(SyncAction.UPLOAD) == 3
+    assert (remote / "docs" / "c.txt").read_text() == "docs/c.txt"
+    assert not engine.plan(str(local), str(remote)).entries
+
+
+def test_first_sync_creates_missing_local_folder(engine, folders, tmp_path):
+    local, remote = folders
+    shutil.copytree(local, remote)
+    shutil.rmtree(local)
+    plan = _sync(engine, local, remote)
+    assert plan.count(SyncAction.DOWNLOAD) == 3
+    assert (local / "docs" / "c.txt").read_text() == "docs/c.txt"
+
+
+def test_moved_remote_folder_fails_plan(engine, folders, tmp_path):
+    local, remote = folders
+    _sync(engine, local, remote)
+    remote.rename(tmp_path / "moved")
+    with pytest.raises(FileNotFoundError):
+        engine.plan(str(local), str(remote))
+    assert sorted(os.listdir(local)) == ["a.txt", "b.txt", "docs"]
+
+
+def test_moved_local_folder_fails_plan(engine, folders, tmp_path):
+    local, remote = folders
+    _sync(engine, local, remote)
+    local.rename(tmp_path / "moved")
+    with pytest.raises(FileNotFoundError):
+        engine.plan(str(local), str(remote))
+
+
+def test_unreadable_local_subdirectory_is_left_out(engine, folders, monkeypatch):
+    local, remote = folders
+    _sync(engine, local, remote)
+    (remote / "docs" / "c.txt").write_text("changed on server")
+    os.utime(remote / "docs" / "c.txt", (1, 1))
+    scandir = os.scandir
+    
+    def _scandir(path):
+        if os.path.basename(path) == "docs":
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+        
+    monkeypatch.setattr(os, "scandir", _scandir)
+    plan = engine.plan(str(local), str(remote))
+    assert not plan.entries
+
+
+def test_deletions_are_planned(engine, folders):
+    local, remote = folders
+    _sync(engine, local, remote)
+    (local / "a.txt").unlink()
+    (remote / "b.txt").unlink()
+    plan = engine.plan(str(local), str(remote))
+    assert {(entry.path, entry.action) for entry in plan.entries} == {
+        ("a.txt", SyncAction.DELETE_REMOTE), ("b.txt", SyncAction.DELETE_LOCAL),
+    }
+
+
+def test_local_symlinks_are_not_followed(engine, folders, tmp_path):
+    local, remote = folders
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.txt").write_text("secret")
+    (local / "docs" / "loop").symlink_to(local)
+    (local / "outside").symlink_to(outside)
+    (local / "link.txt").symlink_to(local / "a.txt")
+    assert sorted(engine.scan_local(str(local))) == ["a.txt", "b.txt", "docs/c.txt"]
@@ -0,0 +1,148 @@
+"""Tests for digests collected while files are transferred"""
+import hashlib
+import os
+import random
+import threading
+
+import pytest
+
+from core.chunked_transfer import ChunkedTransfer
+from core.file_manager import FileManager
+from core.transfer_verifier import StreamingDigest, TransferVerifier
+
+
+def _pieces(data, size):
+    return [(offset, data[offset:offset + size]) for offset in range(0, len(data), size)]
+
+
+def test_in_order_pieces():
+    data = os.urandom(10000)
+    digest = StreamingDigest("sha256")
+    for offset, piece in _pieces(data, 1000):
+        digest.update(offset, piece)
+    assert digest.hexdigest(len(data)) == hashlib.sha256(data).hexdigest()
+
+
+def test_out_of_order_pieces_are_buffered():
+    data = os.urandom(10000)
+    pieces = _pieces(data, 1000)
+    random.Random(1).shuffle(pieces)
+    pieces.remove((0, data[:1000]))
+    digest = StreamingDigest("sha256")
+    for offset, piece in [(0, data[:1000])] + pieces:
+        digest.update(offset, piece)
+    assert digest.hexdigest(len(data)) == hashlib.sha256(data).hexdigest()
+
+
+def test_resumed_transfer_is_not_covered():
+    data = os.urandom(10000)
+    digest = StreamingDigest("sha256")
+    for offset, piece in _pieces(data, 1000)[4:]:
+        digest.update(offset, piece)
+    assert digest.hexdigest(len(data)) is None
+
+
+def test_repeated_range_gives_up():
+    data = os.urandom(4000)
+    digest = StreamingDigest("sha256")
+    for offset, piece in _pieces(data, 1000) + [(1000, data[1000:2000])]:
+        digest.update(offset, piece)
+    assert digest.hexdigest(len(data)) is None
+
+
+def test_restart_from_zero_resets():
+    data = os.urandom(4000)
+    digest = StreamingDigest("sha256")
+    for offset, piece in _pieces(data, 1000)[:2] + _pieces(data, 1000):
+        digest.update(offset, piece)
+    assert digest.hexdigest(len(data)) == hashlib.sha256(data).hexdigest()
+
+
+def test_buffer_limit(monkeypatch):
+    monkeypatch.setattr(StreamingDigest, "MAX_BUFFERED", 2000)
+    data = os.urandom(5000)
+    digest = StreamingDigest("sha256")
+    for offset, piece in reversed(_pieces(data, 1000)):
+        digest.update(offset, piece)
+    assert digest.hexdigest(len(data)) is None
+
+
+def test_concurrent_updates():
+    data = os.urandom(64 * 1000)
+    digest = StreamingDigest("sha256")
+    ranges = [_pieces(data[start:start + 16000], 1000) for start in range(0, len(data), 16000)]
+    
+    def _feed(index):
+        for offset, piece in ranges[index]:
+            digest.update(index * 16000 + offset, piece)
+            
+    threads = [threading.Thread(target=_feed, args=(index,)) for index in range(len(ranges))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert digest.hexdigest(len(data)) == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize("direction", ["upload", "download"])
+def test_chunked_transfer_feeds_digest(ssh_manager, tmp_path, direction):
+    data = os.urandom(5 * 1024 * 1024 + 123)
+    source = tmp_path / "source.bin"
+    destination = tmp_path / "destination.bin"
+    source.write_bytes(data)
+    digest = StreamingDigest("sha256")
+    transfer = ChunkedTransfer(ssh_manager, channels=3, chunk_size=ChunkedTransfer.BLOCK_SIZE)
+    if direction == "upload":
+        transfer.upload(str(source), str(destination), digest=digest)
+    else:
+        transfer.download(str(source), str(destination), digest=digest)
+    assert destination.read_bytes() == data
+    assert digest.hexdigest(len(data)) == hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def file_manager(ssh_manager, monkeypatch):
+    file_manager = FileManager(ssh_manager)
+    file_manager.compression_enabled = False
+    
+    def _no_rehash(local_path, algorithm):
+        raise AssertionError(f"{local_path} was hashed again after the transfer")
+        
+    monkeypatch.setattr(TransferVerifier, "local_digest", staticmethod(_no_rehash))
+    return file_manager
+
+
+def test_plain_upload_is_verified_without_rehash(file_manager, tmp_path):
+    data = os.urandom(300 * 1024)
+    (tmp_path / "local.bin").write_bytes(data)
+    file_manager.upload_file(str(tmp_path / "local.bin"), str(tmp_path / "remote.bin"))
+    assert (tmp_path / "remote.bin").read_bytes() == data
+
+
+def test_plain_download_is_verified_without_rehash(file_manager, tmp_path):
+    data = os.urandom(300 * 1024)
+    (tmp_path / "remote.bin").write_bytes(data)
+    file_manager.download_file(str(tmp_path / "remote.bin"), str(tmp_path / "local.bin"))
+    assert (tmp_path / "local.bin").read_bytes() == data
+
+
+def test_chunked_upload_is_verified_without_rehash(file_manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(FileManager, "CHUNKED_THRESHOLD", 1024 * 1024)
+    data = os.urandom(3 * 1024 * 1024)
+    (tmp_path / "local.bin").write_bytes(data)
+    file_manager.upload_file(str(tmp_path / "local.bin"), str(tmp_path / "remote.bin"))
+    assert (tmp_path / "remote.bin").read_bytes() == data
+
+
+class _SilentChecksumManager:
+    """SSH manager whose checksum command succeeds without output"""
+    
+    def execute_command(self, command):
+        if command.startswith("command -v"):
+            return "/usr/bin/sha256sum\n", "", 0
+        return "", "", 0
+
+
+def test_empty_checksum_output_means_no_digest():
+    verifier = TransferVerifier(_SilentChecksumManager())
+    assert verifier.remote_digest("/srv/a.txt", 10, 1000.0) is None
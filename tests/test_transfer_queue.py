@@ -0,0 +1,102 @@
+"""Tests for the background transfer queue"""
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from core.compressed_transfer import CompressedTransfer
+from core.errors import TransferCancelled
+from core.file_manager import FileManager
+from core.transfer_queue import TransferQueue, TransferStatus
+from core.transfer_state import TransferStateStore
+
+
+class FakeFileManager:
+    """Transfers that report progress and can be held until released"""
+    
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Semaphore(0)
+        self.resumes = []
+        
+    def upload_file(self, local_path, remote_path, progress_callback, resume=False, resumable=False):
+        self.resumes.append(resume)
+        self.started.release()
+        self.release.wait(5)
+        for transferred in (50, 100):
+            if progress_callback(transferred, 100) is False:
+                raise TransferCancelled("Transfer cancelled")
+                
+    download_file = upload_file
+
+
+def test_queue_does_not_import_qt():
+    code = "import sys, core.transfer_queue; sys.exit('PySide6' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
+
+
+def test_queue_runs_items(tmp_path):
+    queue = TransferQueue(FakeFileManager(), concurrency=2)
+    added, updates = [], []
+    queue.item_added.connect(added.append)
+    queue.item_updated.connect(lambda item: updates.append(item.status))
+    items = [queue.add_download(f"/remote/{n}", str(tmp_path / str(n)), 100) for n in range(3)]
+    for item in items:
+        _wait_for(lambda: not item.is_active)
+    queue.shutdown()
+    assert added == items
+    assert all(item.status == TransferStatus.DONE and item.transferred == 100 for item in items)
+    assert TransferStatus.RUNNING in updates
+    assert not any(worker.is_alive() for worker in queue._workers + queue._retired)
+
+
+def test_pause_and_cancel(tmp_path):
+    file_manager = FakeFileManager()
+    file_manager.release.clear()
+    queue = TransferQueue(file_manager, concurrency=1)
+    running = queue.add_download("/remote/a", str(tmp_path / "a"), 100)
+    queued = queue.add_download("/remote/b", str(tmp_path / "b"), 100)
+    assert file_manager.started.acquire(timeout=5)
+    queue.cancel(queued)
+    assert queued.status == TransferStatus.CANCELLED
+    queue.pause(running)
+    file_manager.release.set()
+    _wait_for(lambda: running.status == TransferStatus.PAUSED)
+    queue.resume(running)
+    _wait_for(lambda: running.status == TransferStatus.DONE)
+    queue.shutdown()
+    assert file_manager.resumes == [False, True]
+
+
+def test_fresh_upload_is_compressed(ssh_manager, tmp_path, monkeypatch):
+    compressed = []
+    upload = CompressedTransfer.upload
+    
+    def _upload(self, local_path, remote_path, *args, **kwargs):
+        compressed.append(remote_path)
+        return upload(self, local_path, remote_path, *args, **kwargs)
+        
+    monkeypatch.setattr(CompressedTransfer, "upload", _upload)
+    file_manager = FileManager(ssh_manager)
+    file_manager._state_store = TransferStateStore(str(tmp_path / "state.json"))
+    local_path = tmp_path / "app.log"
+    local_path.write_bytes(b"GET /index.html 200\n" * 50000)
+    remote_path = str(tmp_path / "remote.log")
+    
+    queue = TransferQueue(file_manager)
+    item = queue.add_upload(str(local_path), remote_path)
+    _wait_for(lambda: not item.is_active)
+    queue.shutdown()
+    assert item.status == TransferStatus.DONE, item.error
+    assert compressed == [remote_path]
+    assert (tmp_path / "remote.log").read_bytes() == local_path.read_bytes()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
@@ -0,0 +1,368 @@
+"""Folder synchronization dialog"""
+import time
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QPushButton,
+    QLabel, QTableView, QHeaderView, QAbstractItemView, QProgressBar,
+    QFileDialog, QMessageBox, QMenu
+)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, Signal
+
+from core.errors import TransferCancelled
+from core.sync_engine import SyncAction, SyncEngine, SyncEntry, SyncPlan
+from ui.widgets.transfer_panel import format_bytes
+
+
+class SyncPlanModel(QAbstractTableModel):
+    """Table model listing the entries of a sync plan"""
+    
+    COLUMNS = ["Path", "Action", "Local", "Remote", "Reason"]
+    
+    def __init__(self, parent=None):
+        """Initialize sync plan model
+        
+        Args:
+            parent: Parent object (optional)
+        """
+        super().__init__(parent)
+        self.entries = []
+        
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Number of planned entries"""
+        return 0 if parent.isValid() else len(self.entries)
+        
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Number of columns"""
+        return 0 if parent.isValid() else len(self.COLUMNS)
+        
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        """Column titles"""
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+        
+    @staticmethod
+    def _format_state(state) -> str:
+        """Format a (size, mtime) pair"""
+        if state is None:
+            return "—"
+        size, mtime = state
+        return f"{format_bytes(size)}, {time.strftime('%Y-%m-%d %H:%M', time.localtime(mtime))}"
+        
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Format a cell on demand"""
+        entry = self.entries[index.row()]
+        column = index.column()
+        
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return entry.path
+            if column == 1:
+                if entry.done:
+                    return f"{entry.action} ✔"
+                return f"{entry.action} ✖" if entry.error else entry.action
+            if column == 2:
+                return self._format_state(entry.local)
+            if column == 3:
+                return self._format_state(entry.remote)
+            return entry.error or entry.reason
+        if role == Qt.ToolTipRole and column == 4:
+            return entry.error or entry.reason
+        return None
+        
+    def set_entries(self, entries):
+        """Replace the shown entries
+        
+        Args:
+            entries: List of SyncEntry objects
+        """
+        self.beginResetModel()
+        self.entries = list(entries)
+        self.endResetModel()
+        
+    def entries_changed(self, rows=None):
+        """Repaint rows whose entries were changed in place
+        
+        Args:
+            rows: Changed rows (optional, defaults to all)
+        """
+        if not self.entries:
+            return
+        if rows is None:
+            rows = [0, len(self.entries) - 1]
+        self.dataChanged.emit(
+            self.index(min(rows), 0), self.index(max(rows), len(self.COLUMNS) - 1)
+        )
+
+
+class SyncWorker(QThread):
+    """Background thread that plans or runs a sync"""
+    
+    planned = Signal(object)  # SyncPlan
+    progress = Signal(int, int, int, int)  # bytes, total bytes, entries, total entries
+    synced = Signal(object)  # List[SyncEntry] that failed
+    failed = Signal(str)  # error_message
+    cancelled = Signal()
+    
+    def __init__(self, engine: SyncEngine, local_folder: str = None,
+                 remote_folder: str = None, plan: SyncPlan = None):
+        """Initialize sync worker
+        
+        Args:
+            engine: Sync engine
+            local_folder: Local folder to plan (when no plan is given)
+            remote_folder: Remote folder to plan (when no plan is given)
+            plan: Plan to execute (optional)
+        """
+        super().__init__()
+        self.engine = engine
+        self.local_folder = local_folder
+        self.remote_folder = remote_folder
+        self.plan = plan
+        
+    def run(self):
+        """Plan or execute and report the outcome"""
+        try:
+            if self.plan is None:
+                self.planned.emit(self.engine.plan(self.local_folder, self.remote_folder))
+            else:
+                def _progress(transferred, total, entries, total_entries):
+                    self.progress.emit(transferred, total, entries, total_entries)
+                    
+                self.synced.emit(self.engine.execute(self.plan, _progress))
+        except TransferCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class SyncDialog(QDialog):
+    """Dialog that compares a local and a remote folder and syncs them
+    
+    The plan is shown for approval before anything is changed. Conflicts
+    are skipped unless an action is chosen for them from the context menu.
+    """
+    
+    folders_synced = Signal()
+    
+    def __init__(self, file_manager, remote_folder: str = "", parent=None):
+        """Initialize sync dialog
+        
+        Args:
+            file_manager: File manager instance
+            remote_folder: Remote folder shown initially (optional)
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.file_manager = file_manager
+        self.engine = SyncEngine(file_manager)
+        self.plan = None
+        self._worker = None
+        self._setup_ui(remote_folder)
+        
+    def _setup_ui(self, remote_folder: str):
+        """Setup user interface"""
+        self.setWindowTitle("Synchronize Folders")
+        self.resize(900, 600)
+        
+        layout = QVBoxLayout(self)
+        
+        # Folder pair
+        form = QFormLayout()
+        local_layout = QHBoxLayout()
+        self.local_edit = QLineEdit()
+        self.local_edit.setPlaceholderText("local folder")
+        browse_btn = QPushButton("Browse…")
+        browse_btn.clicked.connect(self._browse_local)
+        local_layout.addWidget(self.local_edit)
+        local_layout.addWidget(browse_btn)
+        form.addRow("Local folder:", local_layout)
+        
+        self.remote_edit = QLineEdit(remote_folder)
+        self.remote_edit.setPlaceholderText("absolute remote folder")
+        form.addRow("Remote folder:", self.remote_edit)
+        layout.addLayout(form)
+        
+        # Plan
+        self.plan_model = SyncPlanModel(self)
+        self.plan_view = QTableView()
+        self.plan_view.setModel(self.plan_model)
+        self.plan_view.setShowGrid(False)
+        self.plan_view.setWordWrap(False)
+        self.plan_view.verticalHeader().setVisible(False)
+        self.plan_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.plan_view.verticalHeader().setDefaultSectionSize(22)
+        self.plan_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.plan_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.plan_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.plan_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.plan_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.plan_view.customContextMenuRequested.connect(self._show_context_menu)
+        layout.addWidget(self.plan_view)
+        
+        self.summary_label = QLabel("Choose a local folder and compare.")
+        layout.addWidget(self.summary_label)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        # Buttons
+        buttons = QHBoxLayout()
+        self.compare_btn = QPushButton("Compare")
+        self.compare_btn.clicked.connect(self._compare)
+        self.sync_btn = QPushButton("Synchronize")
+        self.sync_btn.setEnabled(False)
+        self.sync_btn.clicked.connect(self._synchronize)
+        self.stop_btn = QPushButton("✖ Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.engine.cancel)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        
+        buttons.addWidget(self.compare_btn)
+        buttons.addWidget(self.sync_btn)
+        buttons.addWidget(self.stop_btn)
+        buttons.addStretch()
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+        
+    def _browse_local(self):
+        """Pick the local folder"""
+        folder_path = QFileDialog.getExistingDirectory(self, "Select local folder", self.local_edit.text())
+        if folder_path:
+            self.local_edit.setText(folder_path)
+            
+    def _set_busy(self, busy: bool):
+        """Enable the controls matching the running state"""
+        self.compare_btn.setEnabled(not busy)
+        self.sync_btn.setEnabled(not busy and self.plan is not None and bool(self.plan.entries))
+        self.stop_btn.setEnabled(busy)
+        self.local_edit.setEnabled(not busy)
+        self.remote_edit.setEnabled(not busy)
+        
+    def _start(self, worker: SyncWorker):
+        """Run a worker and track its state"""
+        worker.failed.connect(self._on_failed)
+        worker.cancelled.connect(self._on_cancelled)
+        self._worker = worker
+        self._set_busy(True)
+        worker.start()
+        
+    def _compare(self):
+        """Scan both folders and show the plan"""
+        local_folder = self.local_edit.text().strip()
+        remote_folder = self.file_manager.normalize_path(self.remote_edit.text().strip() or ".")
+        if not local_folder:
+            QMessageBox.information(self, "Synchronize", "Choose a local folder first.")
+            return
+        self.remote_edit.setText(remote_folder)
+        self.plan = None
+        self.plan_model.set_entries([])
+        self.summary_label.setText("Comparing…")
+        worker = SyncWorker(self.engine, local_folder, remote_folder)
+        worker.planned.connect(self._on_planned)
+        self._start(worker)
+        
+    def _on_planned(self, plan: SyncPlan):
+        """Show a finished plan"""
+        self.plan = plan
+        self.plan_model.set_entries(plan.entries)
+        self._set_busy(False)
+        self._update_summary(f"Compared in {plan.scan_seconds:.1f} s")
+        
+    def _update_summary(self, prefix: str = ""):
+        """Show what the plan will do"""
+        if self.plan is None:
+            return
+        text = f"{self.plan} — {format_bytes(self.plan.transfer_bytes)} to transfer"
+        if self.plan.conflicts:
+            text += ". Conflicts are skipped unless an action is chosen (right click)."
+        self.summary_label.setText(f"{prefix}: {text}" if prefix else text)
+        
+    def _show_context_menu(self, pos):
+        """Offer actions for the selected entries"""
+        rows = sorted({index.row() for index in self.plan_view.selectionModel().selectedRows()})
+        if not rows or self._worker is not None and self._worker.isRunning():
+            return
+        entries = [self.plan_model.entries[row] for row in rows]
+        menu = QMenu(self)
+        if all(entry.local is not None for entry in entries):
+            menu.addAction("Upload (keep local)", lambda: self._set_action(rows, SyncAction.UPLOAD))
+            menu.addAction("Delete local", lambda: self._set_action(rows, SyncAction.DELETE_LOCAL))
+        if all(entry.remote is not None for entry in entries):
+            menu.addAction("Download (keep remote)", lambda: self._set_action(rows, SyncAction.DOWNLOAD))
+            menu.addAction("Delete remote", lambda: self._set_action(rows, SyncAction.DELETE_REMOTE))
+        menu.addAction("Skip", lambda: self._set_action(rows, SyncAction.SKIP))
+        menu.exec(self.plan_view.viewport().mapToGlobal(pos))
+        
+    def _set_action(self, rows, action: str):
+        """Change the action of plan entries"""
+        for row in rows:
+            entry: SyncEntry = self.plan_model.entries[row]
+            entry.action = action
+            entry.done = False
+            entry.error = ""
+        self.plan_model.entries_changed(rows)
+        self._update_summary()
+        
+    def _synchronize(self):
+        """Run the approved plan"""
+        if self.plan is None:
+            return
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        worker = SyncWorker(self.engine, plan=self.plan)
+        worker.progress.connect(self._on_progress)
+        worker.synced.connect(self._on_synced)
+        self._start(worker)
+        
+    def _on_progress(self, transferred: int, total: int, entries: int, total_entries: int):
+        """Update the sync progress"""
+        if total:
+            self.progress_bar.setValue(int(transferred * 1000 / total))
+        else:
+            self.progress_bar.setValue(int(entries * 1000 / total_entries) if total_entries else 1000)
+        self.summary_label.setText(
+            f"Synchronizing: {entries}/{total_entries} files, "
+            f"{format_bytes(transferred)} of {format_bytes(total)}"
+        )
+        
+    def _on_synced(self, failed):
+        """Report a finished sync"""
+        self._finish_run()
+        if failed:
+            self.summary_label.setText(f"Synchronized with {len(failed)} errors; see the Reason column.")
+        else:
+            skipped = self.plan.count(SyncAction.CONFLICT) + self.plan.count(SyncAction.SKIP)
+            self.summary_label.setText(f"Synchronized. {skipped} entries skipped.")
+            
+    def _finish_run(self):
+        """Reset the controls after a sync stopped"""
+        self.progress_bar.setVisible(False)
+        self.plan_model.entries_changed()
+        self._set_busy(False)
+        self.folders_synced.emit()
+        
+    def _on_cancelled(self):
+        """Handle a stopped compare or sync"""
+        if self.plan is not None and self._worker.plan is not None:
+            self._finish_run()
+        else:
+            self._set_busy(False)
+        self.summary_label.setText("Stopped.")
+        
+    def _on_failed(self, error: str):
+        """Report a failed compare or sync"""
+        self.progress_bar.setVisible(False)
+        self._set_busy(False)
+        self.summary_label.setText("Failed.")
+        QMessageBox.critical(self, "Synchronize", f"Synchronization failed: {error}")
+        
+    def closeEvent(self, event):
+        """Stop the running worker before closing"""
+        if self._worker is not None and self._worker.isRunning():
+            self.engine.cancel()
+            self._worker.wait()
+        event.accept()
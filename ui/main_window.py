@@ -2,19 +2,26 @@
 import stat
 from PySide6.QtWidgets import (
     QMainWindow, QSplitter, QToolBar, QStatusBar, QMessageBox, QMenuBar,
-    QFileDialog
+    QFileDialog, QDockWidget
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QAction
 
 from core.ssh_manager import SSHManager
 from core.file_manager import FileManager
+from core.remote_index import IndexCrawler, RemoteIndex
+from core.transfer_queue import TransferQueue
 from core.version_manager import VersionManager
+from ui.qt_bridge import in_gui_thread
 from ui.widgets.terminal_widget import TerminalWidget
 from ui.widgets.file_browser_widget import FileBrowserWidget
+from ui.widgets.index_search_widget import IndexSearchWidget
+from ui.widgets.remote_search_widget import RemoteSearchWidget
+from ui.widgets.transfer_panel import TransferPanel
 from ui.dialogs.update_dialog import UpdateDialog
 from ui.dialogs.about_dialog import AboutDialog
 from ui.dialogs.command_shortcuts_dialog import CommandShortcutsDialog
+from ui.dialogs.sync_dialog import SyncDialog
 
 
 class MainWindow(QMainWindow):
@@ -31,6 +38,16 @@ class MainWindow(QMainWindow):
         self.ssh_manager = ssh_manager
         self.file_manager = FileManager(ssh_manager)
         self.version_manager = version_manager or VersionManager()
+        self.file_manager.compression_enabled = self.version_manager.config_manager.get(
+            "transfer_compression", True
+        )
+        self.file_manager.verify_transfers = self.version_manager.config_manager.get(
+            "verify_transfers", True
+        )
+        self.transfer_queue = TransferQueue(
+            self.file_manager,
+            self.version_manager.config_manager.get("transfer_concurrency", 3)
+        )
         
         self.setWindowTitle(f"SFTP GUI Manager v{self.version_manager.get_current_version()}")
         self.resize(1400, 800)
@@ -61,7 +78,7 @@ class MainWindow(QMainWindow):
         )
         
         # Create file browser widget
-        self.file_browser = FileBrowserWidget(self.file_manager)
+        self.file_browser = FileBrowserWidget(self.file_manager, self.transfer_queue)
         
         # Add widgets to splitter
         splitter.addWidget(self.terminal_widget)
@@ -70,6 +87,39 @@ class MainWindow(QMainWindow):
         
         self.setCentralWidget(splitter)
         
+        # Create transfers dock
+        self.transfer_panel = TransferPanel(self.transfer_queue)
+        self.transfer_dock = QDockWidget("Transfers", self)
+        self.transfer_dock.setObjectName("TransfersDock")
+        self.transfer_dock.setWidget(self.transfer_panel)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.transfer_dock)
+        self.transfer_queue.restore_pending()
+        
+        # Create index search dock
+        config = self.version_manager.config_manager
+        host_id = f"{self.ssh_manager.username}@{self.ssh_manager.host}:{self.ssh_manager.port}"
+        remote_index = RemoteIndex.for_host(host_id)
+        crawler = IndexCrawler(self.ssh_manager, remote_index, config.get("remote_index_root", "."))
+        self.index_search = IndexSearchWidget(remote_index, crawler)
+        self.index_search.path_activated.connect(self.file_browser.open_path)
+        self.index_dock = QDockWidget("Search Index", self)
+        self.index_dock.setObjectName("SearchIndexDock")
+        self.index_dock.setWidget(self.index_search)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.index_dock)
+        self.index_dock.hide()
+        if config.get("remote_index", True):
+            self.index_search.start_crawl()
+            
+        # Create server search dock
+        self.remote_search = RemoteSearchWidget(self.file_manager)
+        self.remote_search.path_activated.connect(self.file_browser.open_path)
+        self.remote_search_dock = QDockWidget("Find on Server", self)
+        self.remote_search_dock.setObjectName("FindOnServerDock")
+        self.remote_search_dock.setWidget(self.remote_search)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.remote_search_dock)
+        self.tabifyDockWidget(self.transfer_dock, self.remote_search_dock)
+        self.transfer_dock.raise_()
+        
     def _setup_menu(self):
         """Setup application menu"""
         menubar = self.menuBar()
@@ -109,6 +159,22 @@ class MainWindow(QMainWindow):
         shortcuts_action.triggered.connect(self._show_command_shortcuts)
         tools_menu.addAction(shortcuts_action)
         
+        sync_action = QAction("Synchronize Folder", self)
+        sync_action.triggered.connect(self._show_sync_dialog)
+        tools_menu.addAction(sync_action)
+        
+        tools_menu.addAction(self.transfer_dock.toggleViewAction())
+        
+        search_action = QAction("Search Index", self)
+        search_action.setShortcut("Ctrl+Shift+F")
+        search_action.triggered.connect(self._show_index_search)
+        tools_menu.addAction(search_action)
+        
+        find_action = QAction("Find on Server", self)
+        find_action.setShortcut("Ctrl+Shift+G")
+        find_action.triggered.connect(self._show_remote_search)
+        tools_menu.addAction(find_action)
+        
         tools_menu.addSeparator()
         
         settings_action = QAction("Update Settings", self)
@@ -163,12 +229,14 @@ class MainWindow(QMainWindow):
     def _setup_connections(self):
         """Setup signal connections"""
         # File manager signals
-        self.file_manager.directory_changed.connect(self._on_directory_changed)
-        self.file_manager.file_uploaded.connect(self._on_file_uploaded)
-        self.file_manager.file_downloaded.connect(self._on_file_downloaded)
+        self.file_manager.directory_changed.connect(in_gui_thread(self._on_directory_changed))
+        self.file_manager.file_uploaded.connect(in_gui_thread(self._on_file_uploaded))
+        self.file_manager.file_downloaded.connect(in_gui_thread(self._on_file_downloaded))
         
-        # SSH manager signals
-        self.ssh_manager.connection_lost.connect(self._on_connection_lost)
+        # SSH manager events
+        self.ssh_manager.connection_lost.connect(in_gui_thread(self._on_connection_lost))
+        self.ssh_manager.reconnecting.connect(in_gui_thread(self._on_reconnecting))
+        self.ssh_manager.reconnected.connect(in_gui_thread(self._on_reconnected))
         
         # Version manager signals
         self.version_manager.update_available.connect(self._on_update_available)
@@ -208,8 +276,12 @@ class MainWindow(QMainWindow):
             
             # Create new SSH manager and connect
             try:
-                new_ssh_manager = SSHManager()
+                new_ssh_manager = SSHManager(pool_size=self.ssh_manager.pool_size)
                 new_ssh_manager.connect(host, port, username, password)
+                if self.ssh_manager.transfer_clients:
+                    new_ssh_manager.open_transfer_connections(
+                        1 + len(self.ssh_manager.transfer_clients)
+                    )
                 
                 # Create new main window
                 new_window = MainWindow(new_ssh_manager, self.version_manager)
@@ -241,6 +313,24 @@ class MainWindow(QMainWindow):
             from PySide6.QtWidgets import QMessageBox
             QMessageBox.critical(self, "Error", f"Failed to open command shortcuts dialog:\n{str(e)}")
         
+    def _show_sync_dialog(self):
+        """Show the folder synchronization dialog for the current directory"""
+        dialog = SyncDialog(self.file_manager, self.file_manager.current_path, self)
+        dialog.folders_synced.connect(self.file_browser.schedule_refresh)
+        dialog.show()
+        
+    def _show_index_search(self):
+        """Show the index search dock and focus its search box"""
+        self.index_dock.show()
+        self.index_dock.raise_()
+        self.index_search.focus_search()
+        
+    def _show_remote_search(self):
+        """Show the server search dock and focus its name box"""
+        self.remote_search_dock.show()
+        self.remote_search_dock.raise_()
+        self.remote_search.focus_search()
+        
     def _execute_command_shortcut(self, command: str):
         """Execute a command shortcut in the terminal
         
@@ -260,15 +350,27 @@ class MainWindow(QMainWindow):
     def _on_file_uploaded(self, filename: str):
         """Handle file upload completion"""
         self.status_bar.showMessage(f"Uploaded: {filename}", 3000)
-        self.file_browser.refresh()
+        self.file_browser.schedule_refresh()
         
     def _on_file_downloaded(self, filename: str):
         """Handle file download completion"""
         self.status_bar.showMessage(f"Downloaded: {filename}", 3000)
         
+    def _on_reconnecting(self, attempt: int):
+        """Show that a lost connection is being restored"""
+        self.status_bar.showMessage(f"Connection lost, reconnecting (attempt {attempt})…")
+        
+    def _on_reconnected(self):
+        """Handle a restored connection"""
+        self.status_bar.showMessage(f"Reconnected to {self.ssh_manager.host}", 5000)
+        self.file_browser.schedule_refresh()
+        
     def _on_connection_lost(self):
         """Handle connection loss"""
-        QMessageBox.critical(self, "Connection Lost", "Connection to server was lost.")
+        QMessageBox.critical(
+            self, "Connection Lost",
+            "Connection to server was lost and could not be restored."
+        )
         self.close()
         
     def _on_update_available(self, version_info):
@@ -289,5 +391,8 @@ class MainWindow(QMainWindow):
         
     def closeEvent(self, event):
         """Handle window close event"""
+        self.transfer_queue.shutdown()
+        self.index_search.shutdown()
+        self.remote_search.shutdown()
         self.ssh_manager.disconnect()
         event.accept()
@@ -0,0 +1,48 @@
+"""Delivery of core events to the Qt GUI thread"""
+import functools
+from typing import Callable, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, Signal
+
+
+class _Invoker(QObject):
+    """Runs functions posted from any thread in the thread it lives in"""
+    
+    call = Signal(object)  # function without arguments
+    
+    def __init__(self):
+        """Initialize invoker"""
+        super().__init__()
+        self.call.connect(self._run)
+        
+    def _run(self, function: Callable):
+        """Run a posted function"""
+        function()
+
+
+_invoker: Optional[_Invoker] = None
+
+
+def in_gui_thread(callback: Callable) -> Callable:
+    """Wrap a callback so core events run it in the GUI thread
+    
+    Core events call their callbacks in whichever thread emits them,
+    e.g. a transfer worker. The wrapper posts the call to the GUI thread
+    the way a queued Qt connection would; called from the GUI thread, it
+    runs the callback at once.
+    
+    Args:
+        callback: Function touching widgets
+        
+    Returns:
+        Function to connect to a core event
+    """
+    global _invoker
+    if _invoker is None:
+        _invoker = _Invoker()
+        _invoker.moveToThread(QCoreApplication.instance().thread())
+        
+    def _post(*args):
+        _invoker.call.emit(functools.partial(callback, *args))
+        
+    return _post
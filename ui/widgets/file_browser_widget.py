@@ -6,30 +6,131 @@ import tempfile
 import time
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit,
-    QTreeWidget, QTreeWidgetItem, QMessageBox, QMenu, QInputDialog,
+    QTableView, QHeaderView, QMessageBox, QMenu, QInputDialog,
     QFileDialog, QProgressDialog, QApplication, QAbstractItemView,
     QGroupBox, QComboBox, QLabel
 )
-from PySide6.QtCore import Qt, QUrl, QThread, Signal
+from PySide6.QtCore import Qt, QUrl, QThread, Signal, QTimer
 from PySide6.QtGui import QDrag
 from PySide6.QtCore import QMimeData
 import subprocess
 
 from core.file_manager import FileManager
+from core.transfer_queue import TransferQueue
+from ui.qt_bridge import in_gui_thread
+from ui.widgets.remote_file_model import RemoteFileModel
 from utils.file_watcher import FileWatcher
 
 
+class DirectoryLister(QThread):
+    """Background thread that streams a directory listing in batches"""
+    
+    listing_started = Signal(str)  # resolved_path
+    batch_ready = Signal(object)  # List[RemoteFileInfo]
+    listing_finished = Signal(int)  # total entries
+    listing_failed = Signal(str)  # error_message
+    
+    def __init__(self, file_manager: FileManager, path: str = None, force: bool = False):
+        """Initialize directory lister
+        
+        Args:
+            file_manager: File manager instance
+            path: Remote directory path (optional)
+            force: Ignore the listing cache
+        """
+        super().__init__()
+        self.file_manager = file_manager
+        self.path = path
+        self.force = force
+        self._cancelled = False
+        
+    def run(self):
+        """List the directory and emit batches"""
+        total = 0
+        batches = self.file_manager.iter_directory(self.path, force=self.force)
+        try:
+            for resolved, batch in batches:
+                if self._cancelled:
+                    return
+                if not batch:
+                    self.listing_started.emit(resolved)
+                    continue
+                total += len(batch)
+                self.batch_ready.emit(batch)
+            self.listing_finished.emit(total)
+        except Exception as e:
+            if not self._cancelled:
+                self.listing_failed.emit(str(e))
+        finally:
+            batches.close()
+            
+    def cancel(self):
+        """Stop listing at the next batch"""
+        self._cancelled = True
+
+class FolderUploadWorker(QThread):
+    """Background thread uploading a folder through the file manager"""
+    
+    progress = Signal(int, int, int, int)  # bytes, total bytes, entries, total entries
+    upload_finished = Signal(bool)  # success
+    
+    def __init__(self, file_manager: FileManager, folder_path: str, only_changed: bool = False):
+        """Initialize folder upload worker
+        
+        Args:
+            file_manager: File manager instance
+            folder_path: Local folder to upload into the current directory
+            only_changed: Skip files that are unchanged on the server
+        """
+        super().__init__()
+        self.file_manager = file_manager
+        self.folder_path = folder_path
+        self.only_changed = only_changed
+        self._cancelled = False
+        
+    def run(self):
+        """Upload the folder and report progress"""
+        def _progress(sent_bytes, total_bytes, entries, total_entries):
+            self.progress.emit(sent_bytes, total_bytes, entries, total_entries)
+            return not self._cancelled
+            
+        try:
+            result = self.file_manager.upload_folder(
+                self.folder_path, only_changed=self.only_changed, progress_callback=_progress
+            )
+        except Exception as e:
+            print(f"Failed to upload folder {self.folder_path}: {e}")
+            result = False
+        self.upload_finished.emit(result)
+        
+    def cancel(self):
+        """Stop the upload at its next progress report"""
+        self._cancelled = True
+
+
 class FileBrowserWidget(QWidget):
     """Widget for browsing and managing remote files"""
     
-    def __init__(self, file_manager: FileManager):
+    def __init__(self, file_manager: FileManager, transfer_queue: TransferQueue = None):
         """Initialize file browser widget
         
         Args:
             file_manager: File manager instance
+            transfer_queue: Queue running uploads and downloads (optional)
         """
         super().__init__()
         self.file_manager = file_manager
+        self.transfer_queue = transfer_queue or TransferQueue(file_manager)
+        self._lister = None
+        self._old_listers = []  # cancelled listers kept alive until their thread exits
+        self._upload_workers = []  # folder uploads kept alive until their thread exits
+        
+        # Coalesce refreshes when many queued uploads finish in a burst
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(300)
+        self._refresh_timer.timeout.connect(lambda: self.refresh(force=False))
+        
         self._setup_ui()
         self._setup_connections()
         self.refresh()
@@ -50,9 +151,16 @@ class FileBrowserWidget(QWidget):
         self.path_input = QLineEdit()
         self.path_input.returnPressed.connect(self._go_to_path)
         
+        self.loading_label = QLabel()
+        self.stop_btn = QPushButton("✖ Stop")
+        self.stop_btn.clicked.connect(self._stop_listing)
+        self.stop_btn.setVisible(False)
+        
         nav_layout.addWidget(self.back_btn)
         nav_layout.addWidget(self.up_btn)
         nav_layout.addWidget(self.path_input)
+        nav_layout.addWidget(self.loading_label)
+        nav_layout.addWidget(self.stop_btn)
         
         layout.addLayout(nav_layout)
         
@@ -67,9 +175,31 @@ class FileBrowserWidget(QWidget):
         
         layout.addWidget(settings_group)
         
-        # File tree
-        self.file_tree = QTreeWidget()
-        self.file_tree.setHeaderLabels(["Name", "Size", "Type", "Modified"])
+        # Filter
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter by name…")
+        self.filter_input.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_input)
+        
+        # File list
+        self.file_model = RemoteFileModel(self)
+        self.filter_input.textChanged.connect(self.file_model.set_filter)
+        
+        # A table view only asks for the rows it paints; a tree view would
+        # walk every row to lay out expandable items
+        self.file_tree = QTableView()
+        self.file_tree.setModel(self.file_model)
+        self.file_tree.setShowGrid(False)
+        self.file_tree.setWordWrap(False)
+        self.file_tree.verticalHeader().setVisible(False)
+        self.file_tree.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.file_tree.verticalHeader().setDefaultSectionSize(22)
+        self.file_tree.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.file_tree.horizontalHeader().setHighlightSections(False)
+        self.file_tree.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.file_tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.file_tree.setSortingEnabled(True)
+        self.file_tree.sortByColumn(0, Qt.AscendingOrder)
         self.file_tree.setAlternatingRowColors(True)
         self.file_tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.file_tree.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -79,164 +209,186 @@ class FileBrowserWidget(QWidget):
         self.file_tree.setDragDropMode(QAbstractItemView.DragDrop)
         
         # Connect signals
-        self.file_tree.itemDoubleClicked.connect(self._handle_double_click)
+        self.file_tree.doubleClicked.connect(self._handle_double_click)
         self.file_tree.customContextMenuRequested.connect(self._show_context_menu)
+        self.file_tree.setMouseTracking(True)
+        self.file_tree.entered.connect(self._prefetch_index)
+        self.file_tree.selectionModel().currentRowChanged.connect(self._prefetch_index)
         
         layout.addWidget(self.file_tree)
         
     def _setup_connections(self):
         """Setup signal connections"""
-        self.file_manager.directory_changed.connect(self._on_directory_changed)
-        self.file_manager.file_uploaded.connect(self._on_file_uploaded)
-        self.file_manager.file_downloaded.connect(self._on_file_downloaded)
+        self.file_manager.directory_changed.connect(in_gui_thread(self._on_directory_changed))
+        self.file_manager.file_uploaded.connect(in_gui_thread(self._on_file_uploaded))
+        self.file_manager.file_downloaded.connect(in_gui_thread(self._on_file_downloaded))
         
-    def refresh(self):
-        """Refresh file listing"""
-        try:
-            files = self.file_manager.list_directory()
-            self._populate_tree(files)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to refresh directory: {e}")
-            
-    def _populate_tree(self, files):
-        """Populate tree with file list
+    def schedule_refresh(self):
+        """Refresh file listing shortly, merging repeated requests"""
+        self._refresh_timer.start()
+        
+    def refresh(self, force: bool = True):
+        """Refresh file listing
         
         Args:
-            files: List of RemoteFileInfo objects
+            force: Fetch the listing from the server even if it is cached
         """
-        self.file_tree.clear()
-        
-        for file_info in files:
-            item = QTreeWidgetItem([
-                ("📁 " + file_info.filename) if file_info.is_directory else file_info.filename,
-                file_info.size_formatted,
-                "Folder" if file_info.is_directory else "File",
-                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(file_info.modified_time))
-            ])
-            item.setData(0, Qt.UserRole, file_info)
-            self.file_tree.addTopLevelItem(item)
-            
-    def _handle_double_click(self, item, column):
+        self._navigate(self.file_manager.current_path, record_history=False, force=force)
+        
+    def _navigate(self, path: str, record_history: bool = True, force: bool = False):
+        """List a directory in the background and show it as it arrives
+        
+        Args:
+            path: Remote directory path (relative to the current directory or absolute)
+            record_history: Remember the current directory for Back
+            force: Fetch the listing from the server even if it is cached
+        """
+        self._stop_listing()
+        
+        path = self.file_manager.normalize_path(path)
+        lister = DirectoryLister(self.file_manager, path, force)
+        lister.listing_started.connect(
+            lambda resolved: self._on_listing_started(lister, resolved, record_history)
+        )
+        lister.batch_ready.connect(lambda files: self._on_batch_ready(lister, files))
+        lister.listing_finished.connect(lambda total: self._on_listing_finished(lister, total))
+        lister.listing_failed.connect(lambda error: self._on_listing_failed(lister, path, error))
+        self._lister = lister
+        
+        self.loading_label.setText("Loading…")
+        self.stop_btn.setVisible(True)
+        lister.start()
+        
+    def open_path(self, path: str, is_directory: bool = True):
+        """Show a remote directory, or the directory containing a file
+        
+        Args:
+            path: Absolute remote path
+            is_directory: The path is a directory
+        """
+        if not is_directory:
+            self.filter_input.setText(posixpath.basename(path))
+            path = posixpath.dirname(path)
+        self._navigate(path)
+        
+    def _stop_listing(self):
+        """Cancel the listing in progress, if any"""
+        self._old_listers = [lister for lister in self._old_listers if not lister.isFinished()]
+        if self._lister is not None:
+            self._lister.cancel()
+            self._old_listers.append(self._lister)
+            self._lister = None
+        self.loading_label.setText("")
+        self.stop_btn.setVisible(False)
+        
+    def _on_listing_started(self, lister: DirectoryLister, resolved: str, record_history: bool):
+        """Switch to the listed directory once its path is resolved"""
+        if lister is not self._lister:
+            return
+        if record_history and resolved != self.file_manager.current_path:
+            self.file_manager.path_history.append(self.file_manager.current_path)
+        self.file_manager.set_current_path(resolved)
+        self.file_model.clear()
+        
+    def _on_batch_ready(self, lister: DirectoryLister, files):
+        """Append a batch of entries to the list"""
+        if lister is not self._lister:
+            return
+        self.file_model.append_files(files)
+        self.loading_label.setText(f"Loading… {self.file_model.rowCount()} entries")
+        
+    def _on_listing_finished(self, lister: DirectoryLister, total: int):
+        """Sort the completed listing"""
+        if lister is not self._lister:
+            return
+        self._lister = None
+        self._old_listers.append(lister)
+        self.loading_label.setText("")
+        self.stop_btn.setVisible(False)
+        self.file_model.resort()
+        
+    def _on_listing_failed(self, lister: DirectoryLister, path: str, error: str):
+        """Report a listing error"""
+        if lister is not self._lister:
+            return
+        self._stop_listing()
+        QMessageBox.critical(self, "Error", f"Failed to list {path}: {error}")
+        
+    def _selected_files(self):
+        """Files of the selected rows"""
+        return [
+            self.file_model.file_info(index.row())
+            for index in self.file_tree.selectionModel().selectedRows()
+        ]
+        
+    def _prefetch_index(self, index):
+        """Prefetch the directory under the mouse or the current row"""
+        if index.isValid():
+            file_info = self.file_model.file_info(index.row())
+            if file_info.is_directory:
+                self.file_manager.prefetch_hint(file_info.filename)
+                
+    def _handle_double_click(self, index):
         """Handle double-click on item"""
-        file_info = item.data(0, Qt.UserRole)
+        file_info = self.file_model.file_info(index.row())
         
         if file_info.is_directory:
             # Navigate into directory - use the filename directly
-            try:
-                self.file_manager.change_directory(file_info.filename)
-                self.refresh()
-            except Exception as e:
-                from PySide6.QtWidgets import QMessageBox
-                QMessageBox.critical(self, "Navigation Error", f"Failed to enter directory: {e}")
+            self._navigate(file_info.filename)
         else:
             # Open file for editing
             self._open_file(file_info.filename)
             
     def _go_back(self):
         """Go back to previous directory"""
-        if self.file_manager.go_back():
-            self.refresh()
+        if self.file_manager.path_history:
+            self._navigate(self.file_manager.path_history.pop(), record_history=False)
             
     def _go_up(self):
         """Go to parent directory"""
-        self.file_manager.go_up()
-        self.refresh()
-        
+        parent_path = posixpath.dirname(self.file_manager.current_path)
+        if parent_path != self.file_manager.current_path:
+            self._navigate(parent_path)
+            
     def _go_to_path(self):
         """Navigate to path in input field"""
-        path = self.path_input.text()
-        try:
-            self.file_manager.change_directory(path)
-            self.refresh()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to navigate to {path}: {e}")
-            
+        self._navigate(self.path_input.text())
+        
     def _on_directory_changed(self, path: str):
         """Handle directory change"""
         self.path_input.setText(path)
         
     def _on_file_uploaded(self, filename: str):
         """Handle file upload"""
-        self.refresh()
+        self.schedule_refresh()
         
     def _on_file_downloaded(self, filename: str):
         """Handle file download"""
         pass  # No need to refresh for downloads
         
     def upload_file(self, local_path: str):
-        """Upload a file
+        """Queue a file upload into the current directory
         
         Args:
             local_path: Local file path
         """
-        try:
-            filename = os.path.basename(local_path)
-            
-            # Show progress for large files
-            file_size = os.path.getsize(local_path)
-            if file_size > 1024 * 1024:  # 1MB
-                progress = QProgressDialog(f"Uploading {filename}...", "Cancel", 0, 100, self)
-                progress.setWindowModality(Qt.WindowModal)
-                progress.show()
-                
-                def progress_callback(transferred, total):
-                    if progress.wasCanceled():
-                        return False
-                    percent = int((transferred / total) * 100)
-                    progress.setValue(percent)
-                    QApplication.processEvents()
-                    return True
-                
-                self.file_manager.upload_file(local_path, filename, progress_callback)
-                progress.close()
-            else:
-                self.file_manager.upload_file(local_path, filename)
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Upload Error", f"Failed to upload {filename}: {e}")
+        filename = os.path.basename(local_path)
+        remote_path = posixpath.join(self.file_manager.current_path, filename)
+        self.transfer_queue.add_upload(local_path, remote_path)
             
     def download_selected_file(self):
         """Download selected file"""
-        selected_items = self.file_tree.selectedItems()
-        if not selected_items:
+        selected_files = self._selected_files()
+        if not selected_files:
             QMessageBox.information(self, "Info", "No file selected")
             return
             
-        file_info = selected_items[0].data(0, Qt.UserRole)
+        file_info = selected_files[0]
         if file_info.is_directory:
-            QMessageBox.information(self, "Info", "Cannot download directories")
+            self._download_folder(file_info.filename)
             return
             
-        # Get save location
-        local_path, _ = QFileDialog.getSaveFileName(
-            self, f"Save {file_info.filename}", file_info.filename
-        )
-        
-        if local_path:
-            try:
-                # Show progress for large files
-                if file_info.size > 1024 * 1024:  # 1MB
-                    progress = QProgressDialog(f"Downloading {file_info.filename}...", "Cancel", 0, 100, self)
-                    progress.setWindowModality(Qt.WindowModal)
-                    progress.show()
-                    
-                    def progress_callback(transferred, total):
-                        if progress.wasCanceled():
-                            return False
-                        percent = int((transferred / total) * 100)
-                        progress.setValue(percent)
-                        QApplication.processEvents()
-                        return True
-                    
-                    self.file_manager.download_file(file_info.filename, local_path, progress_callback)
-                    progress.close()
-                else:
-                    self.file_manager.download_file(file_info.filename, local_path)
-                    
-                QMessageBox.information(self, "Success", f"Downloaded {file_info.filename}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Download Error", f"Failed to download {file_info.filename}: {e}")
+        self._download_file(file_info.filename, file_info.size)
                 
     def _open_file(self, filename: str):
         """Open file for editing
@@ -267,51 +419,74 @@ class FileBrowserWidget(QWidget):
             
     def _show_context_menu(self, pos):
         """Show context menu"""
-        item = self.file_tree.itemAt(pos)
+        index = self.file_tree.indexAt(pos)
         menu = QMenu(self)
         
-        if item:
-            file_info = item.data(0, Qt.UserRole)
+        if index.isValid():
+            file_info = self.file_model.file_info(index.row())
             
             if not file_info.is_directory:
                 menu.addAction("Open", lambda: self._open_file(file_info.filename))
-                menu.addAction("Download", lambda: self._download_file(file_info.filename))
+                menu.addAction("Download", lambda: self._download_file(file_info.filename, file_info.size))
+            else:
+                menu.addAction("Download Folder", lambda: self._download_folder(file_info.filename))
             
-            menu.addAction("Delete", lambda: self._delete_file(file_info))
+            selected = self._selected_files()
+            if len(selected) > 1 and any(f.filename == file_info.filename for f in selected):
+                menu.addAction(f"Delete {len(selected)} Items", lambda: self._delete_files(selected))
+            else:
+                menu.addAction("Delete", lambda: self._delete_file(file_info))
             menu.addAction("Rename", lambda: self._rename_file(file_info))
             
         menu.addSeparator()
         menu.addAction("New File", self._create_file)
         menu.addAction("New Folder", self._create_folder)
         menu.addAction("Upload File", self._upload_file_dialog)
+        menu.addAction("Upload Folder", self._upload_folder_dialog)
+        menu.addAction("Upload Changed Files", lambda: self._upload_folder_dialog(only_changed=True))
         
         menu.exec(self.file_tree.viewport().mapToGlobal(pos))
         
-    def _download_file(self, filename: str):
-        """Download specific file"""
+    def _download_file(self, filename: str, size: int = 0):
+        """Queue download of a specific file"""
         local_path, _ = QFileDialog.getSaveFileName(self, f"Save {filename}", filename)
         if local_path:
-            try:
-                self.file_manager.download_file(filename, local_path)
-                QMessageBox.information(self, "Success", f"Downloaded {filename}")
-            except Exception as e:
-                QMessageBox.critical(self, "Download Error", f"Failed to download {filename}: {e}")
+            remote_path = posixpath.join(self.file_manager.current_path, filename)
+            self.transfer_queue.add_download(remote_path, local_path, size)
+            
+    def _download_folder(self, folder_name: str):
+        """Queue recursive download of a folder"""
+        parent_path = QFileDialog.getExistingDirectory(self, f"Download {folder_name} into")
+        if parent_path:
+            remote_path = posixpath.join(self.file_manager.current_path, folder_name)
+            local_path = os.path.join(parent_path, folder_name)
+            self.transfer_queue.add_folder_download(remote_path, local_path)
                 
     def _delete_file(self, file_info):
         """Delete file or directory"""
+        self._delete_files([file_info])
+        
+    def _delete_files(self, files):
+        """Delete files or empty directories after confirmation"""
+        names = [file_info.filename for file_info in files]
+        what = f"'{names[0]}'" if len(names) == 1 else f"{len(names)} items"
         reply = QMessageBox.question(
             self, "Delete", 
-            f"Are you sure you want to delete '{file_info.filename}'?",
+            f"Are you sure you want to delete {what}?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
         
         if reply == QMessageBox.Yes:
             try:
-                self.file_manager.delete_file(file_info.filename)
-                self.refresh()
+                errors = self.file_manager.delete_files(names)
             except Exception as e:
-                QMessageBox.critical(self, "Delete Error", f"Failed to delete {file_info.filename}: {e}")
+                QMessageBox.critical(self, "Delete Error", f"Failed to delete {what}: {e}")
+                return
+            self.refresh(force=False)
+            if errors:
+                details = "\n".join(f"{name}: {error}" for name, error in list(errors.items())[:20])
+                QMessageBox.critical(self, "Delete Error", f"Failed to delete:\n{details}")
                 
     def _rename_file(self, file_info):
         """Rename file or directory"""
@@ -324,7 +499,7 @@ class FileBrowserWidget(QWidget):
         if ok and new_name and new_name != file_info.filename:
             try:
                 self.file_manager.rename_file(file_info.filename, new_name)
-                self.refresh()
+                self.refresh(force=False)
             except Exception as e:
                 QMessageBox.critical(self, "Rename Error", f"Failed to rename {file_info.filename}: {e}")
                 
@@ -334,7 +509,7 @@ class FileBrowserWidget(QWidget):
         if ok and filename:
             try:
                 self.file_manager.create_file(filename)
-                self.refresh()
+                self.refresh(force=False)
             except Exception as e:
                 QMessageBox.critical(self, "Create File Error", f"Failed to create {filename}: {e}")
                 
@@ -344,7 +519,7 @@ class FileBrowserWidget(QWidget):
         if ok and folder_name:
             try:
                 self.file_manager.create_directory(folder_name)
-                self.refresh()
+                self.refresh(force=False)
             except Exception as e:
                 QMessageBox.critical(self, "Create Folder Error", f"Failed to create folder {folder_name}: {e}")
                 
@@ -354,6 +529,47 @@ class FileBrowserWidget(QWidget):
         if file_path:
             self.upload_file(file_path)
             
+    def _upload_folder_dialog(self, only_changed: bool = False):
+        """Show folder upload dialog
+        
+        Args:
+            only_changed: Skip files that are unchanged on the server
+        """
+        folder_path = QFileDialog.getExistingDirectory(self, "Select folder to upload")
+        if not folder_path:
+            return
+        folder_name = os.path.basename(os.path.normpath(folder_path))
+        
+        progress = QProgressDialog(f"Uploading folder {folder_name}...", "Cancel", 0, 1000, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setValue(0)
+        
+        worker = FolderUploadWorker(self.file_manager, folder_path, only_changed)
+        progress.canceled.connect(worker.cancel)
+        
+        def _on_progress(sent_bytes, total_bytes, entries, total_entries):
+            if total_bytes:
+                progress.setValue(int(sent_bytes * 1000 / total_bytes))
+            progress.setLabelText(
+                f"Uploading {folder_name}: {entries}/{total_entries} entries, "
+                f"{sent_bytes / (1024 * 1024):.1f} of {total_bytes / (1024 * 1024):.1f} MB"
+            )
+            
+        def _on_finished(result):
+            progress.close()
+            self._upload_workers.remove(worker)
+            if not result:
+                QMessageBox.warning(self, "Upload Folder", f"Folder upload did not complete: {folder_path}")
+            elif only_changed:
+                QMessageBox.information(self, "Upload Folder", str(self.file_manager.last_upload_summary))
+            self.refresh(force=False)
+            
+        worker.progress.connect(_on_progress)
+        worker.upload_finished.connect(_on_finished)
+        self._upload_workers.append(worker)
+        worker.start()
+            
     # Drag and drop support
     def dragEnterEvent(self, event):
         """Handle drag enter event"""
@@ -0,0 +1,150 @@
+"""Search box over the persistent remote index"""
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel,
+    QTableView, QHeaderView, QAbstractItemView
+)
+from PySide6.QtCore import Qt, QTimer, Signal
+
+from core.file_manager import RemoteFileInfo
+from core.remote_index import IndexCrawler, RemoteIndex
+from ui.widgets.remote_file_model import RemoteFileModel
+
+
+class IndexSearchWidget(QWidget):
+    """Searches the remote index as the user types, without network access
+    
+    Results are shown with full paths in a RemoteFileModel. The crawler
+    that fills the index runs in the background; its progress is polled
+    while it runs.
+    """
+    
+    path_activated = Signal(str, bool)  # path, is_directory
+    
+    SEARCH_DELAY = 150  # milliseconds of typing pause before searching
+    RESULT_LIMIT = 1000
+    
+    def __init__(self, index: RemoteIndex, crawler: IndexCrawler):
+        """Initialize index search widget
+        
+        Args:
+            index: Remote index to search
+            crawler: Crawler keeping the index up to date
+        """
+        super().__init__()
+        self.index = index
+        self.crawler = crawler
+        
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY)
+        self._search_timer.timeout.connect(self._search)
+        
+        self._crawl_timer = QTimer(self)
+        self._crawl_timer.setInterval(500)
+        self._crawl_timer.timeout.connect(self._update_crawl_status)
+        
+        self._setup_ui()
+        self._update_crawl_status()
+        
+    def _setup_ui(self):
+        """Setup user interface"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search indexed files (text or glob, e.g. *.log)…")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(lambda _: self._search_timer.start())
+        self.search_input.returnPressed.connect(self._search)
+        
+        self.update_btn = QPushButton("Update Index")
+        self.update_btn.clicked.connect(self.start_crawl)
+        self.stop_btn = QPushButton("✖ Stop")
+        self.stop_btn.clicked.connect(lambda: self.crawler.stop())
+        
+        search_layout.addWidget(self.search_input)
+        search_layout.addWidget(self.update_btn)
+        search_layout.addWidget(self.stop_btn)
+        layout.addLayout(search_layout)
+        
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        
+        self.result_model = RemoteFileModel(self)
+        self.result_view = QTableView()
+        self.result_view.setModel(self.result_model)
+        self.result_view.setShowGrid(False)
+        self.result_view.setWordWrap(False)
+        self.result_view.verticalHeader().setVisible(False)
+        self.result_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.result_view.verticalHeader().setDefaultSectionSize(22)
+        self.result_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.result_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.result_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.result_view.setSortingEnabled(True)
+        self.result_view.doubleClicked.connect(self._activate)
+        layout.addWidget(self.result_view)
+        
+    def start_crawl(self):
+        """Refresh the index in the background"""
+        self.crawler.start()
+        self._crawl_timer.start()
+        self._update_crawl_status()
+        
+    def focus_search(self):
+        """Put the cursor in the search box"""
+        self.search_input.setFocus()
+        self.search_input.selectAll()
+        
+    def _search(self):
+        """Show the entries matching the search text"""
+        self._search_timer.stop()
+        text = self.search_input.text()
+        try:
+            results = self.index.search(text, self.RESULT_LIMIT)
+        except Exception as e:
+            self.status_label.setText(f"Search failed: {e}")
+            return
+        self.result_model.set_files([
+            RemoteFileInfo(
+                filename=result.path,
+                size=result.size,
+                is_directory=result.is_directory,
+                permissions=result.mode,
+                modified_time=result.mtime
+            )
+            for result in results
+        ])
+        if text.strip():
+            more = "+" if len(results) >= self.RESULT_LIMIT else ""
+            self.status_label.setText(f"{len(results)}{more} matches")
+            
+    def _update_crawl_status(self):
+        """Show the crawler's progress"""
+        running = self.crawler.running
+        self.update_btn.setEnabled(not running)
+        self.stop_btn.setVisible(running)
+        if running:
+            self.status_label.setText(
+                f"Indexing… {self.crawler.visited} directories checked, {self.crawler.listed} listed"
+            )
+            return
+        self._crawl_timer.stop()
+        if self.crawler.error:
+            self.status_label.setText(f"Indexing failed: {self.crawler.error}")
+        else:
+            self.status_label.setText(f"{self.index.count()} entries indexed")
+        if self.search_input.text().strip():
+            self._search()
+            
+    def _activate(self, index):
+        """Open a result in the file browser"""
+        file_info = self.result_model.file_info(index.row())
+        self.path_activated.emit(file_info.filename, file_info.is_directory)
+        
+    def shutdown(self):
+        """Stop the crawler and close the connection of the GUI thread"""
+        self._crawl_timer.stop()
+        self.crawler.stop()
+        self.index.close()
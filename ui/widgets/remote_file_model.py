@@ -0,0 +1,212 @@
+"""Item model for remote directory listings"""
+import stat
+import time
+from array import array
+from typing import List
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from core.file_manager import RemoteFileInfo
+from ui.widgets.transfer_panel import format_bytes
+
+# Looking up Qt enum members is slow, and data() runs once per cell
+_DISPLAY_ROLE = Qt.DisplayRole
+_ALIGNMENT_ROLE = Qt.TextAlignmentRole
+_SIZE_ALIGNMENT = int(Qt.AlignRight | Qt.AlignVCenter)
+
+
+class RemoteFileModel(QAbstractTableModel):
+    """Table model keeping a directory listing in compact columns
+    
+    Names, sizes, modes and modification times are stored in parallel
+    arrays instead of one object per row, and display text is only
+    formatted for the cells the view paints. Sorting and filtering work
+    on an array of row numbers in a single pass, so the view never has to
+    visit every row through Python calls.
+    """
+    
+    COLUMNS = ["Name", "Size", "Type", "Modified"]
+    FILE_INFO_ROLE = Qt.UserRole
+    
+    def __init__(self, parent=None):
+        """Initialize remote file model
+        
+        Args:
+            parent: Parent object (optional)
+        """
+        super().__init__(parent)
+        self._names: List[str] = []
+        self._sizes = array('q')
+        self._modes = array('L')
+        self._mtimes = array('q')
+        self._order = array('L')  # store rows in sort order
+        self._rows = array('L')  # store rows shown, after filtering
+        self._filter = ""
+        self._sort_column = 0
+        self._sort_order = Qt.AscendingOrder
+        
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        """Create an index without the row and column count checks of the base class"""
+        if 0 <= row < len(self._rows) and 0 <= column < 4:
+            return self.createIndex(row, column)
+        return QModelIndex()
+        
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Number of files shown"""
+        return 0 if parent.isValid() else len(self._rows)
+        
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Number of columns"""
+        return 0 if parent.isValid() else len(self.COLUMNS)
+        
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        """Column titles"""
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+        
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Format a cell on demand"""
+        row = self._rows[index.row()]
+        
+        if role == _DISPLAY_ROLE:
+            column = index.column()
+            is_directory = stat.S_ISDIR(self._modes[row])
+            if column == 0:
+                return ("📁 " + self._names[row]) if is_directory else self._names[row]
+            if column == 1:
+                return "" if is_directory else format_bytes(self._sizes[row])
+            if column == 2:
+                return "Folder" if is_directory else "File"
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self._mtimes[row]))
+            
+        if role == _ALIGNMENT_ROLE and index.column() == 1:
+            return _SIZE_ALIGNMENT
+        if role == self.FILE_INFO_ROLE:
+            return self.file_info(index.row())
+        return None
+        
+    def file_info(self, row: int) -> RemoteFileInfo:
+        """Build the RemoteFileInfo of a shown row
+        
+        Args:
+            row: Model row
+            
+        Returns:
+            File information
+        """
+        row = self._rows[row]
+        return RemoteFileInfo(
+            filename=self._names[row],
+            size=self._sizes[row],
+            is_directory=stat.S_ISDIR(self._modes[row]),
+            permissions=self._modes[row],
+            modified_time=self._mtimes[row]
+        )
+        
+    def clear(self):
+        """Remove all rows"""
+        self.beginResetModel()
+        self._names = []
+        self._sizes = array('q')
+        self._modes = array('L')
+        self._mtimes = array('q')
+        self._order = array('L')
+        self._rows = array('L')
+        self.endResetModel()
+        
+    def append_files(self, files: List[RemoteFileInfo]):
+        """Append a batch of files after the current rows, unsorted
+        
+        Args:
+            files: List of RemoteFileInfo objects
+        """
+        if not files:
+            return
+        first = len(self._names)
+        self._names.extend(file_info.filename for file_info in files)
+        self._sizes.extend(file_info.size or 0 for file_info in files)
+        self._modes.extend(file_info.permissions or 0 for file_info in files)
+        self._mtimes.extend(int(file_info.modified_time or 0) for file_info in files)
+        
+        new_rows = range(first, len(self._names))
+        self._order.extend(new_rows)
+        shown = self._filtered(new_rows)
+        if shown:
+            count = len(self._rows)
+            self.beginInsertRows(QModelIndex(), count, count + len(shown) - 1)
+            self._rows.extend(shown)
+            self.endInsertRows()
+            
+    def set_files(self, files: List[RemoteFileInfo]):
+        """Replace the listing and apply the current sort order
+        
+        Args:
+            files: List of RemoteFileInfo objects
+        """
+        self.clear()
+        self.append_files(files)
+        self.resort()
+        
+    def _filtered(self, rows) -> array:
+        """Keep the store rows whose name contains the filter text"""
+        if not self._filter:
+            return array('L', rows)
+        names, text = self._names, self._filter
+        return array('L', [row for row in rows if text in names[row].lower()])
+        
+    def set_filter(self, text: str):
+        """Show only files whose name contains a text, ignoring case
+        
+        Args:
+            text: Filter text (empty shows all files)
+        """
+        text = text.lower()
+        if text == self._filter:
+            return
+        self.beginResetModel()
+        self._filter = text
+        self._rows = self._filtered(self._order)
+        self.endResetModel()
+        
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """Sort the rows, keeping directories first
+        
+        Args:
+            column: Column to sort by
+            order: Qt.AscendingOrder or Qt.DescendingOrder
+        """
+        self._sort_column = column
+        self._sort_order = order
+        if len(self._names) < 2:
+            return
+            
+        if column == 1:
+            values = self._sizes
+        elif column == 3:
+            values = self._mtimes
+        else:
+            values = [name.lower() for name in self._names]
+            
+        order_rows = sorted(range(len(self._names)), key=values.__getitem__,
+                            reverse=order == Qt.DescendingOrder)
+        # Stable second pass so folders stay on top in either direction
+        is_file = [not stat.S_ISDIR(mode) for mode in self._modes]
+        order_rows.sort(key=is_file.__getitem__)
+        
+        self.layoutAboutToBeChanged.emit()
+        old_persistent = self.persistentIndexList()
+        old_rows = [self._rows[index.row()] for index in old_persistent]
+        self._order = array('L', order_rows)
+        self._rows = self._filtered(self._order)
+        if old_persistent:
+            positions = {row: position for position, row in enumerate(self._rows)}
+            self.changePersistentIndexList(old_persistent, [
+                self.index(positions[row], index.column()) if row in positions else QModelIndex()
+                for row, index in zip(old_rows, old_persistent)
+            ])
+        self.layoutChanged.emit()
+        
+    def resort(self):
+        """Sort again by the last used column"""
+        self.sort(self._sort_column, self._sort_order)
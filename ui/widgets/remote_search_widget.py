@@ -0,0 +1,286 @@
+"""Panel running find and grep on the server"""
+import threading
+from typing import List
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel,
+    QTableView, QHeaderView, QAbstractItemView, QCheckBox
+)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, QTimer, Signal
+
+from core.remote_search import RemoteSearch, SearchResult
+
+
+class SearchResultModel(QAbstractTableModel):
+    """Table model that grows as search results stream in"""
+    
+    COLUMNS = ["Path", "Line", "Text"]
+    
+    def __init__(self, parent=None):
+        """Initialize search result model
+        
+        Args:
+            parent: Parent object (optional)
+        """
+        super().__init__(parent)
+        self.results: List[SearchResult] = []
+        
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Number of results"""
+        return 0 if parent.isValid() else len(self.results)
+        
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Number of columns"""
+        return 0 if parent.isValid() else len(self.COLUMNS)
+        
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        """Column titles"""
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+        
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Format a cell on demand"""
+        if role != Qt.DisplayRole:
+            return None
+        result = self.results[index.row()]
+        column = index.column()
+        if column == 0:
+            return result.path
+        if column == 1:
+            return str(result.line_number) if result.line_number else ""
+        return result.text
+        
+    def clear(self):
+        """Remove all results"""
+        self.beginResetModel()
+        self.results = []
+        self.endResetModel()
+        
+    def append_results(self, results: List[SearchResult]):
+        """Append a batch of results
+        
+        Args:
+            results: List of SearchResult objects
+        """
+        if not results:
+            return
+        count = len(self.results)
+        self.beginInsertRows(QModelIndex(), count, count + len(results) - 1)
+        self.results.extend(results)
+        self.endInsertRows()
+
+
+class SearchRunner(QThread):
+    """Background thread that collects search results as they stream in
+    
+    Results are picked up with take_results() on a timer in the GUI
+    thread, so a hit shows up promptly even when the server then runs
+    quiet for minutes.
+    """
+    
+    search_finished = Signal()
+    search_failed = Signal(str)  # error_message
+    
+    BATCH_INTERVAL = 0.1  # seconds between batches
+    
+    def __init__(self, search: RemoteSearch, directory: str, text: str, name: str,
+                 regex: bool, ignore_case: bool, max_results: int):
+        """Initialize search runner
+        
+        Args:
+            search: Remote search instance
+            directory: Remote directory to search
+            text: Text to look for inside files
+            name: File name fragment or glob
+            regex: Treat the text as a regular expression
+            ignore_case: Match the text case-insensitively
+            max_results: Stop after this many results
+        """
+        super().__init__()
+        self.search = search
+        self.arguments = (directory, text, name, regex, ignore_case)
+        self.max_results = max_results
+        self._lock = threading.Lock()
+        self._results: List[SearchResult] = []
+        
+    def run(self):
+        """Run the search and collect its results"""
+        count = 0
+        results = self.search.search(*self.arguments)
+        try:
+            for result in results:
+                with self._lock:
+                    self._results.append(result)
+                count += 1
+                if count >= self.max_results:
+                    break
+            self.search_finished.emit()
+        except Exception as e:
+            self.search_failed.emit(str(e))
+        finally:
+            results.close()
+            
+    def take_results(self) -> List[SearchResult]:
+        """Results found since the last call; safe to call from any thread"""
+        with self._lock:
+            results, self._results = self._results, []
+        return results
+        
+    def cancel(self):
+        """Stop the search"""
+        self.search.cancel()
+
+
+class RemoteSearchWidget(QWidget):
+    """Searches file names and contents on the server
+    
+    Runs ``find`` when only a name is given and ``grep -rn`` when text is
+    given. Results appear while the server is still searching and can be
+    double-clicked to show them in the file browser.
+    """
+    
+    path_activated = Signal(str, bool)  # path, is_directory
+    
+    MAX_RESULTS = 100000
+    
+    def __init__(self, file_manager):
+        """Initialize remote search widget
+        
+        Args:
+            file_manager: File manager instance
+        """
+        super().__init__()
+        self.file_manager = file_manager
+        self._runner = None
+        self._old_runners = []  # cancelled runners kept alive until their thread exits
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(int(SearchRunner.BATCH_INTERVAL * 1000))
+        self._flush_timer.timeout.connect(self._flush_results)
+        self._setup_ui()
+        
+    def _setup_ui(self):
+        """Setup user interface"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        
+        query_layout = QHBoxLayout()
+        self.directory_input = QLineEdit()
+        self.directory_input.setPlaceholderText("Directory (current by default)")
+        self.name_input = QLineEdit()
+        self.name_input.setPlaceholderText("File name or glob")
+        self.text_input = QLineEdit()
+        self.text_input.setPlaceholderText("Containing text")
+        for line_edit in (self.directory_input, self.name_input, self.text_input):
+            line_edit.returnPressed.connect(self.start_search)
+            query_layout.addWidget(line_edit)
+        layout.addLayout(query_layout)
+        
+        options_layout = QHBoxLayout()
+        self.regex_check = QCheckBox("Regular expression")
+        self.ignore_case_check = QCheckBox("Ignore case")
+        self.search_btn = QPushButton("🔍 Search")
+        self.search_btn.clicked.connect(self.start_search)
+        self.stop_btn = QPushButton("✖ Stop")
+        self.stop_btn.clicked.connect(self.stop_search)
+        self.stop_btn.setVisible(False)
+        self.status_label = QLabel()
+        
+        options_layout.addWidget(self.regex_check)
+        options_layout.addWidget(self.ignore_case_check)
+        options_layout.addStretch()
+        options_layout.addWidget(self.status_label)
+        options_layout.addWidget(self.search_btn)
+        options_layout.addWidget(self.stop_btn)
+        layout.addLayout(options_layout)
+        
+        self.result_model = SearchResultModel(self)
+        self.result_view = QTableView()
+        self.result_view.setModel(self.result_model)
+        self.result_view.setShowGrid(False)
+        self.result_view.setWordWrap(False)
+        self.result_view.verticalHeader().setVisible(False)
+        self.result_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.result_view.verticalHeader().setDefaultSectionSize(22)
+        self.result_view.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.result_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.result_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.result_view.doubleClicked.connect(self._activate)
+        layout.addWidget(self.result_view)
+        
+    def focus_search(self):
+        """Put the cursor in the name box"""
+        self.name_input.setFocus()
+        self.name_input.selectAll()
+        
+    def start_search(self):
+        """Start a search with the entered query"""
+        name = self.name_input.text().strip()
+        text = self.text_input.text()
+        if not name and not text:
+            self.status_label.setText("Enter a file name or text")
+            return
+        directory = self.file_manager.normalize_path(self.directory_input.text().strip() or ".")
+        
+        self.stop_search()
+        self.result_model.clear()
+        runner = SearchRunner(
+            RemoteSearch(self.file_manager.ssh_manager), directory, text, name,
+            self.regex_check.isChecked(), self.ignore_case_check.isChecked(), self.MAX_RESULTS
+        )
+        runner.search_finished.connect(lambda: self._on_search_finished(runner))
+        runner.search_failed.connect(lambda error: self._on_search_failed(runner, error))
+        self._runner = runner
+        self.status_label.setText(f"Searching {directory}…")
+        self.stop_btn.setVisible(True)
+        runner.start()
+        self._flush_timer.start()
+        
+    def stop_search(self):
+        """Cancel the search in progress, if any"""
+        self._flush_timer.stop()
+        self._old_runners = [runner for runner in self._old_runners if not runner.isFinished()]
+        if self._runner is not None:
+            self._runner.cancel()
+            self._old_runners.append(self._runner)
+            self._runner = None
+            self.status_label.setText(f"Stopped — {self.result_model.rowCount()} results")
+        self.stop_btn.setVisible(False)
+        
+    def _flush_results(self):
+        """Append the results the running search found since the last flush"""
+        if self._runner is None:
+            return
+        results = self._runner.take_results()
+        if results:
+            self.result_model.append_results(results)
+            self.status_label.setText(f"Searching… {self.result_model.rowCount()} results")
+            
+    def _on_search_finished(self, runner: SearchRunner):
+        """Report a completed search"""
+        if runner is not self._runner:
+            return
+        self._flush_timer.stop()
+        self.result_model.append_results(runner.take_results())
+        self._runner = None
+        self._old_runners.append(runner)
+        self.stop_btn.setVisible(False)
+        count = self.result_model.rowCount()
+        more = f" (stopped at {self.MAX_RESULTS})" if count >= self.MAX_RESULTS else ""
+        self.status_label.setText(f"{count} results{more}")
+        
+    def _on_search_failed(self, runner: SearchRunner, error: str):
+        """Report a search error"""
+        if runner is not self._runner:
+            return
+        self.stop_search()
+        self.status_label.setText(f"Search failed: {error}")
+        
+    def _activate(self, index):
+        """Show a result in the file browser"""
+        result = self.result_model.results[index.row()]
+        self.path_activated.emit(result.path, result.is_directory)
+        
+    def shutdown(self):
+        """Stop the running search"""
+        self.stop_search()
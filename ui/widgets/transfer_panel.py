@@ -0,0 +1,198 @@
+"""Transfer queue panel"""
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+    QTableWidgetItem, QProgressBar, QLabel, QSpinBox, QAbstractItemView,
+    QHeaderView
+)
+from PySide6.QtCore import Qt
+
+from core.transfer_queue import TransferQueue, TransferItem, TransferStatus
+from ui.qt_bridge import in_gui_thread
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count as a human readable string
+    
+    Args:
+        size: Number of bytes
+        
+    Returns:
+        Formatted size
+    """
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+class TransferPanel(QWidget):
+    """Shows queued transfers with per-item and aggregate progress"""
+    
+    COLUMNS = ["Name", "Direction", "Progress", "Size", "Speed", "Status"]
+    
+    def __init__(self, transfer_queue: TransferQueue):
+        """Initialize transfer panel
+        
+        Args:
+            transfer_queue: Transfer queue to display
+        """
+        super().__init__()
+        self.transfer_queue = transfer_queue
+        self._rows = {}  # item id -> row
+        self._setup_ui()
+        self._setup_connections()
+        
+    def _setup_ui(self):
+        """Setup user interface"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        
+        # Controls
+        controls = QHBoxLayout()
+        
+        self.pause_btn = QPushButton("⏸ Pause")
+        self.pause_btn.clicked.connect(self._pause_selected)
+        self.resume_btn = QPushButton("▶ Resume")
+        self.resume_btn.clicked.connect(self._resume_selected)
+        self.cancel_btn = QPushButton("✖ Cancel")
+        self.cancel_btn.clicked.connect(self._cancel_selected)
+        self.clear_btn = QPushButton("Clear Finished")
+        self.clear_btn.clicked.connect(self._clear_finished)
+        
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 16)
+        self.concurrency_spin.setValue(self.transfer_queue.concurrency)
+        self.concurrency_spin.valueChanged.connect(self.transfer_queue.set_concurrency)
+        
+        self.summary_label = QLabel("Idle")
+        
+        controls.addWidget(self.pause_btn)
+        controls.addWidget(self.resume_btn)
+        controls.addWidget(self.cancel_btn)
+        controls.addWidget(self.clear_btn)
+        controls.addStretch()
+        controls.addWidget(QLabel("Parallel:"))
+        controls.addWidget(self.concurrency_spin)
+        controls.addWidget(self.summary_label)
+        
+        layout.addLayout(controls)
+        
+        # Transfer table
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        
+        layout.addWidget(self.table)
+        
+    def _setup_connections(self):
+        """Setup signal connections"""
+        self.transfer_queue.item_added.connect(in_gui_thread(self._on_item_added))
+        self.transfer_queue.item_updated.connect(in_gui_thread(self._on_item_updated))
+        self.transfer_queue.throughput_updated.connect(in_gui_thread(self._on_throughput_updated))
+        
+    def _on_item_added(self, item: TransferItem):
+        """Add a row for a new transfer"""
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self._rows[item.id] = row
+        
+        name_item = QTableWidgetItem(item.name)
+        name_item.setData(Qt.UserRole, item.id)
+        name_item.setToolTip(item.remote_path if item.direction == "download" else item.local_path)
+        self.table.setItem(row, 0, name_item)
+        if item.direction == "upload":
+            direction = "⬆ Upload"
+        else:
+            direction = "⬇ Folder" if item.is_folder else "⬇ Download"
+        self.table.setItem(row, 1, QTableWidgetItem(direction))
+        
+        progress = QProgressBar()
+        progress.setRange(0, 100)
+        self.table.setCellWidget(row, 2, progress)
+        
+        for column in range(3, len(self.COLUMNS)):
+            self.table.setItem(row, column, QTableWidgetItem(""))
+            
+        self._on_item_updated(item)
+        
+    def _on_item_updated(self, item: TransferItem):
+        """Refresh the row of a transfer"""
+        row = self._rows.get(item.id)
+        if row is None:
+            return
+            
+        progress = self.table.cellWidget(row, 2)
+        if item.size:
+            progress.setRange(0, 100)
+            progress.setValue(int(item.transferred * 100 / item.size))
+        elif item.status == TransferStatus.RUNNING:
+            # Total unknown (folder streamed through tar); show a busy bar
+            progress.setRange(0, 0)
+        else:
+            progress.setRange(0, 100)
+            progress.setValue(100 if item.status == TransferStatus.DONE else 0)
+            
+        if item.size:
+            self.table.item(row, 3).setText(format_bytes(item.size))
+        else:
+            self.table.item(row, 3).setText(format_bytes(item.transferred) if item.transferred else "")
+        self.table.item(row, 4).setText(
+            f"{format_bytes(item.rate)}/s" if item.status == TransferStatus.RUNNING and item.rate else ""
+        )
+        status_item = self.table.item(row, 5)
+        status_item.setText(item.status)
+        status_item.setToolTip(item.error)
+        
+    def _on_throughput_updated(self, rate: float, running: int):
+        """Update the aggregate throughput label"""
+        queued = sum(1 for item in self.transfer_queue.items.values() if item.status == TransferStatus.QUEUED)
+        if running or queued:
+            self.summary_label.setText(f"{running} running, {queued} queued — {format_bytes(rate)}/s")
+        else:
+            self.summary_label.setText("Idle")
+            
+    def _selected_items(self):
+        """Transfer items of the selected rows"""
+        items = []
+        for row in sorted({index.row() for index in self.table.selectedIndexes()}):
+            item_id = self.table.item(row, 0).data(Qt.UserRole)
+            item = self.transfer_queue.items.get(item_id)
+            if item is not None:
+                items.append(item)
+        return items
+        
+    def _pause_selected(self):
+        """Pause selected transfers, or all when nothing is selected"""
+        items = self._selected_items()
+        if not items:
+            self.transfer_queue.pause_all()
+        for item in items:
+            self.transfer_queue.pause(item)
+            
+    def _resume_selected(self):
+        """Resume selected transfers, or all when nothing is selected"""
+        items = self._selected_items()
+        if not items:
+            self.transfer_queue.resume_all()
+        for item in items:
+            self.transfer_queue.resume(item)
+            
+    def _cancel_selected(self):
+        """Cancel selected transfers"""
+        for item in self._selected_items():
+            self.transfer_queue.cancel(item)
+            
+    def _clear_finished(self):
+        """Remove finished transfers from the table"""
+        for item in self.transfer_queue.clear_finished():
+            row = self._rows.pop(item.id, None)
+            if row is not None:
+                self.table.removeRow(row)
+                self._rows = {
+                    item_id: r - 1 if r > row else r
+                    for item_id, r in self._rows.items()
+                }